@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     # App Settings
@@ -9,14 +10,90 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 20000
+    # Async engine for async handlers (aiosqlite / asyncpg driver derived from DATABASE_URL)
+    DB_ASYNC_ENABLED: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_SIZE: int = 10000
+    # The app drops a user's cached principals when it changes the user itself;
+    # users changed or deleted outside the API stay cached up to this TTL
+    TOKEN_CACHE_TTL_SECONDS: float = 60
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_REHASH_ON_LOGIN: bool = True
+    PASSWORD_POOL_SIZE: int = 2
+    PASSWORD_QUEUE_SIZE: int = 64
+    
+    # Prediction
+    BATCH_CHUNK_SIZE: int = 1000
+    
+    # Micro-batching of concurrent /predict calls (opt-in)
+    PREDICT_BATCHING_ENABLED: bool = False
+    PREDICT_BATCH_WINDOW_MS: float = 2.0
+    PREDICT_MAX_BATCH_SIZE: int = 64
+    
+    # Prediction result cache (in-process LRU, or shared Redis if URL is set)
+    PREDICTION_CACHE_ENABLED: bool = True
+    PREDICTION_CACHE_SIZE: int = 10000
+    PREDICTION_CACHE_TTL_SECONDS: int = 3600
+    PREDICTION_CACHE_URL: Optional[str] = None
+    
+    # Model registry (every worker reloads when the ACTIVE version changes; 0 = no polling)
+    MODEL_REGISTRY_DIR: Optional[str] = None
+    MODEL_RELOAD_POLL_SECONDS: float = 0
+    # Comma-separated usernames allowed to reload/activate models (empty = nobody)
+    MODEL_ADMIN_USERS: str = ""
+    # Comma-separated usernames who may read every user's prediction history
+    # (everyone else only sees their own)
+    HISTORY_ADMIN_USERS: str = ""
+    
+    # Executors (workers run jobs, queue holds waiting ones; beyond that -> 429)
+    INFERENCE_POOL_SIZE: int = 4
+    INFERENCE_QUEUE_SIZE: int = 64
+    GENAI_POOL_SIZE: int = 8
+    GENAI_QUEUE_SIZE: int = 32
+    RETRY_AFTER_SECONDS: int = 1
+    
+    # Prediction log writer. A crash loses at most LOG_QUEUE_SIZE unwritten rows,
+    # by default LOG_BATCH_SIZE (one flush window); beyond that requests write
+    # their rows themselves (see log_writer.py)
+    LOG_BATCH_SIZE: int = 500
+    LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+    LOG_QUEUE_SIZE: Optional[int] = None
+    # "json": full input per row; "profile": dedupe inputs into employee_profiles
+    LOG_STORAGE_MODE: str = "json"
     
     # GenAI
     GEMINI_API_KEY: str
+    GEMINI_MODEL: str = "gemini-pro"
+    GENAI_TIMEOUT_SECONDS: float = 15.0
+    GENAI_MAX_CONCURRENCY: int = 16
+    PLAN_CACHE_ENABLED: bool = True
+    PLAN_CACHE_SIZE: int = 1000
+    # Model attributions sent in the plan prompt instead of the full profile (0 = full profile)
+    PLAN_TOP_FACTORS: int = 5
+    
+    # Startup: "background" (liveness at once, model/GenAI load in a thread),
+    # "blocking" (load before serving) or "lazy" (load on first request)
+    WARMUP_MODE: str = "background"
+    
+    # Observability: per-stage latency histograms on /metrics (per worker)
+    METRICS_ENABLED: bool = True
+    # Sampling profiler, switched on per worker via /debug/profiler or `kill -USR2 <pid>`
+    PROFILER_ENABLED: bool = False
+    PROFILER_INTERVAL_MS: float = 5
+    PROFILER_OUTPUT_DIR: str = "profiles"
 
     model_config = ConfigDict(env_file=".env")
 
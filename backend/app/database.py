@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 import os
 from .config import get_settings
 
@@ -10,14 +13,110 @@ settings = get_settings()
 # In production/docker, we will set DATABASE_URL env var
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
+IS_SQLITE = "sqlite" in SQLALCHEMY_DATABASE_URL
+IS_SQLITE_MEMORY = IS_SQLITE and (":memory:" in SQLALCHEMY_DATABASE_URL or SQLALCHEMY_DATABASE_URL.rstrip("/").endswith("sqlite:"))
+
+
+class PoolMetrics:
+    """Connection pool counters and checkout wait times, shared by both engines."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checked_out": self.checkouts - self.checkins,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_seconds_avg": self.wait_seconds_total / self.waits if self.waits else 0.0,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedPoolMixin:
+    # _do_get is where a QueuePool blocks waiting for a free connection
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start)
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(poolclass) -> dict:
+    if IS_SQLITE_MEMORY:
+        # In-memory SQLite lives in a single connection; keep SQLAlchemy's default pool
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers run alongside the writer; NORMAL sync is safe with WAL
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+    cursor.close()
+
+
+def instrument(engine):
+    if IS_SQLITE:
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    event.listen(engine, "connect", lambda *args: pool_metrics.count("connects"))
+    event.listen(engine, "checkout", lambda *args: pool_metrics.count("checkouts"))
+    event.listen(engine, "checkin", lambda *args: pool_metrics.count("checkins"))
+    return engine
+
+
 # Fallback to SQLite if DATABASE_URL is not set (for safety/testing without real DB)
-if "sqlite" in SQLALCHEMY_DATABASE_URL:
+if IS_SQLITE:
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL, 
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        **pool_options(TimedQueuePool)
     )
 else:
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, **pool_options(TimedQueuePool))
+instrument(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -29,3 +128,32 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Optional async engine (DB_ASYNC_ENABLED) for async handlers
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    scheme, rest = SQLALCHEMY_DATABASE_URL.split("://", 1)
+    base = scheme.split("+", 1)[0]
+    return f"{ASYNC_DRIVERS.get(base, scheme)}://{rest}"
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC_ENABLED:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(async_database_url(), **pool_options(TimedAsyncAdaptedQueuePool))
+    instrument(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,15 +1,65 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
-from .routers import auth, prediction
+from sqlalchemy import inspect, text
+from .database import engine, async_engine, pool_metrics, Base, SessionLocal
+from .models.prediction import PredictionLog
+from .config import get_settings
+from .routers import auth, prediction, history, registry, metrics
+from .services.inference_service import shutdown_executors
+from .services.log_writer import prediction_log_writer
+from .services.auth_service import password_hasher
+from .services.history_service import backfill_daily_summary
+from .services.startup_service import readiness, start_warm_up
+from .services.metrics_service import RequestTimingMiddleware
+from .services.profiler_service import install_profiler_signal, profiler
+from .services.json_service import FastJSONResponse
 
 # Create Tables (for development, better to use Alembic in prod)
 Base.metadata.create_all(bind=engine)
 
+# create_all skips columns and indexes added to tables that already exist
+if "profile_id" not in {c["name"] for c in inspect(engine).get_columns("predictions_history")}:
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE predictions_history ADD COLUMN profile_id INTEGER REFERENCES employee_profiles(id)"))
+for index in PredictionLog.__table__.indexes:
+    index.create(bind=engine, checkfirst=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db = SessionLocal()
+    try:
+        backfill_daily_summary(db)
+    finally:
+        db.close()
+    prediction_log_writer.start()
+    settings = get_settings()
+    if settings.PROFILER_ENABLED:
+        install_profiler_signal()
+    await run_in_threadpool(start_warm_up, settings.WARMUP_MODE)
+    poller = None
+    if settings.MODEL_RELOAD_POLL_SECONDS > 0:
+        poller = asyncio.create_task(registry.poll_registry(settings.MODEL_RELOAD_POLL_SECONDS))
+    yield
+    if poller is not None:
+        poller.cancel()
+    profiler.stop()
+    shutdown_executors()
+    password_hasher.executor.shutdown()
+    # After the executors, so rows queued by the last requests are flushed
+    prediction_log_writer.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
+
 app = FastAPI(
     title="RetentionAI API",
     description="API for predicting employee churn",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS (Allow frontend to connect)
@@ -21,9 +71,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Whole-request latency by route for /metrics (a no-op with METRICS_ENABLED=false)
+app.add_middleware(RequestTimingMiddleware)
+
 # Include Routers
 app.include_router(auth.router)
 app.include_router(prediction.router)
+app.include_router(history.router)
+app.include_router(registry.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 def read_root():
@@ -31,4 +87,18 @@ def read_root():
 
 @app.get("/health")
 def health_check():
+    """Liveness plus readiness; never waits for the model to load."""
+    return {"status": "ok", **readiness.snapshot()}
+
+@app.get("/health/live")
+def liveness():
     return {"status": "ok"}
+
+@app.get("/health/ready")
+def readiness_check():
+    snapshot = readiness.snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+@app.get("/health/db")
+def db_health():
+    return {"pool": engine.pool.status(), **pool_metrics.snapshot()}
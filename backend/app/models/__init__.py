@@ -1,2 +1,4 @@
 from .user import User
-from .prediction import PredictionLog
+from .prediction import PredictionLog, DailyRiskSummary
+from .profile import EmployeeProfile
+from .retention_plan import RetentionPlan
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
@@ -9,8 +9,10 @@ class PredictionLog(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     
-    # Store the input data as a JSON blob
+    # Store the input data as a JSON blob, or (LOG_STORAGE_MODE=profile)
+    # as a reference to a deduplicated employee_profiles row
     input_data = Column(JSON)
+    profile_id = Column(Integer, ForeignKey("employee_profiles.id"), index=True)
     
     # Prediction results
     churn_probability = Column(Float)
@@ -20,3 +22,21 @@ class PredictionLog(Base):
 
     # Relationship
     user = relationship("User", back_populates="logs")
+    profile = relationship("EmployeeProfile")
+
+    # History queries filter by user or risk level and page by time
+    __table_args__ = (
+        Index("ix_predictions_history_user_timestamp", "user_id", "timestamp"),
+        Index("ix_predictions_history_risk_timestamp", "risk_level", "timestamp"),
+    )
+
+
+class DailyRiskSummary(Base):
+    """Per-day, per-risk-level rollup of predictions_history, kept up to date on insert."""
+    __tablename__ = "daily_risk_summary"
+
+    day = Column(Date, primary_key=True)
+    risk_level = Column(String, primary_key=True)
+    
+    count = Column(Integer, nullable=False, default=0)
+    probability_sum = Column(Float, nullable=False, default=0.0)
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, String
+from ..database import Base
+
+class EmployeeProfile(Base):
+    """
+    One row per distinct EmployeeData payload, with typed columns.
+    Prediction logs reference it instead of repeating a JSON blob
+    (LOG_STORAGE_MODE=profile).
+    """
+    __tablename__ = "employee_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(32), unique=True, index=True, nullable=False)
+
+    Age = Column(Integer)
+    BusinessTravel = Column(String)
+    DailyRate = Column(Integer)
+    Department = Column(String)
+    DistanceFromHome = Column(Integer)
+    Education = Column(Integer)
+    EducationField = Column(String)
+    EnvironmentSatisfaction = Column(Integer)
+    Gender = Column(String)
+    HourlyRate = Column(Integer)
+    JobInvolvement = Column(Integer)
+    JobLevel = Column(Integer)
+    JobRole = Column(String)
+    JobSatisfaction = Column(Integer)
+    MaritalStatus = Column(String)
+    MonthlyIncome = Column(Integer)
+    MonthlyRate = Column(Integer)
+    NumCompaniesWorked = Column(Integer)
+    OverTime = Column(String)
+    PercentSalaryHike = Column(Integer)
+    PerformanceRating = Column(Integer)
+    RelationshipSatisfaction = Column(Integer)
+    StockOptionLevel = Column(Integer)
+    TotalWorkingYears = Column(Integer)
+    TrainingTimesLastYear = Column(Integer)
+    WorkLifeBalance = Column(Integer)
+    YearsAtCompany = Column(Integer)
+    YearsInCurrentRole = Column(Integer)
+    YearsSinceLastPromotion = Column(Integer)
+    YearsWithCurrManager = Column(Integer)
+
+    @classmethod
+    def feature_columns(cls):
+        return [c.name for c in cls.__table__.columns if c.name not in ("id", "content_hash")]
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.feature_columns()}
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime
+from ..database import Base
+
+class RetentionPlan(Base):
+    __tablename__ = "retention_plans"
+
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Hash of the normalized profile + risk level the plan was generated for
+    cache_key = Column(String, unique=True, index=True)
+    risk_level = Column(String)
+    plan = Column(Text)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
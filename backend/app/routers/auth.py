@@ -1,16 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from typing import Annotated
 
-from ..database import get_db
+from ..config import get_settings
+from ..database import get_db, SessionLocal, AsyncSessionLocal
 from ..models.user import User
-from ..schemas.user import UserSchema, Token
+from ..schemas.user import UserSchema, Token, UserPrincipal
+from ..services.metrics_service import metrics
 from ..services.auth_service import (
-    verify_password, 
-    get_password_hash, 
     create_access_token, 
+    password_hasher,
+    TokenCache,
     ACCESS_TOKEN_EXPIRE_MINUTES,
     SECRET_KEY,
     ALGORITHM
@@ -24,7 +28,48 @@ router = APIRouter(
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
-def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)):
+settings = get_settings()
+
+# Verified token -> principal; the JWT decode and user query only run on a miss
+token_cache = TokenCache(
+    max_entries=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS
+) if settings.TOKEN_CACHE_ENABLED else None
+
+def is_listed(user: UserPrincipal, usernames: str) -> bool:
+    """Whether the user is in a comma-separated username setting (admin lists)."""
+    return user.username in {name.strip() for name in usernames.split(",") if name.strip()}
+
+def invalidate_cached_user(username: str):
+    """Drop cached principals of a user; call after any change to the user row."""
+    if token_cache is not None:
+        token_cache.invalidate_user(username)
+
+def load_principal(username: str):
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == username).first()
+        return UserPrincipal.model_validate(user) if user else None
+    finally:
+        db.close()
+
+async def load_principal_async(username: str):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User).where(User.username == username))
+        user = result.scalars().first()
+        return UserPrincipal.model_validate(user) if user else None
+
+async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> UserPrincipal:
+    with metrics.timed("auth"):
+        return await resolve_principal(token)
+
+async def resolve_principal(token: str) -> UserPrincipal:
+    """Token -> principal: token cache, else JWT decode and user lookup."""
+    if token_cache is not None:
+        principal = token_cache.get(token)
+        if principal is not None:
+            return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -38,35 +83,57 @@ def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Session
     except JWTError:
         raise credentials_exception
         
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
+    if AsyncSessionLocal is not None:
+        principal = await load_principal_async(username)
+    else:
+        principal = await run_in_threadpool(load_principal, username)
+    if principal is None:
         raise credentials_exception
-    return user
+
+    if token_cache is not None:
+        token_cache.set(token, principal, payload.get("exp"))
+    return principal
+
+def find_user(db: Session, username: str):
+    return db.query(User).filter(User.username == username).first()
+
+def save_user(db: Session, user: User):
+    db.add(user)
+    db.commit()
+    db.refresh(user)
 
 @router.post("/register", response_model=dict)
-def register(user: UserSchema, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.username == user.username).first()
+async def register(user: UserSchema, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(find_user, db, user.username)
     if db_user:
         raise HTTPException(status_code=400, detail="Username already registered")
     
+    # bcrypt runs on the password pool, not on the request threads
     new_user = User(
         username=user.username,
-        hashed_password=get_password_hash(user.password)
+        hashed_password=await password_hasher.hash(user.password)
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(save_user, db, new_user)
+    invalidate_cached_user(new_user.username)
     return {"message": "User created successfully", "id": new_user.id}
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Session = Depends(get_db)):
+    user = await run_in_threadpool(find_user, db, form_data.username)
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await password_hasher.verify(form_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Work factor changed since this hash was made: store the upgraded hash
+        user.hashed_password = new_hash
+        await run_in_threadpool(save_user, db, user)
+        invalidate_cached_user(user.username)
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
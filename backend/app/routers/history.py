@@ -0,0 +1,174 @@
+import os
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from datetime import date, datetime
+from typing import List, Optional
+
+from ..config import get_settings
+from ..database import get_db
+from ..models.prediction import PredictionLog, DailyRiskSummary
+from ..models.profile import EmployeeProfile
+from ..schemas.history import HistoryPage, PredictionRecord, DailyRiskDistribution
+from ..schemas.user import UserPrincipal
+from ..services.history_service import encode_cursor, decode_cursor
+from ..services.export_service import export_history, EXPORT_FORMATS
+from .auth import get_current_user, is_listed
+
+settings = get_settings()
+
+router = APIRouter(
+    prefix="/history",
+    tags=["history"]
+)
+
+def history_scope(user_id: Optional[int], current_user: UserPrincipal) -> Optional[int]:
+    """
+    User whose predictions the caller may read: their own, unless they are
+    in HISTORY_ADMIN_USERS (then `user_id`, or everyone when it is None).
+    """
+    if is_listed(current_user, settings.HISTORY_ADMIN_USERS):
+        return user_id
+    if user_id is not None and user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Only your own history is visible (HISTORY_ADMIN_USERS)")
+    return current_user.id
+
+@router.get("", response_model=HistoryPage)
+def list_predictions(
+    user_id: Optional[int] = None,
+    risk_level: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    include_input: bool = False,
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Logged predictions, newest first.
+    
+    Keyset pagination: pass `next_cursor` from the previous page as `cursor`.
+    Filters by user, risk level and [start, end) use the
+    (user_id, timestamp) and (risk_level, timestamp) indexes.
+    Non-admins only see their own predictions (see history_scope).
+    """
+    user_id = history_scope(user_id, current_user)
+    columns = [
+        PredictionLog.id, PredictionLog.user_id, PredictionLog.timestamp,
+        PredictionLog.churn_probability, PredictionLog.risk_level
+    ]
+    if include_input:
+        columns.append(PredictionLog.input_data)
+        columns.append(EmployeeProfile)
+    query = db.query(*columns)
+    if include_input:
+        query = query.outerjoin(EmployeeProfile, PredictionLog.profile_id == EmployeeProfile.id)
+
+    if user_id is not None:
+        query = query.filter(PredictionLog.user_id == user_id)
+    if risk_level is not None:
+        query = query.filter(PredictionLog.risk_level == risk_level.upper())
+    if start is not None:
+        query = query.filter(PredictionLog.timestamp >= start)
+    if end is not None:
+        query = query.filter(PredictionLog.timestamp < end)
+    if cursor is not None:
+        try:
+            cursor_timestamp, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(or_(
+            PredictionLog.timestamp < cursor_timestamp,
+            and_(PredictionLog.timestamp == cursor_timestamp, PredictionLog.id < cursor_id)
+        ))
+
+    rows = query.order_by(PredictionLog.timestamp.desc(), PredictionLog.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+
+    items = []
+    for row in rows:
+        record = PredictionRecord.model_validate(row)
+        if include_input and row.EmployeeProfile is not None:
+            record.input_data = row.EmployeeProfile.to_dict()
+        items.append(record)
+
+    return HistoryPage(items=items, next_cursor=next_cursor)
+
+@router.get("/summary", response_model=List[DailyRiskDistribution])
+def risk_summary(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Daily risk distribution over [start, end], read from the pre-aggregated
+    daily_risk_summary rollup (one row per day and risk level).
+    """
+    query = db.query(DailyRiskSummary)
+    if start is not None:
+        query = query.filter(DailyRiskSummary.day >= start)
+    if end is not None:
+        query = query.filter(DailyRiskSummary.day <= end)
+
+    days = {}
+    for row in query.order_by(DailyRiskSummary.day).all():
+        day = days.setdefault(row.day, {"day": row.day, "total": 0, "counts": {}, "probability_sum": 0.0})
+        day["total"] += row.count
+        day["counts"][row.risk_level] = row.count
+        day["probability_sum"] += row.probability_sum
+
+    return [
+        DailyRiskDistribution(
+            day=day["day"],
+            total=day["total"],
+            counts=day["counts"],
+            mean_probability=day["probability_sum"] / day["total"] if day["total"] else 0.0
+        )
+        for day in days.values()
+    ]
+
+@router.get("/export")
+def export_predictions(
+    format: str = "parquet",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download prediction history as Parquet or Arrow IPC, with one typed
+    column per employee feature, for offline analysis.
+    Non-admins only export their own predictions (see history_scope).
+    """
+    user_id = history_scope(user_id, current_user)
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {EXPORT_FORMATS}")
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Export requires the 'pyarrow' package")
+
+    fd, path = tempfile.mkstemp(suffix=f".{format}")
+    os.close(fd)
+    try:
+        export_history(db, path, format=format, start=start, end=end, user_id=user_id)
+    except Exception:
+        os.remove(path)
+        raise
+
+    return FileResponse(
+        path,
+        media_type="application/vnd.apache.parquet" if format == "parquet" else "application/vnd.apache.arrow.file",
+        filename=f"predictions_history.{format}",
+        background=BackgroundTask(os.remove, path)
+    )
@@ -0,0 +1,55 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from ..config import get_settings
+from ..schemas.user import UserPrincipal
+from ..services.metrics_service import metrics
+from ..services.profiler_service import profiler
+from .auth import get_current_user
+
+settings = get_settings()
+
+router = APIRouter(
+    tags=["observability"]
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Latency histograms of this worker in Prometheus text format.
+    Stages: validate, auth, inference, preprocess, predict_proba,
+    log_enqueue, db_write, plan.
+    """
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+def require_profiler():
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiler disabled (PROFILER_ENABLED)")
+
+@router.get("/debug/profiler", dependencies=[Depends(require_profiler)])
+def profiler_status(current_user: UserPrincipal = Depends(get_current_user)):
+    return profiler.status()
+
+@router.post("/debug/profiler/start", dependencies=[Depends(require_profiler)])
+def start_profiler(
+    interval_ms: float = Query(default=None, gt=0),
+    duration_seconds: Optional[float] = Query(default=None, gt=0),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Start sampling in the worker that serves this request (see `pid`).
+    With duration_seconds it stops by itself; fetch the report with /stop.
+    """
+    interval = (interval_ms or settings.PROFILER_INTERVAL_MS) / 1000
+    if not profiler.start(interval, duration_seconds):
+        raise HTTPException(status_code=409, detail="Profiler already running")
+    return profiler.status()
+
+@router.post("/debug/profiler/stop", response_class=PlainTextResponse,
+             dependencies=[Depends(require_profiler)])
+def stop_profiler(current_user: UserPrincipal = Depends(get_current_user)):
+    """Stop sampling and return collapsed stacks (flamegraph.pl / speedscope input)."""
+    return PlainTextResponse(profiler.stop())
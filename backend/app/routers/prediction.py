@@ -1,80 +1,251 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-import sys
-from pathlib import Path
-
-# Add ml folder to path to import src
-# Adjust path assuming backend/app/routers is 2 levels deep from backend
-# We need to reach ml folder which is at ../../ml from backend
-# backend/app/routers -> backend/app -> backend -> .. -> ml
-# Current file is backend/app/routers/prediction.py
-# Root is HRPRJOJECT
-sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent / "ml"))
-
-from src.predict import get_predictor
-from ..database import get_db
-from ..models.user import User
-from ..models.prediction import PredictionLog
-from ..schemas.prediction import EmployeeData
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import ValidationError
+
+from ..config import get_settings
+from ..schemas.user import UserPrincipal
+from ..schemas.prediction import EmployeeData, EMPLOYEE_BODY, employee_record, employee_records
 from ..services.genai_service import get_agent
+from ..services.ml_service import ml_module, get_predictor
+from ..services.inference_service import inference_executor
+from ..services.batching_service import PredictionBatcher
+from ..services.log_writer import prediction_log_writer
+from ..services.metrics_service import metrics
+from ..services.json_service import FastJSONResponse, dumps, validate_body
+from ..services.batch_service import open_records, chunked, to_ndjson, NDJSONStreamingResponse
 from .auth import get_current_user
 
+settings = get_settings()
+
 router = APIRouter(
     tags=["prediction"]
 )
 
-@router.post("/predict")
-def predict_churn(
-    employee: EmployeeData, 
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+def build_prediction_cache():
+    if not settings.PREDICTION_CACHE_ENABLED:
+        return None
+    # src.cache only needs the standard library, so this stays cheap at import
+    cache = ml_module("cache")
+    if settings.PREDICTION_CACHE_URL:
+        backend = cache.RedisCacheBackend(settings.PREDICTION_CACHE_URL, ttl=settings.PREDICTION_CACHE_TTL_SECONDS)
+    else:
+        backend = cache.MemoryCacheBackend(
+            max_entries=settings.PREDICTION_CACHE_SIZE,
+            ttl=settings.PREDICTION_CACHE_TTL_SECONDS
+        )
+    return cache.PredictionCache(backend)
+
+prediction_cache = build_prediction_cache()
+
+def predict_one(data: dict) -> dict:
+    predictor = get_predictor()
+    if prediction_cache is not None:
+        return prediction_cache.get_or_predict(predictor, data)
+    return predictor.predict(data)
+
+def predict_many(employees: list) -> list:
+    predictor = get_predictor()
+    if len(employees) == 1:
+        # A lone request in its window still gets the single-row fast path
+        return [predict_one(employees[0])]
+    if prediction_cache is not None:
+        return prediction_cache.get_or_predict_batch(predictor, employees)
+    return predictor.predict_batch(employees)
+
+def predict_with_factors(data: dict) -> tuple:
+    """Prediction plus the top risk factors that go into the plan prompt."""
+    prediction = predict_one(data)
+    if settings.PLAN_TOP_FACTORS <= 0:
+        return prediction, None
+    return prediction, get_predictor().explain([data], settings.PLAN_TOP_FACTORS)[0]
+
+async def employee_payload(request: Request) -> dict:
+    """The EmployeeData body as a plain dict, parsed and validated in one pass."""
+    with metrics.timed("validate"):
+        return await validate_body(request, employee_record)
+
+_batcher = None
+
+def get_batcher() -> PredictionBatcher:
+    """Get or create the micro-batcher for /predict."""
+    global _batcher
+    if _batcher is None:
+        _batcher = PredictionBatcher(
+            predict_many,
+            inference_executor,
+            settings.PREDICT_BATCH_WINDOW_MS,
+            settings.PREDICT_MAX_BATCH_SIZE
+        )
+    return _batcher
+
+@router.post("/predict", openapi_extra=EMPLOYEE_BODY)
+async def predict_churn(
+    current_user: UserPrincipal = Depends(get_current_user),
+    data: dict = Depends(employee_payload)
 ):
     """
     Predict churn and log the request to DB.
+    Runs on the inference executor; answers 429 when it is saturated.
+    With PREDICT_BATCHING_ENABLED, concurrent calls share one model call.
+    The log row is written in the background by the prediction log writer.
     """
     try:
-        data = employee.dict()
-        predictor = get_predictor()
-        result = predictor.predict(data)
+        # Includes the wait for an executor slot (or batching window)
+        with metrics.timed("inference"):
+            if settings.PREDICT_BATCHING_ENABLED:
+                result = await get_batcher().predict(data)
+            else:
+                result = await inference_executor.run(predict_one, data)
         
-        # Log to Database
-        log_entry = PredictionLog(
-            user_id=current_user.id,
-            input_data=data,
-            churn_probability=result['churn_probability'],
-            risk_level=result['risk_level']
-        )
-        db.add(log_entry)
-        db.commit()
+        # Log to Database (batched, off the request path)
+        with metrics.timed("log_enqueue"):
+            await prediction_log_writer.submit_async(current_user.id, data, result)
         
-        return result
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/generate-retention-plan")
-def generate_retention_plan(
-    employee: EmployeeData,
-    current_user: User = Depends(get_current_user)
+def score_chunk(records: list, start: int, user_id: int) -> list:
+    """
+    Validate and score one chunk of raw records and queue them for logging.
+    Rows that fail validation are reported in place instead of aborting the batch.
+    """
+    rows = []
+    candidates = []
+    for offset, record in enumerate(records):
+        index = start + offset
+        if not isinstance(record, dict):
+            rows.append({"index": index, "error": "Invalid record"})
+        else:
+            candidates.append((index, record))
+
+    # The whole chunk in one validation pass, straight to dicts
+    try:
+        validated = employee_records.validate_python([record for _, record in candidates])
+        valid = [(index, data) for (index, _), data in zip(candidates, validated)]
+    except ValidationError:
+        # Some rows are invalid: redo this chunk row by row to report them in place
+        valid = []
+        for index, record in candidates:
+            try:
+                valid.append((index, EmployeeData(**record).model_dump()))
+            except ValidationError as e:
+                rows.append({"index": index, "error": str(e)})
+
+    if valid:
+        results = predict_many([data for _, data in valid])
+        prediction_log_writer.submit_many(
+            user_id, ((data, result) for (_, data), result in zip(valid, results))
+        )
+
+        rows.extend({"index": index, **result} for (index, _), result in zip(valid, results))
+        rows.sort(key=lambda row: row["index"])
+
+    return rows
+
+
+@router.post("/predict/batch")
+async def predict_churn_batch(
+    request: Request,
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Predict churn for many employees in one request.
+    
+    Accepts a JSON array, NDJSON (application/x-ndjson) or CSV (text/csv) body.
+    Employees are scored in chunks of BATCH_CHUNK_SIZE and results are streamed
+    back as NDJSON, one line per employee, as soon as each chunk is done.
+    """
+    user_id = current_user.id
+    records_stream = await open_records(request)
+    # One inference slot for the whole stream: a saturated pool gets a 429
+    # here, before the 200 status line goes out, and chunks never wait for one
+    reservation = inference_executor.reserve()
+
+    async def stream():
+        try:
+            start = 0
+            async for records in chunked(records_stream, settings.BATCH_CHUNK_SIZE):
+                rows = await reservation.run(score_chunk, records, start, user_id)
+                start += len(records)
+                for line in to_ndjson(rows):
+                    yield line
+        finally:
+            reservation.release()
+
+    # Also released if the stream never starts (client gone before the first chunk)
+    return NDJSONStreamingResponse(stream(), background=BackgroundTask(reservation.release))
+
+@router.get("/predict/cache")
+def prediction_cache_stats(current_user: UserPrincipal = Depends(get_current_user)):
+    """
+    Hit/miss/eviction counters of the prediction cache.
+    """
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_cache.stats()}
+
+@router.post("/generate-retention-plan", openapi_extra=EMPLOYEE_BODY)
+async def generate_retention_plan(
+    current_user: UserPrincipal = Depends(get_current_user),
+    data: dict = Depends(employee_payload)
 ):
     """
     Generate a retention plan using GenAI (if risk is high).
+    The LLM call is awaited without holding a worker thread; on timeout or
+    provider errors a rule-based plan is returned instead.
     """
     try:
-        # 1. Predict first
-        data = employee.dict()
-        predictor = get_predictor()
-        prediction = predictor.predict(data)
+        # 1. Predict first (with the factors behind the risk)
+        prediction, factors = await inference_executor.run(predict_with_factors, data)
         
         risk_level = prediction['risk_level']
         
         # 2. Generate Plan
         agent = get_agent()
-        plan = agent.generate_plan(data, risk_level)
+        plan = await agent.generate_plan_async(data, risk_level, factors)
         
-        return {
+        return FastJSONResponse({
             "risk_level": risk_level,
             "churn_probability": prediction['churn_probability'],
+            "top_factors": factors,
             "retention_plan": plan
-        }
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+@router.post("/generate-retention-plan/stream", openapi_extra=EMPLOYEE_BODY)
+async def stream_retention_plan(
+    current_user: UserPrincipal = Depends(get_current_user),
+    data: dict = Depends(employee_payload)
+):
+    """
+    Stream a retention plan as Server-Sent Events.
+    
+    Events: `prediction` (risk level, probability and top factors), then one `token` per
+    chunk of plan text as the LLM produces it, then `done`.
+    """
+    prediction, factors = await inference_executor.run(predict_with_factors, data)
+    risk_level = prediction['risk_level']
+    agent = get_agent()
+
+    async def events():
+        yield sse_event("prediction", {
+            "risk_level": risk_level,
+            "churn_probability": prediction['churn_probability'],
+            "top_factors": factors
+        })
+        async for chunk in agent.stream_plan(data, risk_level, factors):
+            yield sse_event("token", chunk)
+        yield sse_event("done", {})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
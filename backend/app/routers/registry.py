@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from ..config import get_settings
+from ..services.ml_service import ml_module, predict_module
+from ..schemas.user import UserPrincipal
+from .auth import get_current_user, is_listed
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/models",
+    tags=["models"]
+)
+
+model_registry = ml_module("registry").ModelRegistry(settings.MODEL_REGISTRY_DIR)
+
+def model_status() -> dict:
+    predict = predict_module()
+    predictor = predict.get_predictor()
+    return {
+        "model_name": predictor.model_name,
+        "model_id": predictor.model_id,
+        "version": predictor.version,
+        "registry_active_version": model_registry.active_version(),
+        "last_reload": dict(predict.reload_status)
+    }
+
+def reload_model(version: Optional[str], activate: bool):
+    try:
+        # ACTIVE only moves once the version has loaded and passed the probe
+        predict_module().reload_predictor(version, model_registry, activate=activate)
+    except Exception:
+        # Recorded in reload_status; the current model keeps serving
+        logger.exception("Model reload failed")
+
+async def poll_registry(interval: float):
+    """Follow the registry's ACTIVE version (one loop per worker)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(lambda: predict_module().check_for_update(model_registry))
+        except Exception:
+            logger.exception("Model reload failed")
+
+def require_model_admin(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
+    if not is_listed(current_user, settings.MODEL_ADMIN_USERS):
+        raise HTTPException(status_code=403, detail="Model administration not allowed (MODEL_ADMIN_USERS)")
+    return current_user
+
+def check_version_name(version: str):
+    # Versions are directory names under the registry root
+    if "/" in version or "\\" in version or ".." in version:
+        raise HTTPException(status_code=400, detail="Invalid version name")
+
+@router.get("")
+def list_models(current_user: UserPrincipal = Depends(get_current_user)):
+    return {"versions": model_registry.versions(), **model_status()}
+
+@router.get("/active")
+def active_model(current_user: UserPrincipal = Depends(get_current_user)):
+    return model_status()
+
+@router.post("/reload", status_code=status.HTTP_202_ACCEPTED)
+def reload(
+    background_tasks: BackgroundTasks,
+    version: Optional[str] = None,
+    activate: bool = False,
+    current_user: UserPrincipal = Depends(require_model_admin)
+):
+    """
+    Load a model version in the background and hot-swap it in.
+    With activate=true the version also becomes the registry's ACTIVE one,
+    so other workers pick it up on their next poll.
+    Only users listed in MODEL_ADMIN_USERS may call it.
+    """
+    if version is not None:
+        check_version_name(version)
+        try:
+            model_registry.paths(version)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+    elif activate:
+        raise HTTPException(status_code=400, detail="activate requires a version")
+    if predict_module().reload_status["state"] == "loading":
+        raise HTTPException(status_code=409, detail="A reload is already in progress")
+
+    background_tasks.add_task(reload_model, version, activate)
+    return {"status": "reloading", "version": version or model_registry.active_version()}
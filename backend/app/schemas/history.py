@@ -0,0 +1,23 @@
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, ConfigDict
+
+class PredictionRecord(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    user_id: Optional[int]
+    timestamp: datetime
+    churn_probability: float
+    risk_level: str
+    input_data: Optional[dict] = None
+
+class HistoryPage(BaseModel):
+    items: List[PredictionRecord]
+    next_cursor: Optional[str] = None
+
+class DailyRiskDistribution(BaseModel):
+    day: date
+    total: int
+    counts: Dict[str, int]
+    mean_probability: float
@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from typing import List
+
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
 
 class EmployeeData(BaseModel):
     Age: int
@@ -31,3 +34,18 @@ class EmployeeData(BaseModel):
     YearsInCurrentRole: int
     YearsSinceLastPromotion: int
     YearsWithCurrManager: int
+
+
+# Same fields as a TypedDict: validates straight into plain dicts (no model
+# instance to build and dump), in one pass over raw JSON bytes or a whole list
+EmployeeRecord = TypedDict("EmployeeRecord", EmployeeData.__annotations__)
+employee_record = TypeAdapter(EmployeeRecord)
+employee_records = TypeAdapter(List[EmployeeRecord])
+
+# OpenAPI body for endpoints that validate with employee_record themselves
+EMPLOYEE_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": EmployeeData.model_json_schema()}},
+    }
+}
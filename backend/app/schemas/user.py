@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class UserSchema(BaseModel):
     username: str
@@ -7,3 +7,11 @@ class UserSchema(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+
+class UserPrincipal(BaseModel):
+    """Authenticated user as seen by the routes (no DB session attached)."""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    id: int
+    username: str
+    role: str
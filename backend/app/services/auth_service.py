@@ -1,3 +1,6 @@
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt, JWTError
@@ -5,6 +8,7 @@ from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from ..config import get_settings
+from .inference_service import BoundedExecutor
 
 settings = get_settings()
 
@@ -12,7 +16,14 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with a different work factor than BCRYPT_ROUNDS are flagged for rehash
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -20,6 +31,69 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+
+class PasswordHasher:
+    """
+    Runs bcrypt on its own bounded thread pool (bcrypt releases the GIL),
+    so a login storm queues there, or gets 429s, instead of taking the
+    threads that serve other traffic.
+    """
+
+    def __init__(self, executor: BoundedExecutor):
+        self.executor = executor
+        self._lock = threading.Lock()
+        self.hashes = 0
+        self.verifications = 0
+        self.rehashes = 0
+        self.seconds_total = 0.0
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.seconds_total += time.perf_counter() - start
+
+    async def hash(self, password: str) -> str:
+        self.hashes += 1
+        return await self.executor.run(self._timed, get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str):
+        """
+        Returns (valid, new_hash). new_hash is set when the stored hash uses
+        an outdated work factor and PASSWORD_REHASH_ON_LOGIN is on.
+        """
+        self.verifications += 1
+        if not settings.PASSWORD_REHASH_ON_LOGIN:
+            valid = await self.executor.run(self._timed, verify_password, plain_password, hashed_password)
+            return valid, None
+
+        valid, new_hash = await self.executor.run(
+            self._timed, pwd_context.verify_and_update, plain_password, hashed_password
+        )
+        if new_hash is not None:
+            self.rehashes += 1
+        return valid, new_hash
+
+    def stats(self) -> dict:
+        operations = self.hashes + self.verifications
+        return {
+            **self.executor.stats(),
+            "hashes": self.hashes,
+            "verifications": self.verifications,
+            "rehashes": self.rehashes,
+            "seconds_avg": self.seconds_total / operations if operations else 0.0,
+        }
+
+
+password_hasher = PasswordHasher(BoundedExecutor(
+    "password",
+    settings.PASSWORD_POOL_SIZE,
+    settings.PASSWORD_QUEUE_SIZE,
+    settings.RETRY_AFTER_SECONDS,
+))
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -29,3 +103,67 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+
+class TokenCache:
+    """
+    Short-lived cache of verified token -> user principal.
+
+    Entries live for at most `ttl` seconds and never past the token's own
+    expiry. Call invalidate_user() whenever a user is changed or removed
+    so their cached principals are dropped; changes made outside the app
+    (e.g. directly in the database) are only seen once entries expire.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._by_username = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[1] < time.time():
+                if entry is not None:
+                    self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, token: str, principal, token_expires_at: Optional[float] = None):
+        expires_at = time.time() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        with self._lock:
+            self._entries[token] = (principal, expires_at)
+            self._entries.move_to_end(token)
+            self._by_username.setdefault(principal.username, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, username: str):
+        with self._lock:
+            for token in self._by_username.pop(username, set()):
+                self._entries.pop(token, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_username.clear()
+
+    def _remove(self, token: str):
+        principal, _ = self._entries.pop(token)
+        tokens = self._by_username.get(principal.username)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_username[principal.username]
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,141 @@
+import csv
+from collections import deque
+from typing import AsyncIterator, Iterable, Iterator, List, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from .json_service import dumps, loads
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+CSV_TYPES = ("text/csv", "application/csv")
+
+
+async def iter_raw_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a streamed request body into decoded lines, line endings kept,
+    without buffering all of it. A leading UTF-8 BOM is dropped.
+    """
+    buffer = b""
+    encoding = "utf-8-sig"
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield (line + b"\n").decode(encoding)
+            encoding = "utf-8"
+    if buffer:
+        yield buffer.decode(encoding)
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Non-blank lines of a streamed request body, stripped."""
+    async for line in iter_raw_lines(stream):
+        line = line.strip()
+        if line:
+            yield line
+
+
+async def iter_ndjson(request: Request) -> AsyncIterator[Optional[dict]]:
+    async for line in iter_lines(request.stream()):
+        try:
+            yield loads(line)
+        except ValueError:
+            # Reported as an invalid row by the caller
+            yield None
+
+
+async def iter_csv(request: Request) -> AsyncIterator[Optional[dict]]:
+    """
+    Records of a streamed CSV body. One csv.reader reads every line, so
+    quoted fields may span lines; it is only asked for a row once the
+    lines queued for it close all their quotes.
+    """
+    lines = deque()
+    # Never exhausted: next(reader) only runs when a whole record is queued
+    reader = csv.reader(iter(lines.popleft, None))
+    header = None
+    in_quotes = False
+    async for line in iter_raw_lines(request.stream()):
+        lines.append(line)
+        if line.count('"') % 2:
+            in_quotes = not in_quotes
+        if in_quotes:
+            continue
+        row = next(reader)
+        if not row:
+            continue
+        if header is None:
+            header = row
+            continue
+        yield dict(zip(header, row))
+    if in_quotes and header is not None:
+        # Unterminated quote at the end of the body: reported as an invalid row
+        yield None
+
+
+async def iter_list(records: list) -> AsyncIterator[dict]:
+    for record in records:
+        yield record
+
+
+async def open_records(request: Request) -> AsyncIterator[Optional[dict]]:
+    """
+    Return an async stream of raw employee records from a JSON array, NDJSON
+    or CSV request body. NDJSON and CSV are read line by line so large uploads
+    keep memory flat; a JSON array is parsed up front so that a malformed
+    body is still rejected with a 400 before streaming starts.
+    """
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip()
+
+    if content_type in NDJSON_TYPES:
+        return iter_ndjson(request)
+    if content_type in CSV_TYPES:
+        return iter_csv(request)
+
+    try:
+        records = loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of employees")
+    return iter_list(records)
+
+
+async def chunked(records: AsyncIterator[dict], size: int) -> AsyncIterator[List[dict]]:
+    """Group an async stream of records into lists of at most `size`."""
+    chunk = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def to_ndjson(rows: Iterable[dict]) -> Iterator[bytes]:
+    for row in rows:
+        yield dumps(row) + b"\n"
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streams NDJSON while the request body is still being read.
+
+    The stock StreamingResponse listens on `receive` for a disconnect while it
+    streams, which would swallow body chunks that the record iterator has not
+    read yet. Here only the body iterator reads from `receive`; a client
+    disconnect still ends the stream because request.stream() raises
+    ClientDisconnect.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # The background task runs even if streaming fails (it may release resources)
+        try:
+            await self.stream_response(send)
+        finally:
+            if self.background is not None:
+                await self.background()
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Callable, List, Optional
+
+from .inference_service import BoundedExecutor
+
+
+class PredictionBatcher:
+    """
+    Coalesces concurrent single predictions into one batch call.
+
+    Requests wait for at most `window_ms` (or until `max_batch_size` of them
+    have arrived), then the whole batch is scored with a single call of
+    `score_batch` on the executor and each caller gets its own result back.
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        score_batch: Callable[[List[dict]], List[dict]],
+        executor: BoundedExecutor,
+        window_ms: float,
+        max_batch_size: int,
+    ):
+        self.score_batch = score_batch
+        self.executor = executor
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pending = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Strong references to running batches; the loop only keeps weak ones
+        self._tasks = set()
+        self.batches = 0
+        self.items = 0
+
+    async def predict(self, data: dict) -> dict:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((data, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await self.executor.run(self.score_batch, [data for data, _ in batch])
+        except Exception as e:
+            # Covers 429 backpressure too: every caller in the batch sees it
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+        }
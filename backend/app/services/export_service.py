@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Integer
+from sqlalchemy.orm import Session
+
+from ..models.prediction import PredictionLog
+from ..models.profile import EmployeeProfile
+
+EXPORT_FORMATS = ("parquet", "arrow")
+
+BASE_COLUMNS = ["id", "user_id", "timestamp", "churn_probability", "risk_level"]
+
+
+def export_history(
+    db: Session,
+    path: str,
+    format: str = "parquet",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = 10000,
+    user_id: Optional[int] = None,
+) -> int:
+    """
+    Write predictions_history to a Parquet or Arrow IPC file, one column
+    per employee feature whether inputs are stored as JSON or as profiles.
+    Rows are streamed in record batches, so memory stays bounded.
+
+    Returns the number of rows written. Requires the optional `pyarrow`.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    features = EmployeeProfile.feature_columns()
+    query = (
+        db.query(PredictionLog, EmployeeProfile)
+        .outerjoin(EmployeeProfile, PredictionLog.profile_id == EmployeeProfile.id)
+        .order_by(PredictionLog.id)
+    )
+    if user_id is not None:
+        query = query.filter(PredictionLog.user_id == user_id)
+    if start is not None:
+        query = query.filter(PredictionLog.timestamp >= start)
+    if end is not None:
+        query = query.filter(PredictionLog.timestamp < end)
+
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("user_id", pa.int64()),
+            ("timestamp", pa.timestamp("us")),
+            ("churn_probability", pa.float64()),
+            ("risk_level", pa.string()),
+        ]
+        + [
+            (name, pa.int64() if isinstance(EmployeeProfile.__table__.c[name].type, Integer) else pa.string())
+            for name in features
+        ]
+    )
+
+    writer = None
+    written = 0
+    try:
+        batch = {name: [] for name in BASE_COLUMNS + features}
+        for log, profile in query.yield_per(batch_size):
+            inputs = profile.to_dict() if profile is not None else (log.input_data or {})
+            for name in BASE_COLUMNS:
+                batch[name].append(getattr(log, name))
+            for name in features:
+                batch[name].append(inputs.get(name))
+
+            if len(batch["id"]) >= batch_size:
+                writer = _write_batch(pa, pq, writer, path, format, schema, batch)
+                written += len(batch["id"])
+                batch = {name: [] for name in batch}
+
+        if batch["id"] or writer is None:
+            writer = _write_batch(pa, pq, writer, path, format, schema, batch)
+            written += len(batch["id"])
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def _write_batch(pa, pq, writer, path, format, schema, batch):
+    table = pa.table(batch, schema=schema)
+    if writer is None:
+        if format == "arrow":
+            writer = pa.ipc.new_file(path, schema)
+        else:
+            writer = pq.ParquetWriter(path, schema)
+    writer.write_table(table)
+    return writer
@@ -1,18 +1,210 @@
-import os
-import google.generativeai as genai
+import asyncio
+import hashlib
+import json
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.exc import IntegrityError
+
 from ..config import get_settings
+from ..database import SessionLocal
+from ..models.retention_plan import RetentionPlan
+from .inference_service import genai_executor
+from .metrics_service import metrics
 
 settings = get_settings()
 
-# Configure Gemini
-genai.configure(api_key=settings.GEMINI_API_KEY)
+_genai = None
+_genai_lock = threading.Lock()
+
+
+def load_genai():
+    """
+    Import and configure google.generativeai on first use.
+    The import takes a large share of app startup, so it is kept off the
+    import path of the app and done by the warm-up or the first plan request.
+    """
+    global _genai
+    if _genai is None:
+        with _genai_lock:
+            if _genai is None:
+                import google.generativeai as genai
+                genai.configure(api_key=settings.GEMINI_API_KEY)
+                _genai = genai
+    return _genai
+
+
+class PlanGenerator(ABC):
+    """Upstream text generator used by RetentionAgent."""
+
+    @abstractmethod
+    def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Yield the plan text in chunks. Generators without native async
+        support produce it in one piece on the GenAI executor.
+        """
+        yield await genai_executor.run(self.generate, prompt)
+
+
+class GeminiPlanGenerator(PlanGenerator):
+    def __init__(self, model_name: str = "gemini-pro"):
+        self.model = load_genai().GenerativeModel(model_name)
+
+    def generate(self, prompt: str) -> str:
+        response = self.model.generate_content(prompt)
+        return response.text
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+
+def rule_based_plan(employee_data: dict, risk_level: str) -> str:
+    """
+    Deterministic retention plan built from the risk level and the
+    profile's weakest points. Used when the LLM is slow or unavailable.
+    """
+    steps = []
+    if employee_data.get("OverTime") == "Yes":
+        steps.append("Reduce overtime: rebalance workload or add staffing so overtime becomes the exception.")
+    if employee_data.get("YearsSinceLastPromotion", 0) >= 3:
+        steps.append("Discuss career progression: agree on a promotion path with concrete milestones.")
+    if employee_data.get("PercentSalaryHike", 100) <= 12 or employee_data.get("MonthlyIncome", 10**9) < 4000:
+        steps.append("Review compensation against the market and the role's level; consider an adjustment.")
+    if employee_data.get("JobSatisfaction", 4) <= 2 or employee_data.get("JobInvolvement", 4) <= 2:
+        steps.append("Hold a 1:1 on role fit: adjust responsibilities toward work they find engaging.")
+    if employee_data.get("EnvironmentSatisfaction", 4) <= 2 or employee_data.get("RelationshipSatisfaction", 4) <= 2:
+        steps.append("Address team environment: follow up on working conditions and team relationships.")
+    if employee_data.get("WorkLifeBalance", 4) <= 2 or employee_data.get("DistanceFromHome", 0) >= 15:
+        steps.append("Offer flexibility: remote days or adjusted hours to improve work-life balance.")
+    if employee_data.get("TrainingTimesLastYear", 10) <= 1:
+        steps.append("Invest in development: fund training or a certification aligned with their goals.")
+    if employee_data.get("StockOptionLevel", 1) == 0:
+        steps.append("Consider long-term incentives such as stock options or a retention bonus.")
+
+    urgency = {
+        "CRITICAL": "Schedule a stay interview with their manager this week.",
+        "HIGH": "Schedule a stay interview with their manager within two weeks.",
+        "MEDIUM": "Check in during the next regular 1:1 and monitor engagement.",
+    }.get(risk_level, "Keep up regular check-ins and recognition.")
+
+    steps = [urgency] + steps[:4]
+    if len(steps) < 3:
+        steps.append("Recognize recent contributions publicly and agree on next-quarter goals.")
+        steps.append("Revisit this plan at the next performance review.")
+
+    lines = [f"Retention plan ({risk_level} risk):"]
+    lines += [f"{i}. {step}" for i, step in enumerate(steps, start=1)]
+    return "\n".join(lines)
+
+
+class PlanStore:
+    """
+    Generated plans by cache key: a small in-process LRU in front of the
+    retention_plans table, so plans survive restarts and are shared by workers.
+    """
+
+    def __init__(self, session_factory=SessionLocal, max_entries: int = 1000):
+        self.session_factory = session_factory
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        db = self.session_factory()
+        try:
+            row = db.query(RetentionPlan).filter(RetentionPlan.cache_key == key).first()
+            plan = row.plan if row else None
+        finally:
+            db.close()
+
+        if plan is not None:
+            self._remember(key, plan)
+        return plan
+
+    def set(self, key: str, risk_level: str, plan: str):
+        self._remember(key, plan)
+        db = self.session_factory()
+        try:
+            db.add(RetentionPlan(cache_key=key, risk_level=risk_level, plan=plan))
+            db.commit()
+        except IntegrityError:
+            # Another worker stored the same plan first
+            db.rollback()
+        finally:
+            db.close()
+
+    def _remember(self, key: str, plan: str):
+        with self._lock:
+            self._memory[key] = plan
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
 
 class RetentionAgent:
-    def __init__(self):
-        self.model = genai.GenerativeModel('gemini-pro')
-        
-    def generate_plan(self, employee_data: dict, risk_level: str) -> str:
-        prompt = f"""
+    """
+    Generates retention plans, reusing earlier plans for the same profile
+    and risk level. Concurrent identical requests share one upstream call.
+    """
+
+    def __init__(
+        self,
+        generator: Optional[PlanGenerator] = None,
+        store: Optional[PlanStore] = None,
+        timeout: float = 15.0,
+        max_concurrency: int = 16,
+    ):
+        self.generator = generator if generator is not None else GeminiPlanGenerator(settings.GEMINI_MODEL)
+        self.store = store
+        self.timeout = timeout
+        self._tasks = {}
+        # Event loop of the async callers, so sync callers can join them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Caps in-flight LLM calls across all async requests of this worker
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.upstream_calls = 0
+        self.cache_hits = 0
+        self.shared_calls = 0
+        self.fallbacks = 0
+
+    @staticmethod
+    def plan_key(employee_data: dict, risk_level: str) -> str:
+        normalized = {
+            key: value.strip().lower() if isinstance(value, str) else value
+            for key, value in employee_data.items()
+        }
+        canonical = json.dumps([normalized, risk_level], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def build_prompt(self, employee_data: dict, risk_level: str, factors: Optional[list] = None) -> str:
+        """
+        With model attributions (ChurnPredictor.explain), only the top
+        factors are sent; otherwise the whole profile.
+        """
+        if factors:
+            lines = "\n".join(
+                f"- {f['feature']} = {f['value']} ({'raises' if f['contribution'] > 0 else 'lowers'} risk)"
+                for f in factors
+            )
+            return (
+                f"You are an expert HR consultant. An employee is at {risk_level} risk of leaving.\n"
+                f"Main factors from the churn model, strongest first:\n{lines}\n"
+                "Generate a retention plan with 3-5 actionable steps addressing these factors."
+            )
+        return f"""
         You are an expert HR consultant. An employee is at {risk_level} risk of leaving.
         
         Employee Profile:
@@ -21,9 +213,135 @@ class RetentionAgent:
         Generate a personalized retention plan with 3-5 actionable steps to keep them.
         Focus on their specific pain points (e.g., low salary, lack of promotion, overtime).
         """
-        
-        response = self.model.generate_content(prompt)
-        return response.text
+
+    async def stream_plan(
+        self, employee_data: dict, risk_level: str, factors: Optional[list] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a retention plan without holding a worker thread.
+
+        Cached plans are returned whole. Otherwise the LLM output is relayed
+        chunk by chunk, bounded by the global concurrency limit and a per-call
+        timeout. If the provider is saturated, slow or failing, the
+        rule-based plan is sent instead (or after the partial text).
+        """
+        key = self.plan_key(employee_data, risk_level)
+        if self.store is not None:
+            plan = await asyncio.to_thread(self.store.get, key)
+            if plan is not None:
+                self.cache_hits += 1
+                yield plan
+                return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        parts = []
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+            try:
+                self.upstream_calls += 1
+                stream = self.generator.stream(self.build_prompt(employee_data, risk_level, factors))
+                try:
+                    while True:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            raise asyncio.TimeoutError()
+                        try:
+                            chunk = await asyncio.wait_for(stream.__anext__(), remaining)
+                        except StopAsyncIteration:
+                            break
+                        parts.append(chunk)
+                        yield chunk
+                finally:
+                    await stream.aclose()
+            finally:
+                self._semaphore.release()
+        except Exception:
+            self.fallbacks += 1
+            plan = rule_based_plan(employee_data, risk_level)
+            yield ("\n\n" + plan) if parts else plan
+            return
+
+        if self.store is not None:
+            await asyncio.to_thread(self.store.set, key, risk_level, "".join(parts))
+
+    async def generate_plan_async(
+        self, employee_data: dict, risk_level: str, factors: Optional[list] = None
+    ) -> str:
+        """
+        Whole retention plan: never blocks a thread on the LLM and always
+        returns a plan (rule-based on timeout or provider errors).
+        Concurrent identical requests share one call.
+        """
+        with metrics.timed("plan"):
+            return await self._shared_plan(employee_data, risk_level, factors)
+
+    def generate_plan(self, employee_data: dict, risk_level: str, factors: Optional[list] = None) -> str:
+        """
+        Blocking generate_plan_async for sync callers (worker threads, scripts).
+        Runs on the app's event loop when one is serving async callers, so it
+        shares their single flight and concurrency limit; otherwise on a
+        private loop. Must not be called from an event loop thread.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("generate_plan() would block the event loop; await generate_plan_async()")
+
+        with metrics.timed("plan"):
+            coroutine = self._shared_plan(employee_data, risk_level, factors)
+            loop = self._loop
+            if loop is not None and loop.is_running():
+                return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+            return asyncio.run(coroutine)
+
+    async def _shared_plan(self, employee_data: dict, risk_level: str, factors: Optional[list]) -> str:
+        self._loop = asyncio.get_running_loop()
+        key = self.plan_key(employee_data, risk_level)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._collect(employee_data, risk_level, factors))
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            self.shared_calls += 1
+        return await asyncio.shield(task)
+
+    async def _collect(self, employee_data: dict, risk_level: str, factors: Optional[list]) -> str:
+        return "".join([chunk async for chunk in self.stream_plan(employee_data, risk_level, factors)])
+
+    def stats(self) -> dict:
+        return {
+            "upstream_calls": self.upstream_calls,
+            "cache_hits": self.cache_hits,
+            "shared_calls": self.shared_calls,
+            "fallbacks": self.fallbacks,
+        }
+
+
+_agent = None
+_agent_lock = threading.Lock()
+
 
 def get_agent():
-    return RetentionAgent()
+    """Get or create the shared RetentionAgent."""
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                store = PlanStore(max_entries=settings.PLAN_CACHE_SIZE) if settings.PLAN_CACHE_ENABLED else None
+                _agent = RetentionAgent(
+                    store=store,
+                    timeout=settings.GENAI_TIMEOUT_SECONDS,
+                    max_concurrency=settings.GENAI_MAX_CONCURRENCY
+                )
+    return _agent
+
+
+def set_agent(agent: Optional[RetentionAgent]):
+    """Replace the shared agent, e.g. with one using a local fake generator in tests."""
+    global _agent
+    with _agent_lock:
+        _agent = agent
@@ -0,0 +1,85 @@
+import base64
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models.prediction import PredictionLog, DailyRiskSummary
+
+
+def encode_cursor(timestamp: datetime, id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError for a malformed cursor."""
+    timestamp, id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return datetime.fromisoformat(timestamp), int(id)
+
+
+def update_daily_summary(db: Session, rows: Iterable[dict]):
+    """
+    Add a batch of new predictions_history rows to the daily rollup.
+    Aggregates in Python first, so each batch is one upsert per (day, risk).
+    Runs in the caller's transaction.
+    """
+    totals = defaultdict(lambda: [0, 0.0])
+    for row in rows:
+        total = totals[(row["timestamp"].date(), row["risk_level"])]
+        total[0] += 1
+        total[1] += row["churn_probability"]
+    if not totals:
+        return
+
+    values = [
+        {"day": day, "risk_level": risk, "count": count, "probability_sum": probability_sum}
+        for (day, risk), (count, probability_sum) in totals.items()
+    ]
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(DailyRiskSummary).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyRiskSummary.day, DailyRiskSummary.risk_level],
+            set_={
+                "count": DailyRiskSummary.count + stmt.excluded["count"],
+                "probability_sum": DailyRiskSummary.probability_sum + stmt.excluded["probability_sum"],
+            },
+        )
+        db.execute(stmt)
+        return
+
+    # Other databases: read-modify-write
+    for value in values:
+        summary = db.get(DailyRiskSummary, (value["day"], value["risk_level"]))
+        if summary is None:
+            db.add(DailyRiskSummary(**value))
+        else:
+            summary.count += value["count"]
+            summary.probability_sum += value["probability_sum"]
+
+
+def rebuild_daily_summary(db: Session):
+    """Recompute the rollup from predictions_history (one full scan, e.g. to backfill)."""
+    day = func.date(PredictionLog.timestamp)
+    rows = (
+        db.query(day, PredictionLog.risk_level, func.count(), func.sum(PredictionLog.churn_probability))
+        .group_by(day, PredictionLog.risk_level)
+        .all()
+    )
+    db.query(DailyRiskSummary).delete()
+    for row_day, risk, count, probability_sum in rows:
+        if isinstance(row_day, str):
+            row_day = datetime.fromisoformat(row_day).date()
+        db.add(DailyRiskSummary(day=row_day, risk_level=risk, count=count, probability_sum=probability_sum or 0.0))
+    db.commit()
+
+
+def backfill_daily_summary(db: Session):
+    """Build the rollup once for databases that logged predictions before it existed."""
+    if db.query(DailyRiskSummary).first() is None and db.query(PredictionLog.id).first() is not None:
+        rebuild_daily_summary(db)
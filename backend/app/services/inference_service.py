@@ -0,0 +1,143 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from ..config import get_settings
+
+settings = get_settings()
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a bounded number of running + queued jobs.
+
+    When all slots are taken, new work is rejected with 429 and a
+    Retry-After header instead of piling up behind the running jobs.
+    Each workload gets its own executor so slow jobs (GenAI calls) can
+    never hold up fast ones (model inference).
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, retry_after: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    async def run(self, func, *args, **kwargs):
+        """Run func in the pool and await its result, or raise 429 if saturated."""
+        self._acquire()
+        future = self._submit(func, args, kwargs)
+        # Free the slot when the job ends, even if the awaiting request was cancelled
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def reserve(self) -> "Reservation":
+        """
+        Take a slot now (or raise 429) for jobs submitted later through the
+        returned Reservation, e.g. by a response that is already streaming.
+        """
+        self._acquire()
+        return Reservation(self)
+
+    def _acquire(self):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"{self.name} capacity exceeded, retry later",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        with self._lock:
+            self.in_flight += 1
+
+    def _submit(self, func, args, kwargs):
+        try:
+            return self._get_executor().submit(func, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use so the app can be started again after shutdown()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+            return self._executor
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "queue_size": self.max_queue,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+class Reservation:
+    """
+    One executor slot held across jobs run one after another.
+    release() is idempotent; if a job is still running, the slot is freed
+    when it ends.
+    """
+
+    def __init__(self, executor: BoundedExecutor):
+        self.executor = executor
+        self._lock = threading.Lock()
+        self._released = False
+        self._pending = None
+
+    async def run(self, func, *args, **kwargs):
+        if self._released:
+            raise RuntimeError("Reservation already released")
+        self._pending = self.executor._get_executor().submit(func, *args, **kwargs)
+        return await asyncio.wrap_future(self._pending)
+
+    def release(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        if self._pending is not None and not self._pending.done():
+            self._pending.add_done_callback(lambda _: self.executor._release())
+        else:
+            self.executor._release()
+
+
+inference_executor = BoundedExecutor(
+    "inference",
+    settings.INFERENCE_POOL_SIZE,
+    settings.INFERENCE_QUEUE_SIZE,
+    settings.RETRY_AFTER_SECONDS,
+)
+
+genai_executor = BoundedExecutor(
+    "genai",
+    settings.GENAI_POOL_SIZE,
+    settings.GENAI_QUEUE_SIZE,
+    settings.RETRY_AFTER_SECONDS,
+)
+
+
+def shutdown_executors():
+    inference_executor.shutdown()
+    genai_executor.shutdown()
@@ -0,0 +1,205 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from ..config import get_settings
+from ..database import SessionLocal
+from ..models.prediction import PredictionLog
+from .history_service import update_daily_summary
+from .metrics_service import metrics
+from .profile_service import ProfileStore
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class PredictionLogWriter:
+    """
+    Background sink for predictions_history rows.
+
+    Requests only enqueue a row; a worker thread drains the queue and writes
+    rows with one bulk INSERT (executemany) and one commit per batch, which
+    also updates the daily risk rollup. A batch
+    is flushed when it reaches `batch_size` rows or when `flush_interval`
+    seconds have passed since its first row, and stop() flushes whatever is
+    left.
+
+    Durability: rows are acknowledged before they are written, so a crash
+    loses the rows still in memory. At most `max_queue` rows (by default
+    `batch_size`, one flush window) are acknowledged and not yet written,
+    counting the batch the worker is writing, even when the database falls
+    behind.
+
+    Once that many rows are pending, further rows are written by the caller
+    instead, so nothing is dropped and requests slow down rather than the
+    backlog growing. submit()/submit_many() write on the calling thread and
+    are meant for worker threads; async handlers use submit_async(), which
+    does that write in the threadpool so the event loop never blocks on it.
+    """
+
+    def __init__(self, session_factory=SessionLocal, batch_size: int = 500,
+                 flush_interval: float = 1.0, max_queue: Optional[int] = None,
+                 profile_store: Optional[ProfileStore] = None):
+        self.session_factory = session_factory
+        # When set, inputs are stored as deduplicated employee_profiles rows
+        self.profile_store = profile_store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max(max_queue or batch_size, 1)
+        # Rows accepted and not yet written (queued or in the worker's batch)
+        self._pending = 0
+        self._queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.flushes = 0
+        self.failed = 0
+        self.sync_writes = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="prediction-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Flush pending rows and stop the worker."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def submit(self, user_id: int, data: dict, result: dict):
+        self.submit_many(user_id, [(data, result)])
+
+    async def submit_async(self, user_id: int, data: dict, result: dict):
+        """submit() for the event loop: an overflow write runs in the threadpool."""
+        overflow = self._enqueue(user_id, [(data, result)])
+        if overflow:
+            await run_in_threadpool(self._write_overflow, overflow)
+
+    def submit_many(self, user_id: int, items: Iterable[tuple]):
+        """
+        Queue (input_data, prediction result) pairs for one user.
+        Rows beyond the pending limit are written here, on the calling thread.
+        """
+        overflow = self._enqueue(user_id, items)
+        if overflow:
+            self._write_overflow(overflow)
+
+    def _enqueue(self, user_id: int, items: Iterable[tuple]) -> List[dict]:
+        """Queue the rows; returns those over the pending limit."""
+        if self._thread is None:
+            self.start()
+
+        # Stamp rows now so timestamps reflect prediction time, not flush time
+        now = datetime.utcnow()
+        rows = [
+            {
+                "user_id": user_id,
+                "input_data": data,
+                "churn_probability": result['churn_probability'],
+                "risk_level": result['risk_level'],
+                "timestamp": now,
+            }
+            for data, result in items
+        ]
+        with self._lock:
+            accepted = min(max(self.max_queue - self._pending, 0), len(rows))
+            self._pending += accepted
+        for row in rows[:accepted]:
+            self._queue.put_nowait(row)
+        return rows[accepted:]
+
+    def _write_overflow(self, rows: List[dict]):
+        self.sync_writes += len(rows)
+        self._write(rows)
+
+    def _run(self):
+        batch: List[dict] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(batch)
+                return
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if len(batch) >= self.batch_size or (batch and time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+                deadline = None
+
+    def _flush(self, batch: List[dict]):
+        self._write(batch)
+        with self._lock:
+            self._pending -= len(batch)
+
+    def _write(self, rows: List[dict]):
+        if not rows:
+            return
+        with metrics.timed("db_write"):
+            self._write_batch(rows)
+
+    def _write_batch(self, rows: List[dict]):
+        db = self.session_factory()
+        try:
+            if self.profile_store is not None:
+                profile_ids = self.profile_store.resolve(db, [row["input_data"] for row in rows])
+                # input_data is left out (not None, which JSON stores as 'null')
+                rows = [
+                    {**{k: v for k, v in row.items() if k != "input_data"}, "profile_id": profile_id}
+                    for row, profile_id in zip(rows, profile_ids)
+                ]
+            db.execute(PredictionLog.__table__.insert(), rows)
+            update_daily_summary(db, rows)
+            db.commit()
+            with self._lock:
+                self.written += len(rows)
+                self.flushes += 1
+        except Exception:
+            db.rollback()
+            if self.profile_store is not None:
+                # Ids resolved in the failed transaction may not exist
+                self.profile_store.forget()
+            with self._lock:
+                self.failed += len(rows)
+            logger.exception("Failed to write %d prediction log rows", len(rows))
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "pending": self._pending,
+            "written": self.written,
+            "flushes": self.flushes,
+            "failed": self.failed,
+            "sync_writes": self.sync_writes,
+        }
+
+
+prediction_log_writer = PredictionLogWriter(
+    batch_size=settings.LOG_BATCH_SIZE,
+    flush_interval=settings.LOG_FLUSH_INTERVAL_SECONDS,
+    max_queue=settings.LOG_QUEUE_SIZE,
+    profile_store=ProfileStore() if settings.LOG_STORAGE_MODE == "profile" else None,
+)
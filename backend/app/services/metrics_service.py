@@ -0,0 +1,144 @@
+import bisect
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, Sequence, Tuple
+
+from ..config import get_settings
+
+settings = get_settings()
+
+# Seconds; fine at the low end where the in-process stages live
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+_NOOP = nullcontext()
+
+
+class Histogram:
+    """Prometheus-style histogram with one label set per series."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, labels: Tuple[str, ...], seconds: float):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += seconds
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            label_text = ",".join(f'{name}="{value}"' for name, value in zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+class _StageTimer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(self.labels, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """
+    Per-process latency histograms exposed on /metrics.
+
+    Each worker keeps its own series (scrape workers individually or run one
+    per container). When disabled, timed() hands out a shared no-op context
+    manager, so instrumented code pays one attribute check per stage.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stages = Histogram(
+            "retentionai_stage_duration_seconds",
+            "Time spent in one stage of request handling",
+            ("stage",),
+        )
+        self.requests = Histogram(
+            "retentionai_request_duration_seconds",
+            "Whole request time, including body validation and serialization",
+            ("method", "route", "status"),
+        )
+
+    def timed(self, stage: str):
+        """Context manager recording its duration under `stage`."""
+        if not self.enabled:
+            return _NOOP
+        return _StageTimer(self.stages, (stage,))
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float):
+        self.requests.observe((method, route, str(status)), seconds)
+
+    def render(self) -> str:
+        return self.stages.render() + self.requests.render()
+
+
+metrics = Metrics(enabled=settings.METRICS_ENABLED)
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware timing every HTTP request by route template
+    (/predict, not the raw path, to keep label cardinality bounded).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+                time.perf_counter() - start,
+            )
@@ -0,0 +1,57 @@
+import importlib
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+
+from ..config import get_settings
+from .metrics_service import metrics
+
+settings = get_settings()
+
+# backend/app/services -> backend/app -> backend -> project root -> ml
+ML_DIR = Path(__file__).resolve().parents[3] / "ml"
+
+_lock = threading.Lock()
+_predict_module = None
+
+
+def ml_module(name: str):
+    """
+    Import `src.<name>` from the ml folder on first use.
+
+    The `src` package is registered from its file location instead of
+    adding the ml folder to sys.path, and nothing heavy (pandas, sklearn)
+    is imported until a module that needs it is asked for.
+    """
+    if "src" not in sys.modules:
+        with _lock:
+            if "src" not in sys.modules:
+                package_dir = ML_DIR / "src"
+                spec = importlib.util.spec_from_file_location(
+                    "src", package_dir / "__init__.py",
+                    submodule_search_locations=[str(package_dir)]
+                )
+                package = importlib.util.module_from_spec(spec)
+                sys.modules["src"] = package
+                spec.loader.exec_module(package)
+    return importlib.import_module(f"src.{name}")
+
+
+def predict_module():
+    """`src.predict`, pointed at the configured model registry and timed by `metrics`."""
+    global _predict_module
+    if _predict_module is None:
+        module = ml_module("predict")
+        with _lock:
+            if _predict_module is None:
+                if settings.MODEL_REGISTRY_DIR:
+                    module.use_registry(settings.MODEL_REGISTRY_DIR)
+                # preprocess / predict_proba stages of ChurnPredictor.predict
+                module.set_stage_timer(metrics.timed)
+                _predict_module = module
+    return _predict_module
+
+
+def get_predictor():
+    return predict_module().get_predictor()
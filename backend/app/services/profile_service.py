@@ -0,0 +1,103 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models.profile import EmployeeProfile
+
+
+def max_bind_params(dialect) -> int:
+    """Bound parameters one statement may carry on this database."""
+    if dialect.name == "sqlite":
+        # SQLITE_MAX_VARIABLE_NUMBER: 999 before SQLite 3.32, 32766 since
+        version = getattr(dialect.dbapi, "sqlite_version_info", (0,))
+        return 32766 if version >= (3, 32) else 999
+    # PostgreSQL's wire protocol counts parameters in an int16; others get a safe default
+    return 32767 if dialect.name == "postgresql" else 999
+
+
+def profile_hash(data: dict) -> str:
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+class ProfileStore:
+    """
+    Maps input payloads to deduplicated employee_profiles rows.
+    Known hashes are remembered in a bounded LRU so repeat profiles
+    cost no query at all.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, db: Session, payloads: List[dict]) -> List[int]:
+        """
+        Profile ids for each payload, inserting unseen profiles.
+        Runs in the caller's transaction.
+        """
+        hashes = [profile_hash(data) for data in payloads]
+        known: Dict[str, int] = {}
+        with self._lock:
+            for h in hashes:
+                if h in self._ids:
+                    self._ids.move_to_end(h)
+                    known[h] = self._ids[h]
+
+        missing = {h: data for h, data in zip(hashes, payloads) if h not in known}
+        if missing:
+            columns = set(EmployeeProfile.feature_columns())
+            values = [
+                {"content_hash": h, **{k: v for k, v in data.items() if k in columns}}
+                for h, data in missing.items()
+            ]
+            dialect = db.get_bind().dialect
+            limit = max_bind_params(dialect)
+            # Multi-row INSERTs bind every column of every row: stay under the limit
+            rows_per_insert = max(limit // (len(columns) + 1), 1)
+            for start in range(0, len(values), rows_per_insert):
+                self._insert(db, dialect.name, values[start:start + rows_per_insert])
+
+            rows = []
+            hash_list = list(missing)
+            for start in range(0, len(hash_list), limit):
+                rows += (
+                    db.query(EmployeeProfile.content_hash, EmployeeProfile.id)
+                    .filter(EmployeeProfile.content_hash.in_(hash_list[start:start + limit]))
+                    .all()
+                )
+            found = dict(rows)
+            known.update(found)
+            with self._lock:
+                self._ids.update(found)
+                while len(self._ids) > self.max_entries:
+                    self._ids.popitem(last=False)
+
+        return [known[h] for h in hashes]
+
+    @staticmethod
+    def _insert(db: Session, dialect: str, values: List[dict]):
+        """Insert profiles, skipping hashes that already exist."""
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            db.execute(insert(EmployeeProfile).values(values).on_conflict_do_nothing(
+                index_elements=[EmployeeProfile.content_hash]
+            ))
+        else:
+            existing = {
+                h for (h,) in db.query(EmployeeProfile.content_hash)
+                .filter(EmployeeProfile.content_hash.in_([v["content_hash"] for v in values]))
+            }
+            db.add_all([EmployeeProfile(**v) for v in values if v["content_hash"] not in existing])
+            db.flush()
+
+    def forget(self):
+        """Drop remembered ids, e.g. after a failed transaction."""
+        with self._lock:
+            self._ids.clear()
@@ -0,0 +1,134 @@
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from ..config import get_settings
+
+settings = get_settings()
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for the current worker process.
+
+    A daemon thread snapshots every thread's stack (sys._current_frames)
+    each `interval` seconds and counts identical stacks. The report is in
+    collapsed-stack format ("frame;frame;frame count" per line), which
+    flamegraph.pl and speedscope read directly. Nothing runs while stopped.
+    """
+
+    def __init__(self, max_depth: int = 64):
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stacks: Counter = Counter()
+        self.interval = 0.005
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, interval: float = 0.005, duration: Optional[float] = None) -> bool:
+        """Start sampling (stops by itself after `duration` seconds, if given). False if already running."""
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self.interval = interval
+            self.samples = 0
+            self._stacks = Counter()
+            self._stop.clear()
+            self.started_at = time.time()
+            self.stopped_at = None
+            self._thread = threading.Thread(
+                target=self._run, args=(duration,), name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def stop(self) -> str:
+        """Stop sampling and return the collapsed-stack report."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            if thread is not threading.current_thread():
+                thread.join()
+        return self.report()
+
+    def _run(self, duration: Optional[float]):
+        own_id = threading.get_ident()
+        deadline = None if duration is None else time.monotonic() + duration
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self._stacks[self._collapse(frame)] += 1
+            self.samples += 1
+            if deadline is not None and time.monotonic() >= deadline:
+                self._stop.set()
+        self.stopped_at = time.time()
+        with self._lock:
+            if self._thread is threading.current_thread():
+                self._thread = None
+
+    def _collapse(self, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def report(self) -> str:
+        stacks = self._stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "samples": self.samples,
+            "started_at": self.started_at,
+            "stopped_at": self.stopped_at,
+        }
+
+    def toggle_to_file(self, directory: Path) -> Optional[Path]:
+        """Start if stopped; otherwise stop and write the report to `directory`."""
+        if not self.running:
+            self.start(settings.PROFILER_INTERVAL_MS / 1000)
+            return None
+        report = self.stop()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"profile-{os.getpid()}-{datetime.now():%Y%m%d-%H%M%S}.txt"
+        path.write_text(report)
+        return path
+
+
+profiler = SamplingProfiler()
+
+
+def install_profiler_signal():
+    """
+    `kill -USR2 <worker pid>` starts the profiler in that worker; the next
+    USR2 stops it and writes the report to PROFILER_OUTPUT_DIR.
+    """
+    if not hasattr(signal, "SIGUSR2") or threading.current_thread() is not threading.main_thread():
+        return
+    directory = Path(settings.PROFILER_OUTPUT_DIR)
+
+    def handle(signum, frame):
+        # Stopping joins the sampler thread; keep that out of the signal handler
+        threading.Thread(target=profiler.toggle_to_file, args=(directory,), daemon=True).start()
+
+    signal.signal(signal.SIGUSR2, handle)
@@ -0,0 +1,81 @@
+import logging
+import threading
+import time
+
+from .genai_service import get_agent
+from .ml_service import predict_module
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """
+    Warm-up state of the components that are slow to load.
+    The app is ready once every required component is loaded; optional
+    ones (GenAI, which has a rule-based fallback) are only reported.
+    """
+
+    def __init__(self, required, optional=()):
+        self.required = tuple(required)
+        self.components = {
+            name: {"state": "pending", "seconds": None, "error": None}
+            for name in (*self.required, *optional)
+        }
+        self._lock = threading.Lock()
+        self.lazy = False
+
+    def mark(self, name: str, state: str, seconds: float = None, error: str = None):
+        with self._lock:
+            self.components[name] = {"state": state, "seconds": seconds, "error": error}
+
+    @property
+    def ready(self) -> bool:
+        # In lazy mode components load on first use, so there is nothing to wait for
+        return self.lazy or all(self.components[name]["state"] == "ready" for name in self.required)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"ready": self.ready, "components": {k: dict(v) for k, v in self.components.items()}}
+
+
+readiness = Readiness(required=["model"], optional=["genai"])
+
+
+def warm_model():
+    predict = predict_module()
+    predict.get_predictor().predict(predict.PROBE_EMPLOYEE)
+
+
+def warm_genai():
+    get_agent()
+
+
+WARMUP_STEPS = (("model", warm_model), ("genai", warm_genai))
+
+
+def warm_up():
+    """Import and load the model and the GenAI client, recording readiness."""
+    for name, step in WARMUP_STEPS:
+        readiness.mark(name, "loading")
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            readiness.mark(name, "failed", time.perf_counter() - start, str(e))
+            logger.exception("Warm-up of %s failed", name)
+        else:
+            readiness.mark(name, "ready", time.perf_counter() - start)
+
+
+def start_warm_up(mode: str):
+    """
+    Run the warm-up according to WARMUP_MODE:
+    "blocking" loads everything before the app serves, "background" serves
+    liveness probes right away and loads in a thread, "lazy" loads on first use.
+    """
+    if mode == "lazy":
+        readiness.lazy = True
+    elif mode == "blocking":
+        warm_up()
+    else:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
@@ -0,0 +1,12 @@
+"""
+Performance benchmarks for the backend.
+Run from the backend folder, e.g. `python -m benchmarks.batching_load_test`
+"""
+import os
+import tempfile
+
+# Settings are required at import time; benchmarks run against local stand-ins
+BENCHMARK_DB = os.path.join(tempfile.gettempdir(), "retentionai-benchmark.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{BENCHMARK_DB}")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-key")
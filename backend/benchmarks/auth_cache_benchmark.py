@@ -0,0 +1,56 @@
+"""
+Authenticated /predict throughput with and without the token cache.
+
+    python -m benchmarks.auth_cache_benchmark --requests 500
+"""
+import argparse
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from . import common
+from app.main import app
+from app.routers import auth
+
+
+def login(client: TestClient) -> dict:
+    username = f"bench-{uuid.uuid4().hex[:8]}"
+    client.post("/auth/register", json={"username": username, "password": "benchmark"})
+    token = client.post("/auth/token", data={"username": username, "password": "benchmark"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def drive(client: TestClient, headers: dict, requests: int) -> dict:
+    latencies = []
+    with common.Timer() as timer:
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = client.post("/predict", json=common.SAMPLE_EMPLOYEE, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+    return common.summarize(latencies, timer.elapsed)
+
+
+def run(requests: int):
+    cache = auth.token_cache
+    rows = []
+    with TestClient(app) as client:
+        headers = login(client)
+        drive(client, headers, 20)  # warm up model and connections
+
+        auth.token_cache = None
+        rows.append({"token_cache": "off", **drive(client, headers, requests)})
+
+        auth.token_cache = cache
+        rows.append({"token_cache": "on", **drive(client, headers, requests)})
+
+    common.print_table(rows, ["token_cache", "throughput", "p50_ms", "p95_ms", "p99_ms"])
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Token cache benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    run(args.requests)
@@ -0,0 +1,68 @@
+"""
+Micro-batching load test.
+
+Drives the /predict scoring path in-process with N concurrent clients,
+once with every request scored on its own and once through
+PredictionBatcher, and reports throughput and latency for each.
+
+    python -m benchmarks.batching_load_test --concurrency 1 8 32 128
+"""
+import argparse
+import asyncio
+import time
+
+from . import common
+from app.routers.prediction import predict_one, predict_many
+from app.services.batching_service import PredictionBatcher
+from app.services.inference_service import BoundedExecutor
+
+
+async def drive(call, employees, concurrency: int, requests_per_client: int):
+    latencies = []
+
+    async def client(offset: int):
+        for i in range(requests_per_client):
+            employee = employees[(offset + i) % len(employees)]
+            start = time.perf_counter()
+            await call(employee)
+            latencies.append(time.perf_counter() - start)
+
+    with common.Timer() as timer:
+        await asyncio.gather(*(client(c * requests_per_client) for c in range(concurrency)))
+    return common.summarize(latencies, timer.elapsed)
+
+
+async def run(concurrency_levels, requests_per_client, window_ms, max_batch_size, workers):
+    employees = common.make_employees(1000)
+    # Queue large enough that the test measures latency, not 429s
+    executor = BoundedExecutor("loadtest", workers, max(concurrency_levels), retry_after=1)
+    predict_one(employees[0])  # load the model before timing
+
+    rows = []
+    for concurrency in concurrency_levels:
+        direct = await drive(
+            lambda e: executor.run(predict_one, e), employees, concurrency, requests_per_client
+        )
+        rows.append({"mode": "direct", "clients": concurrency, "batch": 1.0, **direct})
+
+        batcher = PredictionBatcher(predict_many, executor, window_ms, max_batch_size)
+        batched = await drive(batcher.predict, employees, concurrency, requests_per_client)
+        rows.append({
+            "mode": "batched", "clients": concurrency,
+            "batch": batcher.stats()["mean_batch_size"], **batched
+        })
+
+    executor.shutdown()
+    common.print_table(rows, ["mode", "clients", "batch", "throughput", "p50_ms", "p99_ms"])
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching load test")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--requests", type=int, default=50, help="Requests per client")
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency, args.requests, args.window_ms, args.max_batch_size, args.workers))
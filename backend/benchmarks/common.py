@@ -0,0 +1,61 @@
+import time
+
+import numpy as np
+
+SAMPLE_EMPLOYEE = {
+    "Age": 30, "BusinessTravel": "Travel_Rarely", "DailyRate": 800,
+    "Department": "Sales", "DistanceFromHome": 5, "Education": 3,
+    "EducationField": "Marketing", "EnvironmentSatisfaction": 2, "Gender": "Male",
+    "HourlyRate": 60, "JobInvolvement": 3, "JobLevel": 2, "JobRole": "Sales Executive",
+    "JobSatisfaction": 2, "MaritalStatus": "Single", "MonthlyIncome": 5000,
+    "MonthlyRate": 15000, "NumCompaniesWorked": 3, "OverTime": "Yes",
+    "PercentSalaryHike": 12, "PerformanceRating": 3, "RelationshipSatisfaction": 3,
+    "StockOptionLevel": 0, "TotalWorkingYears": 8, "TrainingTimesLastYear": 2,
+    "WorkLifeBalance": 2, "YearsAtCompany": 3, "YearsInCurrentRole": 2,
+    "YearsSinceLastPromotion": 1, "YearsWithCurrManager": 2,
+}
+
+
+def make_employees(n: int, seed: int = 42) -> list:
+    """SAMPLE_EMPLOYEE with varied numeric fields, so results are not all identical."""
+    rng = np.random.default_rng(seed)
+    employees = []
+    for _ in range(n):
+        employee = dict(SAMPLE_EMPLOYEE)
+        employee["Age"] = int(rng.integers(18, 60))
+        employee["MonthlyIncome"] = int(rng.integers(2000, 20000))
+        employee["YearsAtCompany"] = int(rng.integers(0, 20))
+        employee["OverTime"] = "Yes" if rng.random() < 0.3 else "No"
+        employees.append(employee)
+    return employees
+
+
+def summarize(latencies: list, elapsed: float) -> dict:
+    """Throughput and latency percentiles (ms) for a list of per-request seconds."""
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return {
+        "requests": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+    }
+
+
+def print_table(rows: list, columns: list):
+    print(" ".join(f"{c:>12}" for c in columns))
+    for row in rows:
+        cells = []
+        for c in columns:
+            value = row[c]
+            cells.append(f"{value:>12.2f}" if isinstance(value, float) else f"{value!s:>12}")
+        print(" ".join(cells))
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
@@ -0,0 +1,91 @@
+"""
+Login storm benchmark.
+
+Measures /predict latency on its own, then again while many clients hammer
+/auth/token, and reports login throughput. bcrypt runs on the password pool,
+so prediction latency should barely move during the storm.
+
+    python -m benchmarks.login_storm_benchmark --logins 200 --login-clients 32
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from . import common
+from app.main import app
+from app.services.auth_service import password_hasher
+
+
+async def setup(client: httpx.AsyncClient):
+    username = f"bench-{uuid.uuid4().hex[:8]}"
+    await client.post("/auth/register", json={"username": username, "password": "benchmark"})
+    response = await client.post("/auth/token", data={"username": username, "password": "benchmark"})
+    return username, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def predict_loop(client, headers, stop: asyncio.Event, latencies: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.post("/predict", json=common.SAMPLE_EMPLOYEE, headers=headers)
+        latencies.append(time.perf_counter() - start)
+
+
+async def measure_predict(client, headers, seconds: float) -> dict:
+    latencies = []
+    stop = asyncio.Event()
+    task = asyncio.create_task(predict_loop(client, headers, stop, latencies))
+    await asyncio.sleep(seconds)
+    stop.set()
+    await task
+    return common.summarize(latencies, seconds)
+
+
+async def login_storm(client, username: str, logins: int, clients: int) -> dict:
+    latencies = []
+    rejected = 0
+
+    async def login_client(n: int):
+        nonlocal rejected
+        for _ in range(n):
+            start = time.perf_counter()
+            response = await client.post("/auth/token", data={"username": username, "password": "benchmark"})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code == 429:
+                rejected += 1
+
+    with common.Timer() as timer:
+        await asyncio.gather(*(login_client(logins // clients) for _ in range(clients)))
+    return {**common.summarize(latencies, timer.elapsed), "rejected": rejected}
+
+
+async def run(logins: int, login_clients: int, seconds: float):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        username, headers = await setup(client)
+        await measure_predict(client, headers, 0.5)  # warm up
+
+        idle = await measure_predict(client, headers, seconds)
+
+        storm = asyncio.create_task(login_storm(client, username, logins, login_clients))
+        during = await measure_predict(client, headers, seconds)
+        logins_result = await storm
+
+    common.print_table(
+        [{"predict": "idle", **idle}, {"predict": "login storm", **during}],
+        ["predict", "throughput", "p50_ms", "p95_ms", "p99_ms"],
+    )
+    print(f"\nlogins: {logins_result['throughput']:.1f}/s, p50 {logins_result['p50_ms']:.1f} ms, "
+          f"p99 {logins_result['p99_ms']:.1f} ms, 429s {logins_result['rejected']}")
+    print(f"password pool: {password_hasher.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login storm benchmark")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--login-clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.login_clients, args.seconds))
@@ -0,0 +1,47 @@
+"""
+Cost of the /metrics instrumentation: per-timer overhead and /predict
+throughput with metrics enabled vs disabled (toggled at runtime).
+
+    python -m benchmarks.metrics_overhead --requests 1000
+"""
+import argparse
+import timeit
+
+from fastapi.testclient import TestClient
+
+from . import common
+from .auth_cache_benchmark import drive, login
+from app.main import app
+from app.services.metrics_service import metrics
+
+
+def timer_cost_ns(enabled: bool, number: int = 200000) -> float:
+    metrics.enabled = enabled
+
+    def timed_noop():
+        with metrics.timed("bench"):
+            pass
+
+    return min(timeit.repeat(timed_noop, number=number, repeat=5)) / number * 1e9
+
+
+def run(requests: int):
+    print(f"timed() disabled: {timer_cost_ns(False):.0f} ns, enabled: {timer_cost_ns(True):.0f} ns per stage")
+
+    rows = []
+    with TestClient(app) as client:
+        headers = login(client)
+        drive(client, headers, 20)  # warm up model and connections
+        for enabled in (False, True, False, True):
+            metrics.enabled = enabled
+            rows.append({"metrics": "on" if enabled else "off", **drive(client, headers, requests)})
+
+    common.print_table(rows, ["metrics", "throughput", "p50_ms", "p95_ms", "p99_ms"])
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Metrics overhead benchmark")
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.requests)
@@ -0,0 +1,52 @@
+"""
+Retention plan prompt size: full employee profile vs top model factors.
+Tokens are approximated as characters / 4.
+
+    python -m benchmarks.prompt_benchmark --employees 1000 --top-k 3 5 8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from . import common
+from app.services.genai_service import PlanGenerator, RetentionAgent
+from app.services.ml_service import get_predictor
+
+
+def prompt_sizes(agent: RetentionAgent, employees: list, risk_levels: list, factors: list) -> dict:
+    chars = np.array([
+        len(agent.build_prompt(employee, risk, f))
+        for employee, risk, f in zip(employees, risk_levels, factors)
+    ])
+    return {"mean_chars": float(chars.mean()), "approx_tokens": float(chars.mean() / 4)}
+
+
+def run(n: int, top_ks: list):
+    predictor = get_predictor()
+    agent = RetentionAgent(generator=PlanGenerator())
+    employees = common.make_employees(n)
+    risk_levels = [p["risk_level"] for p in predictor.predict_batch(employees)]
+
+    rows = [{"prompt": "full profile", **prompt_sizes(agent, employees, risk_levels, [None] * n),
+             "explain_ms": 0.0}]
+    for k in top_ks:
+        start = time.perf_counter()
+        factors = predictor.explain(employees, k)
+        explain_ms = (time.perf_counter() - start) * 1000 / n
+        rows.append({"prompt": f"top {k}", **prompt_sizes(agent, employees, risk_levels, factors),
+                     "explain_ms": explain_ms})
+
+    full = rows[0]["mean_chars"]
+    for row in rows:
+        row["vs_full"] = f"{row['mean_chars'] / full:.0%}"
+    common.print_table(rows, ["prompt", "mean_chars", "approx_tokens", "vs_full", "explain_ms"])
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plan prompt size benchmark")
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, nargs="+", default=[3, 5, 8])
+    args = parser.parse_args()
+    run(args.employees, args.top_k)
@@ -0,0 +1,109 @@
+"""
+Startup profile: import-time breakdown of `app.main` and time to liveness
+and readiness for each WARMUP_MODE. Exits non-zero when the app import goes
+over budget or pulls in a module that must stay lazy, so it can gate CI.
+
+    python -m benchmarks.startup_profile
+    python -m benchmarks.startup_profile --budget-ms 1500 --top 15
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from . import common
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Heavy modules that only the warm-up / first request may import
+LAZY_MODULES = ["pandas", "sklearn", "joblib", "google.generativeai", "pyarrow"]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+STARTUP_SCRIPT = """
+import os, time
+start = float(os.environ["STARTUP_T0"])
+from fastapi.testclient import TestClient
+from app.main import app
+with TestClient(app) as client:
+    assert client.get("/health/live").status_code == 200
+    print("live", time.time() - start, flush=True)
+    while client.get("/health/ready").status_code != 200:
+        time.sleep(0.01)
+    print("ready", time.time() - start, flush=True)
+"""
+
+
+def run_python(args: list, env: dict = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-W", "ignore", *args], cwd=BACKEND_DIR, env={**os.environ, **(env or {})},
+        capture_output=True, text=True, check=True
+    )
+
+
+def import_profile() -> list:
+    """(module, self_us, cumulative_us, depth) for every module imported by app.main."""
+    result = run_python(["-X", "importtime", "-c", "import app.main"])
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def startup_times(mode: str) -> dict:
+    result = run_python(["-c", STARTUP_SCRIPT], {"STARTUP_T0": repr(time.time()), "WARMUP_MODE": mode})
+    return {name: float(value) for name, value in (line.split() for line in result.stdout.splitlines()
+                                                    if line.startswith(("live", "ready")))}
+
+
+def run(budget_ms: float, top: int) -> int:
+    rows = import_profile()
+    modules = {module for module, *_ in rows}
+    total_ms = next(cumulative for module, _, cumulative, _ in rows if module == "app.main") / 1000
+
+    by_package = defaultdict(int)
+    for module, self_us, _, _ in rows:
+        by_package[module.split(".")[0]] += self_us
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    common.print_table(
+        [{"package": name, "self ms": round(us / 1000, 1)} for name, us in packages],
+        ["package", "self ms"]
+    )
+
+    direct = sorted((row for row in rows if row[3] <= 1), key=lambda row: row[2], reverse=True)[:top]
+    common.print_table(
+        [{"module": module, "cumulative ms": round(cumulative / 1000, 1)} for module, _, cumulative, _ in direct],
+        ["module", "cumulative ms"]
+    )
+
+    common.print_table(
+        [{"mode": mode, **{f"{k} s": round(v, 3) for k, v in startup_times(mode).items()}}
+         for mode in ("background", "blocking", "lazy")],
+        ["mode", "live s", "ready s"]
+    )
+
+    failures = []
+    print(f"\nimport app.main: {total_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+    if total_ms > budget_ms:
+        failures.append(f"import time {total_ms:.0f} ms over budget {budget_ms:.0f} ms")
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=2000)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(run(args.budget_ms, args.top))
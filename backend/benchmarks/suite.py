@@ -0,0 +1,281 @@
+"""
+Benchmark suite: ML micro-benchmarks plus an end-to-end load test of the
+API, compared against a stored baseline so it can gate merges.
+
+Micro: ChurnPredictor.predict, predict_batch, the predictor's own input
+preprocessing (model_input) and DataPreprocessor.transform at several
+batch sizes. End to end: concurrent clients drive /auth/token, /predict
+and /generate-retention-plan on the real app (in-process over ASGI, with
+its lifespan), a throwaway SQLite database and a fake Gemini generator.
+
+    python -m benchmarks.suite                       # run, compare with baseline.json
+    python -m benchmarks.suite --save-baseline       # run and store the new baseline
+    python -m benchmarks.suite --only micro --tolerance 0.3 --output results.json
+
+Exits 1 if a result regressed by more than the tolerance or a request failed.
+Baselines are only comparable on the same machine and setup: if the stored
+environment or settings differ from this run, nothing is gated and the suite
+exits 3. Regenerate the baseline with --save-baseline on the gating runner.
+"""
+import argparse
+import atexit
+import asyncio
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Throwaway database, removed when the process exits
+BENCH_DIR = tempfile.mkdtemp(prefix="retentionai-bench-")
+atexit.register(shutil.rmtree, BENCH_DIR, ignore_errors=True)
+
+# Pinned so runs are comparable; must be set before the app is imported
+BENCH_ENV = {
+    "DATABASE_URL": f"sqlite:///{BENCH_DIR}/bench.db",
+    "SECRET_KEY": "benchmark",
+    "GEMINI_API_KEY": "benchmark",
+    "WARMUP_MODE": "blocking",
+    "PREDICT_BATCHING_ENABLED": "false",
+    "PREDICTION_CACHE_ENABLED": "true",
+    "PLAN_CACHE_ENABLED": "true",
+    "METRICS_ENABLED": "true",
+}
+os.environ.update(BENCH_ENV)
+
+import httpx  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from . import common  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import genai_service  # noqa: E402
+from app.services.genai_service import PlanGenerator, RetentionAgent  # noqa: E402
+from app.services.ml_service import get_predictor, ml_module  # noqa: E402
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+EXIT_REGRESSION = 1
+EXIT_BASELINE_MISMATCH = 3
+BATCH_SIZES = (1, 10, 100, 1000)
+
+# metric -> +1 if higher is better, -1 if lower is better.
+# Tail latencies are reported but not gated: too noisy on shared CI machines.
+GATED_METRICS = {"throughput": 1, "p50_ms": -1}
+
+FAKE_PLAN = "1. Review compensation.\n2. Reduce overtime.\n3. Discuss a growth path."
+
+
+class FakeGemini(PlanGenerator):
+    """Stands in for Gemini: a fixed plan after a fixed delay, no network."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate(self, prompt: str) -> str:
+        time.sleep(self.latency)
+        return FAKE_PLAN
+
+    async def stream(self, prompt: str):
+        await asyncio.sleep(self.latency)
+        yield FAKE_PLAN
+
+
+def per_call(func, args_list: list) -> dict:
+    """Time func(args) for each entry; throughput in calls per second."""
+    latencies = []
+    with common.Timer() as timer:
+        for args in args_list:
+            start = time.perf_counter()
+            func(args)
+            latencies.append(time.perf_counter() - start)
+    return common.summarize(latencies, timer.elapsed)
+
+
+def batches(employees: list, size: int, rows: int) -> list:
+    """About `rows` rows (at least 20 batches) of `size` employees each."""
+    starts = range(0, len(employees) - size + 1, size)
+    return [employees[starts[i % len(starts)]:][:size] for i in range(max(rows // size, 20))]
+
+
+def micro_benchmarks(scale: float) -> dict:
+    predictor = get_predictor()
+    employees = common.make_employees(max(int(5000 * scale), 1000), seed=7)
+    rows = max(int(20000 * scale), 1000)
+
+    preprocessing = ml_module("preprocessing")
+    preprocessor = preprocessing.DataPreprocessor()
+    preprocessor.fit_transform(pd.DataFrame(common.make_employees(5000, seed=3)))
+
+    # Warm up caches and lazily built state (vectorizer, attributor)
+    per_call(predictor.predict, employees[:200])
+    per_call(predictor.predict_batch, batches(employees, 100, 2000))
+
+    results = {"micro/predict": per_call(predictor.predict, employees[:max(int(2000 * scale), 200)])}
+    for size in BATCH_SIZES:
+        work = batches(employees, size, rows)
+        for name, func in (("predict_batch", predictor.predict_batch),
+                           ("model_input", predictor.model_input),
+                           ("transform", lambda batch: preprocessor.transform(pd.DataFrame(batch)))):
+            stats = per_call(func, work)
+            stats["rows_per_s"] = stats["throughput"] * size
+            results[f"micro/{name}/{size}"] = stats
+    return results
+
+
+async def load(client: httpx.AsyncClient, send, requests: int, concurrency: int) -> dict:
+    """`concurrency` clients share `requests` calls of send(client, i)."""
+    latencies = []
+    errors = 0
+    pending = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in pending:
+            start = time.perf_counter()
+            response = await send(client, i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    with common.Timer() as timer:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {**common.summarize(latencies, timer.elapsed), "errors": errors}
+
+
+async def e2e_benchmarks(scale: float, concurrency: int, genai_latency: float) -> dict:
+    genai_service.set_agent(RetentionAgent(
+        generator=FakeGemini(genai_latency),
+        store=genai_service.PlanStore(),
+        timeout=genai_latency * 20 + 5,
+    ))
+    # Unique profiles, so the prediction and plan caches do not turn this into a cache test
+    employees = common.make_employees(max(int(4000 * scale), 500), seed=11)
+    credentials = {"username": "benchmark", "password": "benchmark-password"}
+    transport = httpx.ASGITransport(app=app)
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            await client.post("/auth/register", json=credentials)
+            token = (await client.post("/auth/token", data=credentials)).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            await client.post("/predict", json=employees[-1], headers=headers)  # warm up
+
+            def login(client, i):
+                return client.post("/auth/token", data=credentials)
+
+            def predict(client, i):
+                return client.post("/predict", json=employees[i % len(employees)], headers=headers)
+
+            def plan(client, i):
+                employee = employees[-(i % len(employees)) - 1]
+                return client.post("/generate-retention-plan", json=employee, headers=headers)
+
+            return {
+                # bcrypt bound by design, so few calls
+                "e2e/auth_token": await load(client, login, max(int(20 * scale), 5), min(concurrency, 4)),
+                "e2e/predict": await load(client, predict, max(int(2000 * scale), 100), concurrency),
+                "e2e/generate_retention_plan": await load(client, plan, max(int(400 * scale), 50), concurrency),
+            }
+
+
+def environment() -> dict:
+    versions = {}
+    for name in ("numpy", "pandas", "sklearn", "fastapi", "pydantic", "sqlalchemy"):
+        module = sys.modules.get(name) or __import__(name)
+        versions[name] = getattr(module, "__version__", "?")
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "model": get_predictor().model_name,
+        **versions,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, noise_ms: float) -> list:
+    """Regressions beyond `tolerance` (relative); latencies under `noise_ms` are ignored."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        for metric, direction in GATED_METRICS.items():
+            old, new = previous[metric], current[metric]
+            if not old or (metric.endswith("_ms") and max(old, new) < noise_ms):
+                continue
+            change = (new - old) / old
+            current[f"{metric}_change"] = change
+            if -direction * change > tolerance:
+                regressions.append(f"{name} {metric}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+    return regressions
+
+
+def print_results(results: dict):
+    print(f"\n{'benchmark':<34} {'ops/s':>10} {'rows/s':>11} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'Δ ops/s':>8} {'Δ p50':>7}")
+    for name, r in results.items():
+        rows_per_s = f"{r['rows_per_s']:>11.0f}" if "rows_per_s" in r else f"{'':>11}"
+        deltas = " ".join(
+            f"{r[key]:>+7.0%}" if key in r else f"{'-':>7}" for key in ("throughput_change", "p50_ms_change")
+        )
+        errors = f"  errors={r['errors']}" if r.get("errors") else ""
+        print(f"{name:<34} {r['throughput']:>10.1f} {rows_per_s} {r['p50_ms']:>8.3f} {r['p95_ms']:>8.3f} "
+              f"{r['p99_ms']:>8.3f} {deltas}{errors}")
+
+
+def run(only: str, scale: float, concurrency: int, genai_latency: float, baseline_path: Path,
+        save_baseline: bool, tolerance: float, noise_ms: float, output: Path = None) -> int:
+    results = {}
+    if only in ("all", "micro"):
+        results.update(micro_benchmarks(scale))
+    if only in ("all", "e2e"):
+        results.update(asyncio.run(e2e_benchmarks(scale, concurrency, genai_latency)))
+    report = {"environment": environment(), "settings": {"scale": scale, "concurrency": concurrency,
+                                                         "genai_latency": genai_latency},
+              "results": results}
+
+    failures = [f"{name}: {r['errors']} failed requests" for name, r in results.items() if r.get("errors")]
+    mismatch = []
+    if save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline saved to: {baseline_path}")
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        mismatch = [key for key in ("environment", "settings") if baseline.get(key) != report[key]]
+        for key in mismatch:
+            print(f"Baseline {key} differs:\n  baseline: {baseline.get(key)}\n  this run: {report[key]}")
+        if not mismatch:
+            failures += compare(results, baseline, tolerance, noise_ms)
+    else:
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+
+    print_results(results)
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2, sort_keys=True, default=float) + "\n")
+    if failures:
+        print(f"\nREGRESSIONS (tolerance {tolerance:.0%}):")
+        print("\n".join(f"  {failure}" for failure in failures))
+        return EXIT_REGRESSION
+    if mismatch:
+        print("\nNot gated: the baseline was recorded elsewhere. Regenerate it on this runner "
+              "with --save-baseline.")
+        return EXIT_BASELINE_MISMATCH
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark suite with baseline comparison")
+    parser.add_argument("--only", choices=("all", "micro", "e2e"), default="all")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply request and row counts")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent API clients")
+    parser.add_argument("--genai-latency", type=float, default=0.05, help="Fake Gemini delay (s)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--noise-ms", type=float, default=0.05, help="Ignore latency changes below this")
+    parser.add_argument("--output", type=Path, default=None, help="Also write the report as JSON")
+    args = parser.parse_args()
+    sys.exit(run(args.only, args.scale, args.concurrency, args.genai_latency, args.baseline,
+                 args.save_baseline, args.tolerance, args.noise_ms, args.output))
@@ -0,0 +1,5 @@
+# RetentionAI ML benchmarks
+"""
+Performance benchmarks for the ML pipeline.
+Run from the ml folder, e.g. `python -m benchmarks.predict_benchmark`
+"""
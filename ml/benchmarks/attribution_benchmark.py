@@ -0,0 +1,90 @@
+"""
+Attribution Benchmark
+Exactness and per-row cost of ChurnPredictor.explain (top-k contributions)
+
+Uses the same cases as the compiled benchmark (shipped model plus
+LogisticRegression, GradientBoosting and RandomForest on the
+DataPreprocessor layout), with both the sklearn and compiled backends.
+Exactness: base_value + sum(contributions) must equal the model output
+(probability for forests, log-odds for linear and boosting models).
+Forests are also checked on rows with missing (NaN) cells.
+
+Usage (from the ml folder):
+    python -m benchmarks.attribution_benchmark
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.predict import ChurnPredictor
+
+from .common import make_employees
+from .compiled_benchmark import build_cases
+
+
+def model_output(attributor, probabilities):
+    if attributor.kind == 'forest':
+        return probabilities
+    return np.log(probabilities / (1 - probabilities))
+
+
+def additivity_error(predictor, attributor, X):
+    expected = model_output(attributor, predictor.model_proba(X)[:, 1])
+    return float(np.abs(attributor.contributions(X).sum(axis=1) + attributor.base_value - expected).max())
+
+
+def measure(predictor, employees, top_k, batch_size, nan_fraction=0.1):
+    attributor = predictor.get_attributor()
+    X = np.asarray(predictor.model_input(employees), dtype=np.float64)
+    error = additivity_error(predictor, attributor, X)
+    nan_error = None
+    if attributor.kind == 'forest':
+        # sklearn only accepts NaN for forests among these models
+        X = X.copy()
+        X[np.random.default_rng(0).random(X.shape) < nan_fraction] = np.nan
+        nan_error = additivity_error(predictor, attributor, X)
+
+    start = time.perf_counter()
+    for i in range(0, len(employees), batch_size):
+        predictor.explain(employees[i:i + batch_size], top_k)
+    batch_ms = (time.perf_counter() - start) * 1000 / len(employees)
+
+    samples = []
+    for employee in employees[:500]:
+        start = time.perf_counter()
+        predictor.explain([employee], top_k)
+        samples.append(time.perf_counter() - start)
+
+    return {'kind': attributor.kind, 'max_error': error, 'nan_error': nan_error, 'batch_ms_per_row': batch_ms,
+            'single_ms': float(np.median(samples)) * 1000}
+
+
+def run(n=5000, top_k=5, batch_size=1000):
+    employees = make_employees(n)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (model_path, preprocessor_path, artifact_path) in build_cases(Path(tmp)).items():
+            for backend, predictor in (('sklearn', ChurnPredictor(model_path, preprocessor_path)),
+                                       ('compiled', ChurnPredictor(artifact_path))):
+                results.append({'case': name, 'backend': backend,
+                                **measure(predictor, employees, top_k, batch_size)})
+
+    print(f"\n{'case':>22} {'backend':>9} {'kind':>9} {'max error':>10} {'NaN error':>10} "
+          f"{'batch ms/row':>13} {'single ms':>10}")
+    for r in results:
+        nan = f"{r['nan_error']:>10.1e}" if r['nan_error'] is not None else f"{'-':>10}"
+        print(f"{r['case']:>22} {r['backend']:>9} {r['kind']:>9} {r['max_error']:>10.1e} {nan} "
+              f"{r['batch_ms_per_row']:>13.4f} {r['single_ms']:>10.3f}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", type=int, default=5000, help="Employees to explain")
+    parser.add_argument("-k", type=int, default=5, help="Top contributions per employee")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.n, args.k, args.batch_size)
@@ -0,0 +1,91 @@
+"""
+Shared helpers for the ML benchmarks
+Synthetic employee profiles and timing utilities
+"""
+import time
+
+import numpy as np
+
+from src.config import CATEGORICAL_COLUMNS, NUMERICAL_COLUMNS
+
+
+# Value ranges follow generate_synthetic_data() in notebooks/train_model.ipynb
+NUMERICAL_RANGES = {
+    "Age": (18, 60),
+    "DailyRate": (100, 1500),
+    "DistanceFromHome": (1, 30),
+    "Education": (1, 6),
+    "EnvironmentSatisfaction": (1, 5),
+    "HourlyRate": (30, 100),
+    "JobInvolvement": (1, 5),
+    "JobLevel": (1, 6),
+    "JobSatisfaction": (1, 5),
+    "MonthlyIncome": (2000, 20000),
+    "MonthlyRate": (2000, 27000),
+    "NumCompaniesWorked": (0, 10),
+    "PercentSalaryHike": (11, 26),
+    "PerformanceRating": (3, 5),
+    "RelationshipSatisfaction": (1, 5),
+    "StockOptionLevel": (0, 4),
+    "TotalWorkingYears": (0, 40),
+    "TrainingTimesLastYear": (0, 7),
+    "WorkLifeBalance": (1, 5),
+    "YearsAtCompany": (0, 20),
+    "YearsInCurrentRole": (0, 15),
+    "YearsSinceLastPromotion": (0, 15),
+    "YearsWithCurrManager": (0, 15),
+}
+
+CATEGORY_VALUES = {
+    "BusinessTravel": ["Travel_Rarely", "Travel_Frequently", "Non-Travel"],
+    "Department": ["Sales", "Research & Development", "Human Resources"],
+    "EducationField": ["Life Sciences", "Medical", "Marketing", "Technical Degree", "Other"],
+    "Gender": ["Male", "Female"],
+    "JobRole": ["Sales Executive", "Research Scientist", "Laboratory Technician",
+                "Manufacturing Director", "Healthcare Representative"],
+    "MaritalStatus": ["Single", "Married", "Divorced"],
+    "OverTime": ["Yes", "No"],
+}
+
+
+def make_employees(n, seed=42):
+    """
+    Generate n synthetic employee dictionaries shaped like EmployeeData.
+    
+    Parameters:
+        n: Number of employees
+        seed: Random seed for reproducibility
+        
+    Returns:
+        List of employee dictionaries
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for col in NUMERICAL_COLUMNS:
+        low, high = NUMERICAL_RANGES[col]
+        columns[col] = rng.integers(low, high, n).tolist()
+    for col in CATEGORICAL_COLUMNS:
+        columns[col] = rng.choice(CATEGORY_VALUES[col], n).tolist()
+    
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def time_call(func, repeat=3):
+    """
+    Run func several times and return the best wall-clock time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    """
+    Percentiles of a list of latencies (seconds), returned in milliseconds.
+    """
+    values = np.percentile(np.asarray(samples) * 1000, points)
+    return {f"p{p}": float(v) for p, v in zip(points, values)}
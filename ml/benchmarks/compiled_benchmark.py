@@ -0,0 +1,171 @@
+"""
+Compiled Model Benchmark
+Parity and latency of the exported NumPy runtime vs the sklearn path
+
+Checks the shipped model (LabelEncoders + RandomForest) and models trained
+here on the DataPreprocessor ColumnTransformer: LogisticRegression,
+GradientBoosting and RandomForest. Forests are also compared on
+model-ready rows with missing (NaN) cells, which sklearn routes per split.
+Exits non-zero on a parity failure.
+
+Usage (from the ml folder):
+    python -m benchmarks.compiled_benchmark
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from src.config import MODELS_DIR
+from src.export import export_model
+from src.predict import ChurnPredictor, risk_levels
+from src.preprocessing import DataPreprocessor
+
+from .common import make_employees, percentiles
+
+TOLERANCE = 1e-9
+
+CANDIDATES = {
+    'LogisticRegression': lambda: LogisticRegression(max_iter=1000),
+    'GradientBoosting': lambda: GradientBoostingClassifier(n_estimators=100, random_state=42),
+    'RandomForest': lambda: RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42),
+}
+
+
+def synthetic_labels(employees, seed=0):
+    """Churn labels loosely driven by overtime, satisfaction and income."""
+    df = pd.DataFrame(employees)
+    rng = np.random.default_rng(seed)
+    score = (
+        (df['OverTime'] == 'Yes') * 1.2
+        - df['JobSatisfaction'] * 0.4
+        - df['MonthlyIncome'] / 10000
+        + rng.normal(0, 0.8, len(df))
+    )
+    return (score > score.quantile(0.8)).astype(int).to_numpy()
+
+
+def build_cases(directory, n_train=5000):
+    """
+    Write (model, preprocessor) pickles and their exported artifact per case.
+
+    Returns:
+        Dict of case name -> (model_path, preprocessor_path, artifact_path)
+    """
+    cases = {}
+    shipped = directory / "shipped.npz"
+    export_model(output_path=shipped)
+    cases['shipped RandomForest'] = (MODELS_DIR / "best_model.pkl", MODELS_DIR / "preprocessor.pkl", shipped)
+
+    employees = make_employees(n_train, seed=7)
+    preprocessor = DataPreprocessor()
+    X = preprocessor.fit_transform(pd.DataFrame(employees))
+    y = synthetic_labels(employees)
+    preprocessor_path = preprocessor.save(directory / "preprocessor.pkl")
+
+    for name, make_model in CANDIDATES.items():
+        model_path = directory / f"{name}.pkl"
+        joblib.dump({'model': make_model().fit(X, y), 'model_name': name, 'metrics': {}}, model_path)
+        artifact_path = directory / f"{name}.npz"
+        export_model(model_path, preprocessor_path, artifact_path)
+        cases[name] = (model_path, preprocessor_path, artifact_path)
+    return cases
+
+
+def single_latency(predictor, employees):
+    samples = []
+    for employee in employees:
+        start = time.perf_counter()
+        predictor.predict(employee)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples, points=(50, 99))
+
+
+def batch_seconds(predictor, employees):
+    start = time.perf_counter()
+    predictor.predict_proba_batch(employees)
+    return time.perf_counter() - start
+
+
+def nan_diff(sklearn_predictor, compiled_predictor, employees, fraction=0.1, seed=0):
+    """
+    Max P(churn) difference on model-ready rows with a fraction of cells set to NaN.
+    None unless the model is a forest (sklearn rejects NaN for the others).
+    """
+    if compiled_predictor.model.kind != 'forest':
+        return None
+    X = compiled_predictor.model_input(employees).astype(np.float64)
+    X[np.random.default_rng(seed).random(X.shape) < fraction] = np.nan
+    expected = sklearn_predictor.model.predict_proba(X)[:, 1]
+    return float(np.abs(expected - compiled_predictor.model.churn_probability(X)).max())
+
+
+def compare(sklearn_predictor, compiled_predictor, employees, n_single):
+    expected = sklearn_predictor.predict_proba_batch(employees)
+    actual = compiled_predictor.predict_proba_batch(employees)
+    single_diff = max(
+        abs(sklearn_predictor.predict(e)['churn_probability'] - compiled_predictor.predict(e)['churn_probability'])
+        for e in employees[:n_single]
+    )
+    return {
+        'max_diff': max(float(np.abs(expected - actual).max()), single_diff),
+        'nan_diff': nan_diff(sklearn_predictor, compiled_predictor, employees),
+        'risk_match': float((risk_levels(expected) == risk_levels(actual)).mean())
+    }
+
+
+def run(n=5000, n_single=1000):
+    employees = make_employees(n)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (model_path, preprocessor_path, artifact_path) in build_cases(Path(tmp)).items():
+            sklearn_predictor = ChurnPredictor(model_path, preprocessor_path)
+            compiled_predictor = ChurnPredictor(artifact_path)
+            parity = compare(sklearn_predictor, compiled_predictor, employees, n_single)
+
+            for predictor in (sklearn_predictor, compiled_predictor):
+                single_latency(predictor, employees[:50])  # warm up
+            sklearn_single = single_latency(sklearn_predictor, employees[:n_single])
+            compiled_single = single_latency(compiled_predictor, employees[:n_single])
+
+            results.append({
+                'case': name,
+                **parity,
+                'sklearn_p50': sklearn_single['p50'],
+                'compiled_p50': compiled_single['p50'],
+                'sklearn_p99': sklearn_single['p99'],
+                'compiled_p99': compiled_single['p99'],
+                'sklearn_batch': batch_seconds(sklearn_predictor, employees),
+                'compiled_batch': batch_seconds(compiled_predictor, employees)
+            })
+
+    print(f"\n{'case':>22} {'max diff':>9} {'NaN diff':>9} {'risk eq':>8} {'p50 skl':>8} {'p50 npz':>8} "
+          f"{'p99 skl':>8} {'p99 npz':>8} {'batch skl':>10} {'batch npz':>10}")
+    for r in results:
+        nan = f"{r['nan_diff']:>9.1e}" if r['nan_diff'] is not None else f"{'-':>9}"
+        print(f"{r['case']:>22} {r['max_diff']:>9.1e} {nan} {r['risk_match']:>8.2%} "
+              f"{r['sklearn_p50']:>8.3f} {r['compiled_p50']:>8.3f} "
+              f"{r['sklearn_p99']:>8.3f} {r['compiled_p99']:>8.3f} "
+              f"{r['sklearn_batch']:>9.3f}s {r['compiled_batch']:>9.3f}s")
+    print(f"(latency in ms, batch = {n} rows)")
+
+    failed = [r['case'] for r in results if max(r['max_diff'], r['nan_diff'] or 0) > TOLERANCE]
+    if failed:
+        print(f"PARITY FAILED (> {TOLERANCE}): {', '.join(failed)}")
+    return results, not failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", type=int, default=5000, help="Employees for parity and batch timing")
+    parser.add_argument("--single", type=int, default=1000, help="Single-row predictions per path")
+    args = parser.parse_args()
+    _, ok = run(args.n, args.single)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,47 @@
+"""
+Single-Row Latency Benchmark
+p50/p99 latency of ChurnPredictor.predict, NumPy fast path vs pandas path
+
+Usage (from the ml folder):
+    python -m benchmarks.latency_benchmark
+"""
+import argparse
+import time
+
+from src.predict import ChurnPredictor
+
+from .common import make_employees, percentiles
+
+
+def measure(predictor, employees):
+    samples = []
+    for employee in employees:
+        start = time.perf_counter()
+        predictor.predict(employee)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples, points=(50, 99))
+
+
+def run(n=2000):
+    fast = ChurnPredictor(fast_path=True)
+    slow = ChurnPredictor(fast_path=False)
+    employees = make_employees(n)
+    
+    # Warm up both paths
+    measure(fast, employees[:50])
+    measure(slow, employees[:50])
+    
+    results = {'numpy': measure(fast, employees), 'pandas': measure(slow, employees)}
+    
+    print(f"\n{'path':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for path, stats in results.items():
+        print(f"{path:>8} {stats['p50']:>9.3f} {stats['p99']:>9.3f}")
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", type=int, default=2000, help="Number of predictions per path")
+    args = parser.parse_args()
+    run(args.n)
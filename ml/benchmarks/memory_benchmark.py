@@ -0,0 +1,139 @@
+"""
+Worker Memory Benchmark
+RSS/PSS per worker and startup time for 1, 4 and 16 worker processes,
+plain pickle load vs packed forest memory-mapped from disk
+
+The shipped model is tiny, so a larger forest is trained on synthetic
+employees (same preprocessor and feature layout) to make model memory visible.
+Linux only (reads /proc/self/smaps_rollup).
+
+Usage (from the ml folder):
+    python -m benchmarks.memory_benchmark
+    python -m benchmarks.memory_benchmark --workers 1 4 16 --trees 100
+"""
+import argparse
+import multiprocessing
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from src.config import MODELS_DIR
+from src.forest import pack_model
+from src.predict import ChurnPredictor
+
+from .common import make_employees
+
+
+def memory_kb():
+    """RSS, PSS and private (anonymous) memory of this process, in kB."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:", "Anonymous:"):
+                fields[parts[0][:-1].lower()] = int(parts[1])
+    return fields
+
+
+def build_models(directory, n_trees, n_rows=20000):
+    """
+    Train a bigger forest and write it in both layouts.
+
+    Returns:
+        (pickle_model_path, packed_model_path, preprocessor_path)
+    """
+    preprocessor_path = directory / "preprocessor.pkl"
+    shutil.copy2(MODELS_DIR / "preprocessor.pkl", preprocessor_path)
+
+    base = ChurnPredictor()
+    X = base.transform(pd.DataFrame(make_employees(n_rows)))
+    y = np.random.default_rng(0).random(n_rows) < 0.3
+    model = RandomForestClassifier(n_estimators=n_trees, random_state=42, n_jobs=-1).fit(X, y)
+
+    pickle_path = directory / "best_model.pkl"
+    joblib.dump({'model': model, 'model_name': 'RandomForest_bench', 'metrics': {}}, pickle_path)
+    packed_path = directory / "best_model.packed.pkl"
+    pack_model(pickle_path, packed_path)
+    return pickle_path, packed_path, preprocessor_path
+
+
+def worker(model_path, preprocessor_path, mmap_mode, barrier, results):
+    before = memory_kb()
+    start = time.perf_counter()
+    predictor = ChurnPredictor(model_path, preprocessor_path, mmap_mode=mmap_mode)
+    predictor.predict_batch(make_employees(100))  # touch every tree
+    startup = time.perf_counter() - start
+
+    # Measure once every worker is up, so shared pages are split between all
+    barrier.wait()
+    after = memory_kb()
+    results.put({
+        'startup': startup,
+        'rss': after['rss'],
+        'pss': after['pss'],
+        'model_private': after['anonymous'] - before['anonymous']
+    })
+    barrier.wait()
+
+
+def measure(n_workers, model_path, preprocessor_path, mmap_mode):
+    # spawn, like uvicorn --workers: nothing is inherited from this process
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(n_workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(model_path, preprocessor_path, mmap_mode, barrier, results))
+        for _ in range(n_workers)
+    ]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    return {
+        'startup_s': float(np.mean([s['startup'] for s in samples])),
+        'rss_mb': float(np.mean([s['rss'] for s in samples])) / 1024,
+        'pss_mb': float(np.mean([s['pss'] for s in samples])) / 1024,
+        'total_pss_mb': sum(s['pss'] for s in samples) / 1024,
+        'model_private_mb': float(np.mean([s['model_private'] for s in samples])) / 1024
+    }
+
+
+def run(workers=(1, 4, 16), n_trees=100):
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path, packed_path, preprocessor_path = build_models(Path(tmp), n_trees)
+        print(f"\nModel size: pickle {pickle_path.stat().st_size / 1e6:.1f} MB, "
+              f"packed {packed_path.stat().st_size / 1e6:.1f} MB")
+
+        layouts = {
+            'pickle': (pickle_path, None),
+            'mmap': (packed_path, 'r')
+        }
+        results = []
+        for n_workers in workers:
+            for layout, (model_path, mmap_mode) in layouts.items():
+                stats = measure(n_workers, model_path, preprocessor_path, mmap_mode)
+                results.append({'workers': n_workers, 'layout': layout, **stats})
+
+    print(f"\n{'workers':>7} {'layout':>7} {'startup s':>10} {'RSS MB':>8} {'PSS MB':>8} "
+          f"{'total PSS':>10} {'model priv':>11}")
+    for r in results:
+        print(f"{r['workers']:>7} {r['layout']:>7} {r['startup_s']:>10.3f} {r['rss_mb']:>8.1f} "
+              f"{r['pss_mb']:>8.1f} {r['total_pss_mb']:>10.1f} {r['model_private_mb']:>11.1f}")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--trees", type=int, default=100, help="Trees in the benchmark forest")
+    args = parser.parse_args()
+    run(args.workers, args.trees)
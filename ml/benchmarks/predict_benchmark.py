@@ -0,0 +1,56 @@
+"""
+Batch Prediction Benchmark
+Rows/sec of ChurnPredictor.predict_batch for batch sizes from 1 to 100k
+
+Usage (from the ml folder):
+    python -m benchmarks.predict_benchmark
+"""
+import argparse
+
+from src.predict import ChurnPredictor
+
+from .common import make_employees, time_call
+
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+
+# Scoring one row at a time gets slow quickly, so only compare up to here
+LOOP_LIMIT = 1_000
+
+
+def run(batch_sizes=BATCH_SIZES, repeat=3):
+    predictor = ChurnPredictor()
+    employees = make_employees(max(batch_sizes))
+    
+    # Same answers per employee, one model call vs one per row
+    sample = employees[:100]
+    assert predictor.predict_batch(sample) == [predictor.predict(e) for e in sample]
+    
+    print(f"\n{'batch':>8} {'batch rows/s':>14} {'loop rows/s':>14} {'speedup':>9}")
+    results = []
+    for size in batch_sizes:
+        batch = employees[:size]
+        batch_time = time_call(lambda: predictor.predict_batch(batch), repeat)
+        batch_rate = size / batch_time
+        
+        loop_rate = None
+        if size <= LOOP_LIMIT:
+            loop_time = time_call(lambda: [predictor.predict(e) for e in batch], repeat)
+            loop_rate = size / loop_time
+        
+        results.append({'batch_size': size, 'batch_rows_per_sec': batch_rate,
+                        'loop_rows_per_sec': loop_rate})
+        
+        if loop_rate is None:
+            print(f"{size:>8} {batch_rate:>14,.0f} {'-':>14} {'-':>9}")
+        else:
+            print(f"{size:>8} {batch_rate:>14,.0f} {loop_rate:>14,.0f} {batch_rate / loop_rate:>8.1f}x")
+    
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(repeat=args.repeat)
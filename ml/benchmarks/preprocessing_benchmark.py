@@ -0,0 +1,96 @@
+"""
+Out-of-Core Preprocessing Benchmark
+Peak RSS and time of DataPreprocessor: whole-DataFrame fit_transform vs
+streaming fit + chunked transform (memory-mapped or sparse output)
+
+Each run happens in a fresh process so peak RSS is not shared between runs.
+Linux only (reads VmHWM from /proc/self/status).
+
+Usage (from the ml folder):
+    python -m benchmarks.preprocessing_benchmark
+    python -m benchmarks.preprocessing_benchmark --rows 100000 1000000 --chunksize 50000
+"""
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import TARGET_COLUMN
+from src.preprocessing import DataPreprocessor
+
+from .common import make_employees
+
+MODES = ("in-memory", "stream-memmap", "stream-sparse")
+
+
+def write_dataset(path, n_rows, chunk=100000):
+    """Write n_rows synthetic employees (with Attrition) to CSV, chunk by chunk."""
+    for i, start in enumerate(range(0, n_rows, chunk)):
+        df = pd.DataFrame(make_employees(min(chunk, n_rows - start), seed=i))
+        df[TARGET_COLUMN] = np.where(np.random.default_rng(i).random(len(df)) < 0.16, "Yes", "No")
+        df.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+
+
+def peak_rss_mb():
+    # VmHWM, unlike ru_maxrss, starts fresh after exec (spawned processes)
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+
+def preprocess(mode, path, workdir, chunksize, results):
+    start = time.perf_counter()
+    if mode == "in-memory":
+        df = pd.read_csv(path)
+        X = DataPreprocessor().fit_transform(df.drop(columns=[TARGET_COLUMN]))
+    elif mode == "stream-memmap":
+        preprocessor = DataPreprocessor()
+        preprocessor.fit_stream(path, chunksize)
+        X, _ = preprocessor.transform_stream(path, workdir / "X.npy", workdir / "y.npy", chunksize=chunksize)
+    else:
+        preprocessor = DataPreprocessor(sparse=True)
+        preprocessor.fit_stream(path, chunksize)
+        X, _ = preprocessor.transform_stream(path, chunksize=chunksize)
+    results.put({'seconds': time.perf_counter() - start, 'peak_mb': peak_rss_mb(), 'shape': X.shape})
+
+
+def measure(mode, path, workdir, chunksize):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=preprocess, args=(mode, path, workdir, chunksize, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def run(row_counts=(100000, 400000, 1000000), chunksize=50000):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for n_rows in row_counts:
+            path = workdir / f"employees_{n_rows}.csv"
+            write_dataset(path, n_rows)
+            size_mb = path.stat().st_size / 1e6
+            for mode in MODES:
+                result = measure(mode, path, workdir, chunksize)
+                rows.append({'rows': n_rows, 'csv_mb': size_mb, 'mode': mode, **result})
+            path.unlink()
+
+    print(f"\n{'rows':>9} {'csv MB':>8} {'mode':>14} {'peak RSS MB':>12} {'seconds':>8}")
+    for r in rows:
+        print(f"{r['rows']:>9} {r['csv_mb']:>8.1f} {r['mode']:>14} {r['peak_mb']:>12.1f} {r['seconds']:>8.2f}")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 400000, 1000000])
+    parser.add_argument("--chunksize", type=int, default=50000)
+    args = parser.parse_args()
+    run(args.rows, args.chunksize)
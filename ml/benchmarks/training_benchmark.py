@@ -0,0 +1,86 @@
+"""
+Training Pipeline Benchmark
+Wall time of src.train by worker count, with cold and cached splits
+
+For each worker count the pipeline runs from scratch (fresh split cache),
+then once more on the same cache with half of the candidate results removed
+(an interrupted run being resumed). The winner is loaded back through
+ChurnPredictor to check the written format.
+
+Usage (from the ml folder):
+    python -m benchmarks.training_benchmark
+    python -m benchmarks.training_benchmark --rows 20000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import TARGET_COLUMN
+from src.predict import ChurnPredictor
+from src.train import RESULTS_FILE, train
+
+from .common import make_employees
+from .compiled_benchmark import synthetic_labels
+
+
+def write_dataset(path, n_rows):
+    employees = make_employees(n_rows, seed=11)
+    df = pd.DataFrame(employees)
+    df[TARGET_COLUMN] = np.where(synthetic_labels(employees) == 1, "Yes", "No")
+    df.to_csv(path, index=False)
+
+
+def drop_half(split_dir):
+    """Keep every other finished candidate, as if the run had been killed."""
+    path = split_dir / RESULTS_FILE
+    lines = path.read_text().splitlines(keepends=True)
+    path.write_text("".join(lines[::2]))
+
+
+def timed_train(*args, **kwargs):
+    start = time.perf_counter()
+    model_path, preprocessor_path, ranked = train(*args, **kwargs)
+    return time.perf_counter() - start, model_path, preprocessor_path, ranked
+
+
+def run(n_rows=5000, worker_counts=None):
+    worker_counts = worker_counts or sorted({1, 2, 4, os.cpu_count()})
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        data = tmp / "employees.csv"
+        write_dataset(data, n_rows)
+
+        for workers in worker_counts:
+            cache = tmp / f"cache_{workers}"
+            cold, model_path, preprocessor_path, ranked = timed_train(data, tmp / "out", workers, cache_dir=cache)
+            split_dir = next(p for p in cache.iterdir() if not p.name.startswith('.'))
+            drop_half(split_dir)
+            resumed, *_ = timed_train(data, tmp / "out", workers, cache_dir=cache)
+            cached, *_ = timed_train(data, tmp / "out", workers, cache_dir=cache)
+
+            prediction = ChurnPredictor(model_path, preprocessor_path).predict(make_employees(1)[0])
+            rows.append({'workers': workers, 'candidates': len(ranked), 'cold': cold, 'resumed': resumed,
+                         'cached': cached, 'best': ranked[0]['model_name'],
+                         'roc_auc': ranked[0]['metrics']['roc_auc'], 'loads': 0 <= prediction['churn_probability'] <= 1})
+
+    print(f"\n{'workers':>8} {'candidates':>11} {'cold s':>8} {'resume s':>9} {'cached s':>9} "
+          f"{'speedup':>8} {'best':>18} {'roc_auc':>8} {'loads':>6}")
+    for r in rows:
+        print(f"{r['workers']:>8} {r['candidates']:>11} {r['cold']:>8.2f} {r['resumed']:>9.2f} {r['cached']:>9.2f} "
+              f"{rows[0]['cold'] / r['cold']:>7.2f}x {r['best']:>18} {r['roc_auc']:>8.4f} {r['loads']!s:>6}")
+    print(f"({n_rows} rows, {os.cpu_count()} cores; resume = half the candidates left to run)")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    args = parser.parse_args()
+    run(args.rows, args.workers)
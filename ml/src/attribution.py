@@ -0,0 +1,162 @@
+"""
+Feature Attribution
+Exact per-prediction contributions of each employee field, batched with NumPy
+
+- linear models: coef * (x - baseline), in log-odds
+- tree ensembles: Saabas path attributions. At every split on a row's path,
+  the change in node value is credited to the split feature. Forests average
+  over trees (probability), boosting sums them (log-odds).
+
+Contributions of the model columns that come from one raw field (one-hot
+columns) are summed, so results name employee fields like "OverTime".
+For every row: base_value + contributions.sum() == model output.
+"""
+import numpy as np
+
+from .runtime import CompiledModel, goes_left
+
+
+class FeatureAttributor:
+    """
+    Batched attributions for one model.
+    Built once per model; contributions() then costs a handful of array ops
+    per tree level for the whole batch.
+    """
+
+    def __init__(self, kind, columns, column_of_feature, arrays, meta):
+        """
+        Parameters:
+            kind: 'linear', 'forest' or 'boosting' (see src.runtime)
+            columns: Raw employee fields, in output order
+            column_of_feature: Index into columns for each model input column (-1: none)
+            arrays: Model arrays as in an exported artifact
+            meta: Model header as in an exported artifact
+        """
+        self.kind = kind
+        self.columns = list(columns)
+        n_features = len(column_of_feature)
+
+        # Model column -> raw field aggregation matrix
+        self.grouping = np.zeros((n_features, len(self.columns)))
+        known = np.flatnonzero(column_of_feature >= 0)
+        self.grouping[known, column_of_feature[known]] = 1.0
+
+        if kind == 'linear':
+            self.coef = np.asarray(arrays['coef'], dtype=np.float64)
+            # Baseline: all-zero input, i.e. the training mean of scaled
+            # numeric columns and no category switched on
+            self.baseline = np.zeros(n_features)
+            self.base_value = float(meta['intercept'] + self.coef @ self.baseline)
+            return
+
+        self.roots = np.asarray(arrays['roots'])
+        self.children_left = np.asarray(arrays['children_left'])
+        self.children_right = np.asarray(arrays['children_right'])
+        self.feature = np.asarray(arrays['feature'])
+        self.threshold = np.asarray(arrays['threshold'])
+        # Absent from artifacts exported before NaN routing was recorded
+        missing = arrays.get('missing_go_to_left')
+        self.missing_go_to_left = None if missing is None else np.asarray(missing, dtype=bool)
+        self.node_value = np.asarray(arrays['leaf_value'])
+        self.max_depth = meta['max_depth']
+        root_values = self.node_value[self.roots]
+        if kind == 'forest':
+            self.base_value = float(root_values.mean())
+        else:
+            self.base_value = float(meta['init_raw'] + root_values.sum())
+
+    @classmethod
+    def for_model(cls, model, vectorizer):
+        """
+        Build an attributor for a ChurnPredictor model.
+
+        Parameters:
+            model: CompiledModel or a fitted model exportable by src.export
+            vectorizer: The predictor's RowVectorizer (input layout)
+
+        Returns:
+            FeatureAttributor, or None if the model or layout is unsupported
+        """
+        if vectorizer is None:
+            return None
+        if isinstance(model, CompiledModel):
+            meta, arrays = model.meta, model.arrays
+        else:
+            # sklearn side: reuse the exporter's conversion to plain arrays
+            from .export import compile_model
+            try:
+                meta, arrays = compile_model(model, vectorizer.n_features)
+            except TypeError:
+                return None
+
+        columns = list(vectorizer.num_cols)
+        column_of_feature = np.full(vectorizer.n_features, -1, dtype=np.intp)
+        column_of_feature[vectorizer.num_positions] = np.arange(len(columns))
+        for col, position, mapping in vectorizer.cat_lookups:
+            columns.append(col)
+            if position is None:
+                column_of_feature[list(mapping.values())] = len(columns) - 1
+            else:
+                column_of_feature[position] = len(columns) - 1
+        return cls(meta['kind'], columns, column_of_feature, arrays, meta)
+
+    def feature_contributions(self, X):
+        """Contributions per model input column, shape (n_rows, n_features)."""
+        X = np.asarray(X.toarray() if hasattr(X, 'toarray') else X, dtype=np.float64)
+        if self.kind == 'linear':
+            return (X - self.baseline) * self.coef
+
+        n_rows, n_features = X.shape
+        # Same float32 comparison as the trees themselves
+        X32 = X.astype(np.float32)
+        contributions = np.zeros(n_rows * n_features)
+        node = np.repeat(self.roots[:, None], n_rows, axis=1)
+        rows = np.broadcast_to(np.arange(n_rows), node.shape)
+        # NaN cells follow the model's own routing (see runtime.goes_left)
+        missing_go_to_left = self.missing_go_to_left if np.isnan(X32).any() else None
+
+        for _ in range(self.max_depth):
+            left = self.children_left[node]
+            internal = left >= 0
+            if not internal.any():
+                break
+            split = self.feature[node]
+            go_left = goes_left(X32[rows, split], node, self.threshold, missing_go_to_left)
+            child = np.where(go_left, left, self.children_right[node])
+            # Credit the value change of this step to the split feature
+            delta = self.node_value[child[internal]] - self.node_value[node[internal]]
+            contributions += np.bincount(rows[internal] * n_features + split[internal],
+                                         weights=delta, minlength=n_rows * n_features)
+            node = np.where(internal, child, node)
+
+        contributions = contributions.reshape(n_rows, n_features)
+        if self.kind == 'forest':
+            contributions /= len(self.roots)
+        return contributions
+
+    def contributions(self, X):
+        """
+        Contributions per raw employee field.
+
+        Parameters:
+            X: Model input rows, shape (n_rows, n_features)
+
+        Returns:
+            Array of shape (n_rows, len(columns))
+        """
+        return self.feature_contributions(X) @ self.grouping
+
+    def top_k(self, X, k=5):
+        """
+        Strongest contributions per row, by absolute value.
+
+        Returns:
+            (column indices, contributions), both of shape (n_rows, k)
+        """
+        contributions = self.contributions(X)
+        k = min(k, contributions.shape[1])
+        magnitude = np.abs(contributions)
+        top = np.argpartition(-magnitude, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(magnitude, top, axis=1), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return top, np.take_along_axis(contributions, top, axis=1)
@@ -0,0 +1,207 @@
+"""
+Prediction Cache
+LRU/TTL cache of prediction results in front of ChurnPredictor
+"""
+import hashlib
+import json
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheBackend(ABC):
+    """
+    Storage interface for PredictionCache.
+    Values are plain JSON-serializable dicts.
+    """
+
+    @abstractmethod
+    def get(self, key):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key, value):
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self):
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache with a time-to-live.
+    Memory is bounded by max_entries.
+    """
+
+    def __init__(self, max_entries=10000, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                self.evictions += 1
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {'size': len(self._data), 'max_entries': self.max_entries,
+                'evictions': self.evictions}
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache in Redis, so several workers share hits.
+    Needs the optional `redis` package. Eviction is left to Redis
+    (TTL per key plus the server's maxmemory policy).
+    """
+
+    def __init__(self, url, ttl=3600, prefix="churn:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("RedisCacheBackend requires the 'redis' package") from e
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def clear(self):
+        # Keys carry the model id, so stale entries are never read; they
+        # just expire. Only drop ours explicitly when asked to clear.
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class PredictionCache:
+    """
+    Cache of prediction results keyed by employee data + model identity.
+
+    The key is a hash of the canonical JSON of the employee fields and the
+    predictor's model_id, so a reloaded model never sees old results. When
+    a new model_id shows up, the backend is cleared as well, which frees
+    the old entries straight away.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.model_id = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(employee_data, model_id):
+        """Stable hash of the employee fields and the model identity."""
+        canonical = json.dumps(employee_data, sort_keys=True, separators=(",", ":"), default=str)
+        digest = hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+        return f"{model_id}:{digest}"
+
+    def _check_model(self, model_id):
+        if model_id != self.model_id:
+            with self._lock:
+                if model_id != self.model_id:
+                    if self.model_id is not None:
+                        self.backend.clear()
+                    self.model_id = model_id
+
+    def _count(self, hits, misses):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def get_or_predict(self, predictor, employee_data):
+        """
+        Cached predictor.predict(employee_data).
+
+        Parameters:
+            predictor: Loaded ChurnPredictor
+            employee_data: Dictionary with employee features
+
+        Returns:
+            Dictionary with prediction results
+        """
+        self._check_model(predictor.model_id)
+        key = self.make_key(employee_data, predictor.model_id)
+
+        result = self.backend.get(key)
+        if result is not None:
+            self._count(1, 0)
+            return dict(result)
+
+        self._count(0, 1)
+        result = predictor.predict(employee_data)
+        self.backend.set(key, result)
+        return dict(result)
+
+    def get_or_predict_batch(self, predictor, employees_list):
+        """
+        Cached predictor.predict_batch: misses are scored in one call.
+
+        Parameters:
+            predictor: Loaded ChurnPredictor
+            employees_list: List of employee dictionaries
+
+        Returns:
+            List of prediction results
+        """
+        self._check_model(predictor.model_id)
+        keys = [self.make_key(employee, predictor.model_id) for employee in employees_list]
+
+        results = [self.backend.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        self._count(len(keys) - len(missing), len(missing))
+
+        if missing:
+            scored = predictor.predict_batch([employees_list[i] for i in missing])
+            for i, result in zip(missing, scored):
+                self.backend.set(keys[i], result)
+                results[i] = result
+
+        return [dict(result) for result in results]
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'model_id': self.model_id,
+            **self.backend.stats()
+        }
@@ -11,6 +11,8 @@ PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 MODELS_DIR = PROJECT_ROOT / "models"
 REPORTS_DIR = PROJECT_ROOT / "reports"
+REGISTRY_DIR = MODELS_DIR / "registry"  # Versioned model artifacts (optional)
+TRAINING_CACHE_DIR = PROJECT_ROOT / "cache" / "training"  # Preprocessed splits (src.train)
 
 # Create directories if they don't exist
 DATA_DIR.mkdir(exist_ok=True)
@@ -0,0 +1,138 @@
+"""
+Model Export
+Compile best_model.pkl + preprocessor.pkl into a portable .npz artifact
+
+The artifact is evaluated by src.runtime with NumPy only. Supported:
+- preprocessing: the DataPreprocessor ColumnTransformer (StandardScaler +
+  OneHotEncoder) or the dict of LabelEncoders
+- models: LogisticRegression, RandomForest/ExtraTrees/DecisionTree
+  classifiers (also packed ones) and binary GradientBoostingClassifier
+
+Usage (from the ml folder):
+    python -m src.export
+    python -m src.export --output models/churn_model.npz
+"""
+import argparse
+import json
+from datetime import datetime
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+
+from .config import MODELS_DIR
+from .forest import PackedForest, pack_trees
+from .predict import ChurnPredictor
+from .runtime import FORMAT, FORMAT_VERSION, CompiledModel, tree_leaves
+from .vectorizer import RowVectorizer
+
+
+def compile_model(model, n_features):
+    """
+    Turn a fitted binary classifier into runtime arrays.
+
+    Parameters:
+        model: Fitted model from best_model.pkl
+        n_features: Width of the model input
+
+    Returns:
+        (JSON-able dict, dict of NumPy arrays)
+    """
+    if isinstance(model, LogisticRegression) and model.coef_.shape[0] == 1:
+        meta = {'kind': 'linear', 'intercept': float(model.intercept_[0])}
+        return meta, {'coef': model.coef_[0].astype(np.float64)}
+
+    if isinstance(model, PackedForest) or PackedForest.supports(model):
+        forest = model if isinstance(model, PackedForest) else PackedForest.from_estimator(model)
+        if len(forest.classes_) != 2:
+            raise TypeError("Only binary classifiers can be exported")
+        arrays = {
+            'roots': forest.roots,
+            'children_left': forest.children_left,
+            'children_right': forest.children_right,
+            'feature': forest.feature,
+            'threshold': forest.threshold,
+            # Only P(churn), the second predict_proba column, is needed
+            'leaf_value': np.ascontiguousarray(forest.leaf_value[:, 1])
+        }
+        if getattr(forest, 'missing_go_to_left', None) is not None:
+            arrays['missing_go_to_left'] = forest.missing_go_to_left
+        return {'kind': 'forest', 'max_depth': int(forest.max_depth)}, arrays
+
+    if isinstance(model, GradientBoostingClassifier) and model.n_classes_ == 2:
+        rate = model.learning_rate
+        trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+        arrays, max_depth = pack_trees(trees, lambda tree: rate * tree.value[:, 0, 0].astype(np.float64))
+
+        # The initial estimate is whatever the trees don't explain at any point
+        X0 = np.zeros((1, n_features))
+        leaves = tree_leaves(X0, arrays['roots'], arrays['children_left'], arrays['children_right'],
+                             arrays['feature'], arrays['threshold'], max_depth,
+                             arrays['missing_go_to_left'])
+        init_raw = float(model.decision_function(X0)[0] - arrays['leaf_value'][leaves].sum())
+        return {'kind': 'boosting', 'max_depth': int(max_depth), 'init_raw': init_raw}, arrays
+
+    raise TypeError(f"Cannot export {type(model).__name__}")
+
+
+def export_model(model_path=None, preprocessor_path=None, output_path=None):
+    """
+    Export the trained model and its preprocessor to a portable artifact.
+
+    Parameters:
+        model_path: best_model.pkl (default in MODELS_DIR)
+        preprocessor_path: preprocessor.pkl (default in MODELS_DIR)
+        output_path: Artifact to write (default MODELS_DIR / churn_model.npz)
+
+    Returns:
+        Path of the written artifact
+    """
+    if model_path is None:
+        model_path = MODELS_DIR / "best_model.pkl"
+    if preprocessor_path is None:
+        preprocessor_path = MODELS_DIR / "preprocessor.pkl"
+    if output_path is None:
+        output_path = MODELS_DIR / "churn_model.npz"
+
+    model_data = joblib.load(model_path)
+    prep_data = joblib.load(preprocessor_path)
+    preprocessor = prep_data['preprocessor']
+
+    vectorizer = RowVectorizer.from_preprocessor(
+        preprocessor, prep_data['feature_names'], ChurnPredictor.compile_encoders(preprocessor)
+    )
+    if vectorizer is None:
+        raise TypeError("Preprocessor layout cannot be exported")
+    inputs, input_arrays = vectorizer.state()
+    model_meta, model_arrays = compile_model(model_data['model'], vectorizer.n_features)
+
+    meta = {
+        'format': FORMAT,
+        'format_version': FORMAT_VERSION,
+        'model_name': model_data['model_name'],
+        'metrics': model_data['metrics'],
+        'feature_names': list(prep_data['feature_names'] or []),
+        'inputs': inputs,
+        'exported_at': datetime.utcnow().isoformat(),
+        'sklearn_version': sklearn.__version__,
+        **model_meta
+    }
+    header = np.frombuffer(json.dumps(meta, default=float).encode(), dtype=np.uint8)
+    with open(output_path, 'wb') as f:
+        np.savez(f, meta=header, **input_arrays, **model_arrays)
+
+    # Fail now rather than at serving time if the artifact does not load
+    CompiledModel.load(output_path)
+    print(f"Exported {meta['kind']} model to: {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the model to a portable artifact")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--preprocessor", default=None)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    export_model(args.model, args.preprocessor, args.output)
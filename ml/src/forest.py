@@ -0,0 +1,184 @@
+"""
+Packed Forest
+Tree ensembles as flat NumPy arrays, scored in place from memory-mapped files
+
+sklearn trees copy their nodes into private memory when unpickled, so
+`joblib.load(..., mmap_mode='r')` cannot share them between worker
+processes. A PackedForest keeps every node of every tree in a few
+concatenated arrays that predict_proba reads directly. Dumped uncompressed
+with joblib and loaded with mmap_mode='r', those arrays stay backed by the
+page cache, so all workers on a host share one copy.
+
+Usage (from the ml folder):
+    python -m src.forest models/best_model.pkl models/best_model.packed.pkl
+"""
+import argparse
+
+import joblib
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from .runtime import tree_leaves
+
+SUPPORTED_MODELS = (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier)
+
+
+def class_probabilities(tree):
+    """Per-node class probabilities, normalized like DecisionTreeClassifier.predict_proba."""
+    value = tree.value[:, 0, :].astype(np.float64)
+    totals = value.sum(axis=1, keepdims=True)
+    return np.divide(value, totals, out=np.zeros_like(value), where=totals > 0)
+
+
+def pack_trees(trees, node_values):
+    """
+    Concatenate fitted sklearn trees into flat node arrays.
+
+    Parameters:
+        trees: sklearn Tree objects (estimator.tree_)
+        node_values: Function tree -> per-node value array
+
+    Returns:
+        (dict of roots/children_left/children_right/feature/threshold/
+         missing_go_to_left/leaf_value, depth of the deepest tree)
+    """
+    roots, lefts, rights, features, thresholds, missing, values = [], [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        left = tree.children_left.astype(np.intp)
+        right = tree.children_right.astype(np.intp)
+        # Shift child indices into the concatenated node numbering
+        lefts.append(np.where(left >= 0, left + offset, -1))
+        rights.append(np.where(right >= 0, right + offset, -1))
+        features.append(tree.feature.astype(np.intp))
+        thresholds.append(tree.threshold.astype(np.float64))
+        # Where sklearn sends NaN at each split (all right before sklearn 1.3)
+        missing.append(np.asarray(getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count)), dtype=bool))
+        values.append(node_values(tree))
+        roots.append(offset)
+        offset += tree.node_count
+
+    arrays = {
+        'roots': np.array(roots, dtype=np.intp),
+        'children_left': np.concatenate(lefts),
+        'children_right': np.concatenate(rights),
+        'feature': np.concatenate(features),
+        'threshold': np.concatenate(thresholds),
+        'missing_go_to_left': np.concatenate(missing),
+        'leaf_value': np.concatenate(values)
+    }
+    return arrays, max(tree.max_depth for tree in trees)
+
+
+class PackedForest:
+    """
+    Drop-in for a fitted forest classifier's predict/predict_proba.
+
+    Node i of the packed forest has children children_left[i] and
+    children_right[i] (-1 at leaves), splits on feature[i] <= threshold[i]
+    (NaN goes left where missing_go_to_left[i], as in sklearn) and, at leaves, holds the class probabilities in leaf_value[i].
+    roots[t] is the first node of tree t.
+    """
+
+    def __init__(self, roots, children_left, children_right, feature, threshold,
+                 leaf_value, classes, max_depth, n_features_in, feature_names_in=None,
+                 feature_importances=None, missing_go_to_left=None):
+        self.roots = roots
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        self.missing_go_to_left = missing_go_to_left
+        self.leaf_value = leaf_value
+        self.classes_ = classes
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features_in
+        if feature_names_in is not None:
+            self.feature_names_in_ = feature_names_in
+        self.feature_importances_ = feature_importances
+
+    @classmethod
+    def supports(cls, model):
+        return isinstance(model, SUPPORTED_MODELS) and getattr(model, 'n_outputs_', 1) == 1
+
+    @classmethod
+    def from_estimator(cls, model):
+        """
+        Pack a fitted RandomForest/ExtraTrees/DecisionTree classifier.
+
+        Parameters:
+            model: Fitted sklearn classifier (single output)
+
+        Returns:
+            PackedForest
+        """
+        if not cls.supports(model):
+            raise TypeError(f"Cannot pack {type(model).__name__}")
+
+        estimators = [model] if isinstance(model, DecisionTreeClassifier) else model.estimators_
+        arrays, max_depth = pack_trees([estimator.tree_ for estimator in estimators], class_probabilities)
+        return cls(
+            **arrays,
+            classes=np.asarray(model.classes_),
+            max_depth=max_depth,
+            n_features_in=model.n_features_in_,
+            feature_names_in=getattr(model, 'feature_names_in_', None),
+            feature_importances=np.asarray(model.feature_importances_, dtype=np.float64)
+        )
+
+    def leaves(self, X):
+        """
+        Leaf reached by every row in every tree.
+
+        Returns:
+            Array of node indices, shape (n_trees, n_rows)
+        """
+        # Forests packed before NaN routing was recorded send NaN right
+        return tree_leaves(X, self.roots, self.children_left, self.children_right,
+                           self.feature, self.threshold, self.max_depth,
+                           getattr(self, 'missing_go_to_left', None))
+
+    def predict_proba(self, X):
+        """Mean class probabilities over the trees, shape (n_rows, n_classes)."""
+        return self.leaf_value[self.leaves(X)].mean(axis=0)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def pack_model(model_path, output_path):
+    """
+    Rewrite a best_model.pkl with its forest packed, uncompressed for mmap.
+    Models that cannot be packed are still rewritten uncompressed.
+
+    Parameters:
+        model_path: Source best_model.pkl
+        output_path: Where to write the packed artifact
+
+    Returns:
+        True if the model was packed
+    """
+    model_data = joblib.load(model_path)
+    packed = PackedForest.supports(model_data['model'])
+    if packed:
+        model_data = {**model_data, 'model': PackedForest.from_estimator(model_data['model'])}
+    # compress=0 keeps arrays as raw buffers joblib can memory-map
+    joblib.dump(model_data, output_path, compress=0)
+    return packed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack a tree model for memory-mapped loading")
+    parser.add_argument("model", help="Source best_model.pkl")
+    parser.add_argument("output", help="Packed model path")
+    args = parser.parse_args()
+
+    # Run with -m this file is __main__: pack through the imported module so
+    # the pickle references src.forest.PackedForest and loads anywhere
+    from .forest import pack_model as pack_with_importable_class
+
+    if pack_with_importable_class(args.model, args.output):
+        print(f"Packed model written to {args.output}")
+    else:
+        print(f"Model type not packable; uncompressed copy written to {args.output}")
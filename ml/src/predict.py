@@ -2,10 +2,46 @@
 Prediction Utilities
 Load model and make predictions
 """
+import contextlib
+import hashlib
+import threading
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import joblib
 
-from .config import MODELS_DIR
+from .config import MODELS_DIR, NUMERICAL_COLUMNS, CATEGORICAL_COLUMNS
+from .attribution import FeatureAttributor
+from .registry import ModelRegistry
+from .runtime import COMPILED_SUFFIX, CompiledModel
+from .vectorizer import RowVectorizer
+
+
+# Risk bands: probability < 0.3 is LOW, < 0.5 MEDIUM, < 0.7 HIGH, else CRITICAL
+RISK_THRESHOLDS = np.array([0.3, 0.5, 0.7])
+RISK_LEVELS = np.array(["LOW", "MEDIUM", "HIGH", "CRITICAL"])
+
+# Synthetic employee used to warm up a freshly loaded model
+PROBE_EMPLOYEE = {
+    **{col: 0 for col in NUMERICAL_COLUMNS},
+    **{col: "" for col in CATEGORICAL_COLUMNS}
+}
+
+
+def risk_levels(probabilities):
+    """
+    Map churn probabilities to risk levels in one vectorized pass.
+    
+    Parameters:
+        probabilities: Array of churn probabilities
+        
+    Returns:
+        Array of risk level strings
+    """
+    return RISK_LEVELS[np.searchsorted(RISK_THRESHOLDS, probabilities, side="right")]
 
 
 class ChurnPredictor:
@@ -14,122 +50,455 @@ class ChurnPredictor:
     Used by the FastAPI backend.
     """
     
-    def __init__(self, model_path=None, preprocessor_path=None):
+    def __init__(self, model_path=None, preprocessor_path=None, fast_path=True, version=None,
+                 mmap_mode='r'):
         """
         Initialize by loading model and preprocessor.
+        
+        Parameters:
+            model_path: Path to best_model.pkl (default in MODELS_DIR), or
+                to an exported .npz artifact (src.export), which bundles the
+                preprocessing and runs on NumPy only
+            preprocessor_path: Path to preprocessor.pkl (default in MODELS_DIR,
+                unused for .npz artifacts)
+            fast_path: Vectorize predictions with NumPy instead of pandas
+            version: Registry version the artifacts come from, if any
+            mmap_mode: joblib mmap_mode for uncompressed artifacts (None to
+                read them into private memory). With a packed model
+                (src.forest) worker processes share the tree arrays.
         """
         self.model = None
         self.model_name = None
+        self.model_id = None
         self.metrics = None
         self.preprocessor = None
         self.feature_names = None
+        self.encoder_maps = None
+        self.fast_path = fast_path
+        self.vectorizer = None
+        self.version = version
+        self.mmap_mode = mmap_mode
+        self.attributor = None
+        self._attributor_ready = False
         
         self.load(model_path, preprocessor_path)
     
     def load(self, model_path=None, preprocessor_path=None):
         """
         Load model and preprocessor from disk.
+        
+        Memory-mapped artifacts must be replaced by writing a new file and
+        renaming it (as ModelRegistry does), never rewritten in place.
         """
         if model_path is None:
             model_path = MODELS_DIR / "best_model.pkl"
         if preprocessor_path is None:
             preprocessor_path = MODELS_DIR / "preprocessor.pkl"
         
+        self.attributor = None
+        self._attributor_ready = False
+        
+        if Path(model_path).suffix == COMPILED_SUFFIX:
+            self.load_compiled(model_path)
+            return
+        
         # Load model
-        model_data = joblib.load(model_path)
+        model_data = joblib.load(model_path, mmap_mode=self.mmap_mode)
         self.model = model_data['model']
         self.model_name = model_data['model_name']
         self.metrics = model_data['metrics']
         
         # Load preprocessor
-        prep_data = joblib.load(preprocessor_path)
+        prep_data = joblib.load(preprocessor_path, mmap_mode=self.mmap_mode)
         self.preprocessor = prep_data['preprocessor']
         self.feature_names = prep_data['feature_names']
+        self.encoder_maps = self.compile_encoders(self.preprocessor)
+        self.model_id = self.artifact_id(model_path, preprocessor_path)
+        if self.fast_path:
+            self.vectorizer = RowVectorizer.from_preprocessor(
+                self.preprocessor, self.feature_names, self.encoder_maps
+            )
         
         print(f"Loaded model: {self.model_name}")
     
-    def predict(self, employee_data):
+    def load_compiled(self, artifact_path):
         """
-        Predict churn probability for one employee.
+        Load an exported artifact as the model backend.
+        The artifact carries its own input layout, so there is no
+        preprocessor object and the NumPy vectorizer is always used.
+        """
+        self.model = CompiledModel.load(artifact_path)
+        self.model_name = self.model.model_name
+        self.metrics = self.model.metrics
+        self.preprocessor = None
+        self.feature_names = self.model.feature_names
+        self.encoder_maps = None
+        self.vectorizer = self.model.vectorizer
+        self.model_id = self.artifact_id(artifact_path)
+        
+        print(f"Loaded model: {self.model_name} (compiled)")
+    
+    @classmethod
+    def from_registry(cls, version=None, registry=None, **kwargs):
+        """
+        Load a registered model version (default: the active one).
+        Falls back to the artifacts in MODELS_DIR when nothing is active.
+        """
+        registry = registry if registry is not None else ModelRegistry()
+        if version is None:
+            version = registry.active_version()
+        if version is None:
+            return cls(**kwargs)
+        model_path, preprocessor_path = registry.paths(version)
+        return cls(model_path, preprocessor_path, version=version, **kwargs)
+    
+    @staticmethod
+    def artifact_id(*paths):
+        """
+        Content hash of the model artifacts.
+        Identifies the loaded model, e.g. for prediction cache keys.
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        for path in paths:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def compile_encoders(preprocessor):
+        """
+        Turn a dict of fitted LabelEncoders into plain label -> code dicts.
+        
+        Lookups are then a hash probe instead of an sklearn call plus a
+        linear scan of encoder.classes_.
         
         Parameters:
-            employee_data: Dictionary with employee features
+            preprocessor: Dict of column -> LabelEncoder, or a fitted transformer
             
         Returns:
-            Dictionary with prediction results
+            Dict of column -> {label: code}, or None if not a dict preprocessor
+        """
+        if not isinstance(preprocessor, dict):
+            return None
+        return {
+            col: {label: code for code, label in enumerate(encoder.classes_.tolist())}
+            for col, encoder in preprocessor.items()
+        }
+    
+    def transform(self, df):
         """
-        # Convert to DataFrame
-        df = pd.DataFrame([employee_data])
+        Turn a DataFrame of raw employee features into model input.
+        
+        Parameters:
+            df: DataFrame with one row per employee
+            
+        Returns:
+            DataFrame (or array) in the column order the model expects
+        """
+        if isinstance(self.model, CompiledModel):
+            return self.vectorizer.transform_many(df.to_dict('records'))
         
-        # Preprocess
         X = df.copy()
         
         # Check if preprocessor is a dict (from generate_model.py) or an object
-        if isinstance(self.preprocessor, dict):
-            for col, encoder in self.preprocessor.items():
+        if self.encoder_maps is not None:
+            for col, mapping in self.encoder_maps.items():
                 if col in X.columns:
-                    # Handle unknown labels gracefully
-                    X[col] = X[col].apply(lambda x: encoder.transform([x])[0] if x in encoder.classes_ else 0)
+                    # Whole-column lookup; unknown labels fall back to 0
+                    X[col] = X[col].map(mapping).fillna(0).astype(np.int64)
         else:
-            # Assume it's a ColumnTransformer/Pipeline
-            X = self.preprocessor.transform(X)
-        
+            # Assume it's a ColumnTransformer/Pipeline, whose output
+            # is already in feature_names order
+            return self.preprocessor.transform(X)
         
         # Align columns to what the model expects
         if self.feature_names:
-            # Add missing columns with 0 (safeguard)
-            for col in self.feature_names:
-                if col not in X.columns:
-                    X[col] = 0
-            # Reorder and filter
-            X = X[self.feature_names]
-
-        # Predict
-        probability = self.model.predict_proba(X)[0, 1]
-        prediction = int(probability >= 0.5)
-        
-        # Determine risk level
-        if probability < 0.3:
-            risk = "LOW"
-        elif probability < 0.5:
-            risk = "MEDIUM"
-        elif probability < 0.7:
-            risk = "HIGH"
-        else:
-            risk = "CRITICAL"
+            # Add missing columns with 0 (safeguard), then reorder and filter.
+            # Keys missing from only some records are NaN after DataFrame(), fill those too
+            X = X.reindex(columns=self.feature_names, fill_value=0).fillna(0)
         
-        return {
-            'churn_probability': float(probability),
-            'prediction': prediction,
-            'risk_level': risk,
-            'model_used': self.model_name
-        }
+        return X
+    
+    def model_input(self, employees_list):
+        """
+        Model-ready rows for a list of employee dictionaries.
+        
+        With a vectorizer, each field is gathered into one column array and
+        encoded with NumPy; no DataFrame is built. Input it cannot convert
+        (or incomplete input for a scaled layout) goes through the pandas
+        path instead, which raises where the preprocessor does.
+        """
+        if self.vectorizer is not None:
+            try:
+                return self.vectorizer.transform_many(employees_list)
+            except (KeyError, TypeError, ValueError):
+                if isinstance(self.model, CompiledModel):
+                    raise
+        return self.transform(pd.DataFrame(employees_list))
+    
+    def model_proba(self, X):
+        """
+        The model's predict_proba on model-ready rows.
+        
+        NumPy rows come in the exact column order the model was fitted
+        with, so sklearn's feature-name warning is silenced for them only.
+        """
+        if isinstance(X, np.ndarray):
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", message="X does not have valid feature names")
+                return self.model.predict_proba(X)
+        return self.model.predict_proba(X)
+    
+    def get_attributor(self):
+        """
+        FeatureAttributor for the loaded model, built on first use.
+        None if the model type or input layout is not supported.
+        """
+        if not self._attributor_ready:
+            vectorizer = self.vectorizer
+            if vectorizer is None:
+                vectorizer = RowVectorizer.from_preprocessor(
+                    self.preprocessor, self.feature_names, self.encoder_maps
+                )
+            self.attributor = FeatureAttributor.for_model(self.model, vectorizer)
+            self._attributor_ready = True
+        return self.attributor
+    
+    def explain(self, employees_list, top_k=5, X=None):
+        """
+        Top contributing employee fields for each prediction.
+        
+        Parameters:
+            employees_list: List of employee dictionaries
+            top_k: Number of fields per employee
+            X: Model input for employees_list, if already computed
+            
+        Returns:
+            Per employee, a list of {'feature', 'value', 'contribution'}
+            sorted by impact (positive contributions raise the churn risk),
+            or None when the model is not supported
+        """
+        attributor = self.get_attributor()
+        if attributor is None:
+            return [None] * len(employees_list)
+        if X is None:
+            # Plain NumPy rows are enough here, skip pandas where possible
+            vectorizer = self.vectorizer
+            X = vectorizer.transform_many(employees_list) if vectorizer else self.model_input(employees_list)
+        
+        top, contributions = attributor.top_k(X, top_k)
+        columns = attributor.columns
+        return [
+            [
+                {'feature': columns[i], 'value': employee.get(columns[i]), 'contribution': contribution}
+                for i, contribution in zip(indices, values)
+            ]
+            for employee, indices, values in zip(employees_list, top.tolist(), contributions.tolist())
+        ]
+    
+    def predict(self, employee_data, top_k=0):
+        """
+        Predict churn probability for one employee.
+        
+        Parameters:
+            employee_data: Dictionary with employee features
+            top_k: Also return this many top contributing fields
+                   ('top_factors', see explain)
+            
+        Returns:
+            Dictionary with prediction results
+        """
+        if self.vectorizer is not None:
+            try:
+                with _stage_timer('preprocess'):
+                    row = self.vectorizer.transform(employee_data)
+            except (KeyError, TypeError, ValueError):
+                # Incomplete or oddly typed input: let the pandas path handle it
+                row = None
+            if row is not None:
+                with _stage_timer('predict_proba'):
+                    probability = float(self.model_proba(row)[0, 1])
+                result = {
+                    'churn_probability': probability,
+                    'prediction': int(probability >= 0.5),
+                    'risk_level': str(risk_levels(probability)),
+                    'model_used': self.model_name
+                }
+                if top_k:
+                    result['top_factors'] = self.explain([employee_data], top_k, row)[0]
+                return result
+        
+        return self.predict_batch([employee_data], top_k)[0]
     
-    def predict_batch(self, employees_list):
+    def predict_proba_batch(self, employees_list):
+        """
+        Churn probabilities for many employees with a single model call.
+        
+        Parameters:
+            employees_list: List of employee dictionaries
+            
+        Returns:
+            NumPy array of churn probabilities
+        """
+        return self.model_proba(self.model_input(employees_list))[:, 1]
+    
+    def predict_batch(self, employees_list, top_k=0):
         """
         Predict for multiple employees.
         
+        The whole list goes through the preprocessor and predict_proba
+        once, so cost grows with the number of rows rather than the
+        number of model calls.
+        
         Parameters:
             employees_list: List of employee dictionaries
+            top_k: Also return this many top contributing fields per employee
             
         Returns:
             List of prediction results
         """
-        return [self.predict(emp) for emp in employees_list]
+        if len(employees_list) == 0:
+            return []
+        
+        with _stage_timer('preprocess'):
+            X = self.model_input(employees_list)
+        with _stage_timer('predict_proba'):
+            probabilities = self.model_proba(X)[:, 1]
+        predictions = (probabilities >= 0.5).astype(int)
+        risks = risk_levels(probabilities)
+        
+        results = [
+            {
+                'churn_probability': probability,
+                'prediction': prediction,
+                'risk_level': risk,
+                'model_used': self.model_name
+            }
+            for probability, prediction, risk in zip(
+                probabilities.tolist(), predictions.tolist(), risks.tolist()
+            )
+        ]
+        if top_k:
+            for result, factors in zip(results, self.explain(employees_list, top_k, X)):
+                result['top_factors'] = factors
+        return results
 
 
 # Global predictor instance
 _predictor = None
+_predictor_lock = threading.Lock()
+_reload_lock = threading.Lock()
+_registry = ModelRegistry()
+
+# Outcome of the last hot reload
+reload_status = {'state': 'idle', 'version': None, 'seconds': None, 'error': None}
+
+_NO_TIMING = contextlib.nullcontext()
+
+
+def _no_stage_timer(stage):
+    return _NO_TIMING
+
+
+_stage_timer = _no_stage_timer
+
+
+def set_stage_timer(timer=None):
+    """
+    Time the predict stages ('preprocess', 'predict_proba') of every predictor.
+
+    Parameters:
+        timer: Callable stage name -> context manager, or None to stop timing
+    """
+    global _stage_timer
+    _stage_timer = timer or _no_stage_timer
 
 
 def get_predictor():
-    """Get or create the predictor instance."""
+    """Get or create the predictor instance (active registry version if any)."""
     global _predictor
     if _predictor is None:
-        _predictor = ChurnPredictor()
+        # Concurrent first calls (thread pools) must load the model only once
+        with _predictor_lock:
+            if _predictor is None:
+                _predictor = ChurnPredictor.from_registry(registry=_registry)
     return _predictor
 
 
+def use_registry(root=None):
+    """
+    Point the global predictor at another registry directory.
+    
+    Returns:
+        The ModelRegistry now in use
+    """
+    global _registry
+    _registry = ModelRegistry(root)
+    return _registry
+
+
+def reload_predictor(version=None, registry=None, activate=False):
+    """
+    Hot-swap the global predictor.
+    
+    The new version is loaded and warmed up with a probe prediction while
+    the current one keeps serving; then the global reference is swapped in
+    one assignment. Requests already holding the old predictor finish on it.
+    
+    Parameters:
+        version: Registry version to load (default: the active one)
+        registry: ModelRegistry to load from
+        activate: Also make the version the registry's ACTIVE one, only once
+                  it has loaded and passed the probe; if that fails the
+                  previous predictor is swapped back in
+        
+    Returns:
+        The new ChurnPredictor
+    """
+    global _predictor
+    if registry is None:
+        registry = _registry if _registry is not None else ModelRegistry()
+    with _reload_lock:
+        start = time.perf_counter()
+        reload_status.update(state='loading', version=version, error=None)
+        try:
+            predictor = ChurnPredictor.from_registry(version, registry)
+            predictor.predict(PROBE_EMPLOYEE)
+            predictor.predict_batch([PROBE_EMPLOYEE, PROBE_EMPLOYEE])
+        except Exception as e:
+            reload_status.update(state='failed', error=str(e), seconds=time.perf_counter() - start)
+            raise
+        
+        previous, _predictor = _predictor, predictor
+        if activate:
+            try:
+                registry.activate(predictor.version)
+            except Exception as e:
+                _predictor = previous
+                reload_status.update(state='failed', error=str(e), seconds=time.perf_counter() - start)
+                raise
+        reload_status.update(state='ready', version=predictor.version,
+                             seconds=time.perf_counter() - start)
+        return predictor
+
+
+def check_for_update(registry=None):
+    """
+    Reload if the registry's active version differs from the loaded one.
+    Lets every worker follow `ModelRegistry.activate` without a restart.
+    
+    Returns:
+        True if a new version was loaded
+    """
+    registry = registry if registry is not None else _registry
+    active = registry.active_version()
+    if active is None or (_predictor is not None and _predictor.version == active):
+        return False
+    reload_predictor(active, registry)
+    return True
+
+
 def predict_churn(employee_data):
     """
     Convenience function to predict churn.
@@ -1,16 +1,109 @@
 """
 Preprocessing Module
 Handles encoding, scaling, and data splitting
+
+Large datasets can be processed out of core: fit_stream() reads CSV/Parquet
+in chunks (scaler statistics via partial_fit, category vocabularies in the
+same pass) and transform_stream() writes sparse or memory-mapped output,
+so peak memory depends on the chunk size, not on the dataset size.
 """
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
+from scipy import sparse as sp
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 import joblib
 
-from .config import MODELS_DIR, RANDOM_STATE, TEST_SIZE, CATEGORICAL_COLUMNS, NUMERICAL_COLUMNS
+from .config import MODELS_DIR, RANDOM_STATE, TEST_SIZE, CATEGORICAL_COLUMNS, NUMERICAL_COLUMNS, TARGET_COLUMN
+
+CHUNK_SIZE = 50000  # Rows per chunk for the streaming fit/transform
+
+
+def iter_chunks(source, chunksize=CHUNK_SIZE):
+    """
+    Read a dataset chunk by chunk.
+    
+    Parameters:
+        source: Path to a .csv or .parquet file, a DataFrame, or an
+                iterable of DataFrames
+        chunksize: Rows per chunk (files and DataFrames)
+        
+    Yields:
+        DataFrames of at most chunksize rows
+    """
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start:start + chunksize]
+        return
+    
+    if not isinstance(source, (str, Path)):
+        yield from source
+        return
+    
+    path = Path(source)
+    if path.suffix in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading Parquet in chunks requires the 'pyarrow' package") from e
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def count_rows(source, chunksize=CHUNK_SIZE):
+    """
+    Number of rows in a source, without loading it.
+    One-shot iterables (generators) cannot be counted; pass n_rows instead.
+    """
+    if isinstance(source, pd.DataFrame):
+        return len(source)
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix in (".parquet", ".pq"):
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(path).metadata.num_rows
+        return sum(len(chunk) for chunk in pd.read_csv(path, usecols=[0], chunksize=chunksize))
+    return sum(len(chunk) for chunk in source)
+
+
+def source_columns(source):
+    """
+    Column names of a source, read from the file header where possible.
+    None for iterables, whose columns are only known chunk by chunk.
+    """
+    if isinstance(source, pd.DataFrame):
+        return list(source.columns)
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix in (".parquet", ".pq"):
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(path).schema_arrow.names
+        return list(pd.read_csv(path, nrows=0).columns)
+    return None
+
+
+def open_npy(path, shape, dtype):
+    """Open a .npy file for sequential writing of a C-ordered array of this shape."""
+    f = open(path, 'wb')
+    np.lib.format.write_array_header_2_0(f, {
+        'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        'fortran_order': False,
+        'shape': shape
+    })
+    return f
+
+
+def encode_target(y):
+    """Attrition as 0/1 ("Yes" -> 1), whether stored as text or numbers."""
+    if pd.api.types.is_numeric_dtype(y):
+        return y.to_numpy(dtype=np.int8)
+    return (y == "Yes").to_numpy(dtype=np.int8)
 
 
 class DataPreprocessor:
@@ -20,18 +113,29 @@ class DataPreprocessor:
     - OneHotEncoder for categorical columns
     """
     
-    def __init__(self):
+    def __init__(self, sparse=False):
+        """
+        Parameters:
+            sparse: Produce scipy sparse matrices instead of dense arrays
+        """
         self.preprocessor = None
         self.feature_names = None
         self.cat_cols = []
         self.num_cols = []
+        self.sparse = sparse
+        
+        # Running state of the streaming fit
+        self._scaler = None
+        self._vocabularies = None
+        self._rows_seen = 0
     
-    def create_preprocessor(self, X):
+    def create_preprocessor(self, X, categories='auto'):
         """
         Create the preprocessing pipeline.
         
         Parameters:
             X: Features DataFrame
+            categories: OneHotEncoder categories ('auto' learns them from X)
         """
         # Find which columns exist in our data
         self.cat_cols = [col for col in CATEGORICAL_COLUMNS if col in X.columns]
@@ -42,7 +146,8 @@ class DataPreprocessor:
         
         # Create transformers
         categorical_transformer = Pipeline([
-            ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
+            ('onehot', OneHotEncoder(categories=categories, handle_unknown='ignore',
+                                     sparse_output=self.sparse))
         ])
         
         numerical_transformer = Pipeline([
@@ -55,7 +160,9 @@ class DataPreprocessor:
                 ('num', numerical_transformer, self.num_cols),
                 ('cat', categorical_transformer, self.cat_cols)
             ],
-            remainder='drop'
+            remainder='drop',
+            # In sparse mode keep the output sparse whatever its density
+            sparse_threshold=1.0 if self.sparse else 0.3
         )
         
         print("Preprocessor created successfully")
@@ -100,6 +207,167 @@ class DataPreprocessor:
         
         return self.preprocessor.transform(X)
     
+    def partial_fit(self, X):
+        """
+        Update scaler statistics and category vocabularies with one chunk.
+        Call finish_fit() after the last chunk.
+        
+        Parameters:
+            X: Features DataFrame (one chunk)
+        """
+        if self._scaler is None:
+            self.cat_cols = [col for col in CATEGORICAL_COLUMNS if col in X.columns]
+            self.num_cols = [col for col in NUMERICAL_COLUMNS if col in X.columns]
+            self._scaler = StandardScaler()
+            self._vocabularies = {col: set() for col in self.cat_cols}
+            self._rows_seen = 0
+        
+        self._rows_seen += len(X)
+        if self.num_cols:
+            self._scaler.partial_fit(X[self.num_cols])
+        for col in self.cat_cols:
+            self._vocabularies[col].update(X[col].dropna().unique().tolist())
+        return self
+    
+    def finish_fit(self):
+        """
+        Turn the partial_fit statistics into a fitted ColumnTransformer,
+        identical in layout to the one fit_transform() builds.
+        """
+        if self._scaler is None:
+            raise ValueError("No data seen. Call partial_fit first.")
+        empty = [col for col, vocabulary in self._vocabularies.items() if not vocabulary]
+        if empty:
+            raise ValueError(f"No values seen for categorical columns: {empty}")
+        
+        categories = [sorted(self._vocabularies[col]) for col in self.cat_cols]
+        
+        # Fit the pipeline structure on a tiny frame holding every category,
+        # then swap in the scaler that saw the whole dataset
+        n = max(len(c) for c in categories) if categories else 1
+        prototype = pd.DataFrame({col: np.zeros(n) for col in self.num_cols})
+        for col, values in zip(self.cat_cols, categories):
+            prototype[col] = [values[i % len(values)] for i in range(n)]
+        
+        self.create_preprocessor(prototype, categories)
+        self.preprocessor.fit(prototype)
+        if self.num_cols:
+            self.preprocessor.named_transformers_['num'].steps[0] = ('scaler', self._scaler)
+        
+        self.feature_names = self.preprocessor.get_feature_names_out().tolist()
+        print(f"Streaming fit done: {self._rows_seen} rows, "
+              f"{len(self.feature_names)} features")
+        return self.preprocessor
+    
+    def fit_stream(self, source, chunksize=CHUNK_SIZE):
+        """
+        Fit the preprocessor in one pass over a dataset too big for memory.
+        
+        Parameters:
+            source: CSV/Parquet path, DataFrame or iterable of DataFrames
+            chunksize: Rows per chunk
+        """
+        for chunk in iter_chunks(source, chunksize):
+            self.partial_fit(chunk)
+        return self.finish_fit()
+    
+    def transform_stream(self, source, output=None, target_output=None, n_rows=None,
+                         chunksize=CHUNK_SIZE, dtype=np.float64, target_column=TARGET_COLUMN):
+        """
+        Transform a dataset chunk by chunk.
+        
+        With output, features are written to a .npy file and returned
+        memory-mapped read-only; otherwise sparse mode returns a CSR matrix
+        and dense mode an in-memory array.
+        
+        Parameters:
+            source: CSV/Parquet path, DataFrame or iterable of DataFrames
+            output: .npy path for the features
+            target_output: .npy path for the 0/1 target
+            n_rows: Row count, needed with output for one-shot iterables
+            chunksize: Rows per chunk
+            dtype: Feature dtype of the .npy output
+            target_column: Column to return as 0/1 target, if present
+            
+        Returns:
+            (X, y) - y is None when the target column is absent
+            
+        Raises:
+            ValueError if target_output is given and the target column is
+            missing, or the row count does not match n_rows; partially
+            written .npy files are removed
+        """
+        if self.preprocessor is None:
+            raise ValueError("Preprocessor not fitted. Call fit_stream first.")
+        
+        if target_output is not None:
+            columns = source_columns(source)
+            if columns is not None and target_column not in columns:
+                raise ValueError(f"target_output given but the source has no '{target_column}' column")
+        
+        X_file = y_file = None
+        if output is not None or target_output is not None:
+            if n_rows is None:
+                n_rows = count_rows(source, chunksize)
+        
+        X_parts, y_parts = [], []
+        start = 0
+        try:
+            # .npy files are written sequentially, so finished chunks leave memory
+            if output is not None:
+                X_file = open_npy(output, (n_rows, len(self.feature_names)), dtype)
+            if target_output is not None:
+                y_file = open_npy(target_output, (n_rows,), np.int8)
+            
+            for chunk in iter_chunks(source, chunksize):
+                X_chunk = self.preprocessor.transform(chunk)
+                if target_column in chunk.columns:
+                    y_chunk = encode_target(chunk[target_column])
+                elif y_file is not None:
+                    raise ValueError(f"target_output given but a chunk has no '{target_column}' column")
+                else:
+                    y_chunk = None
+                start += len(chunk)
+                
+                if X_file is not None:
+                    X_chunk = X_chunk.toarray() if sp.issparse(X_chunk) else X_chunk
+                    X_file.write(np.ascontiguousarray(X_chunk, dtype=dtype).tobytes())
+                else:
+                    X_parts.append(sp.csr_matrix(X_chunk) if self.sparse else X_chunk)
+                if y_chunk is not None:
+                    if y_file is not None:
+                        y_file.write(y_chunk.tobytes())
+                    else:
+                        y_parts.append(y_chunk)
+            
+            if n_rows is not None and start != n_rows:
+                raise ValueError(f"Expected {n_rows} rows, read {start}")
+        except BaseException:
+            # Don't leave truncated .npy files behind
+            for f in (X_file, y_file):
+                if f is not None:
+                    f.close()
+                    Path(f.name).unlink(missing_ok=True)
+            raise
+        finally:
+            for f in (X_file, y_file):
+                if f is not None:
+                    f.close()
+        
+        if output is not None:
+            X = np.load(output, mmap_mode='r')
+        elif self.sparse:
+            X = sp.vstack(X_parts, format='csr')
+        else:
+            X = np.vstack(X_parts)
+        
+        if target_output is not None:
+            y = np.load(target_output, mmap_mode='r')
+        else:
+            y = np.concatenate(y_parts) if y_parts else None
+        
+        return X, y
+    
     def save(self, filepath=None):
         """Save the preprocessor to disk."""
         if filepath is None:
@@ -109,7 +377,8 @@ class DataPreprocessor:
             'preprocessor': self.preprocessor,
             'feature_names': self.feature_names,
             'cat_cols': self.cat_cols,
-            'num_cols': self.num_cols
+            'num_cols': self.num_cols,
+            'sparse': self.sparse
         }, filepath)
         
         print(f"Preprocessor saved to: {filepath}")
@@ -123,7 +392,8 @@ class DataPreprocessor:
         
         data = joblib.load(filepath)
         
-        instance = cls()
+        # Files saved before the sparse option existed produce dense output
+        instance = cls(sparse=data.get('sparse', False))
         instance.preprocessor = data['preprocessor']
         instance.feature_names = data['feature_names']
         instance.cat_cols = data['cat_cols']
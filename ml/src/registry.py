@@ -0,0 +1,164 @@
+"""
+Model Registry
+Versioned model + preprocessor artifacts with metadata
+
+Layout:
+    registry/
+        ACTIVE                  <- name of the active version
+        <version>/
+            best_model.pkl
+            preprocessor.pkl
+            metadata.json       <- model_name, metrics, feature_names, ...
+
+Usage (from the ml folder):
+    python -m src.registry register --version v2 --activate
+    python -m src.registry register --version v2 --pack   (mmap-shared trees)
+    python -m src.registry list
+"""
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+from .config import MODELS_DIR, REGISTRY_DIR
+
+MODEL_FILE = "best_model.pkl"
+PREPROCESSOR_FILE = "preprocessor.pkl"
+METADATA_FILE = "metadata.json"
+ACTIVE_FILE = "ACTIVE"
+
+
+class ModelRegistry:
+    """
+    Directory of versioned model artifacts.
+    Artifacts are copied in as-is, so they stay loadable by ChurnPredictor.
+    """
+    
+    def __init__(self, root=None):
+        self.root = Path(root) if root is not None else REGISTRY_DIR
+    
+    def versions(self):
+        """List metadata of all registered versions, oldest first."""
+        if not self.root.exists():
+            return []
+        found = []
+        for path in self.root.iterdir():
+            if (path / METADATA_FILE).exists():
+                found.append(self.metadata(path.name))
+        return sorted(found, key=lambda m: m['registered_at'])
+    
+    def metadata(self, version):
+        with open(self.root / version / METADATA_FILE) as f:
+            return json.load(f)
+    
+    def paths(self, version):
+        """
+        Returns:
+            (model_path, preprocessor_path) of a registered version
+        """
+        directory = self.root / version
+        if not (directory / METADATA_FILE).exists():
+            raise KeyError(f"Unknown model version: {version}")
+        return directory / MODEL_FILE, directory / PREPROCESSOR_FILE
+    
+    def register(self, model_path=None, preprocessor_path=None, version=None, activate=False,
+                 pack=False):
+        """
+        Copy a model and its preprocessor into the registry.
+        
+        Parameters:
+            model_path: best_model.pkl to register (default in MODELS_DIR)
+            preprocessor_path: preprocessor.pkl (default in MODELS_DIR)
+            version: Version name (default: timestamp)
+            activate: Also make it the active version
+            pack: Store tree models as a PackedForest (see src.forest)
+            
+        Returns:
+            The version name
+        """
+        # Deferred: joblib/sklearn are only needed when registering
+        import joblib
+        from .forest import pack_model
+        
+        if model_path is None:
+            model_path = MODELS_DIR / MODEL_FILE
+        if preprocessor_path is None:
+            preprocessor_path = MODELS_DIR / PREPROCESSOR_FILE
+        if version is None:
+            version = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        
+        directory = self.root / version
+        if directory.exists():
+            raise ValueError(f"Model version already registered: {version}")
+        
+        # Stage in a temp dir and rename, so readers never see half a version
+        staging = self.root / f".{version}.tmp"
+        staging.mkdir(parents=True)
+        if pack:
+            pack = pack_model(model_path, staging / MODEL_FILE)
+        else:
+            shutil.copy2(model_path, staging / MODEL_FILE)
+        shutil.copy2(preprocessor_path, staging / PREPROCESSOR_FILE)
+        
+        model_data = joblib.load(model_path)
+        prep_data = joblib.load(preprocessor_path)
+        metadata = {
+            'version': version,
+            'model_name': model_data['model_name'],
+            'metrics': model_data['metrics'],
+            'feature_names': prep_data['feature_names'],
+            'packed': pack,
+            'registered_at': datetime.utcnow().isoformat()
+        }
+        with open(staging / METADATA_FILE, 'w') as f:
+            json.dump(metadata, f, indent=2, default=float)
+        
+        os.replace(staging, directory)
+        print(f"Registered model version: {version}")
+        
+        if activate:
+            self.activate(version)
+        return version
+    
+    def active_version(self):
+        """Name of the active version, or None."""
+        try:
+            return (self.root / ACTIVE_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def activate(self, version):
+        """Mark a version active (atomic rename, safe for concurrent readers)."""
+        self.paths(version)  # must exist
+        tmp = self.root / f".{ACTIVE_FILE}.tmp"
+        tmp.write_text(version)
+        os.replace(tmp, self.root / ACTIVE_FILE)
+        print(f"Active model version: {version}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the model registry")
+    sub = parser.add_subparsers(dest="command", required=True)
+    reg = sub.add_parser("register", help="Register models/best_model.pkl + preprocessor.pkl")
+    reg.add_argument("--model", default=None)
+    reg.add_argument("--preprocessor", default=None)
+    reg.add_argument("--version", default=None)
+    reg.add_argument("--activate", action="store_true")
+    reg.add_argument("--pack", action="store_true", help="Pack tree models for mmap sharing")
+    act = sub.add_parser("activate", help="Make a version active")
+    act.add_argument("version")
+    sub.add_parser("list", help="List versions")
+    args = parser.parse_args()
+    
+    registry = ModelRegistry()
+    if args.command == "register":
+        registry.register(args.model, args.preprocessor, args.version, args.activate, args.pack)
+    elif args.command == "activate":
+        registry.activate(args.version)
+    else:
+        active = registry.active_version()
+        for meta in registry.versions():
+            marker = "*" if meta['version'] == active else " "
+            print(f"{marker} {meta['version']:<20} {meta['model_name']:<20} {meta['metrics']}")
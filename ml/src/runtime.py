@@ -0,0 +1,156 @@
+"""
+Compiled Model Runtime
+Evaluate an exported churn model (see src.export) with NumPy only
+
+The artifact is a single .npz file: a JSON header (format version, model
+name, metrics, input layout) plus plain numeric arrays. Loading it needs no
+pickle, no pandas and no sklearn, so serving does not depend on the
+library versions used for training.
+"""
+import json
+
+import numpy as np
+
+from .vectorizer import RowVectorizer
+
+FORMAT = "retentionai-churn"
+FORMAT_VERSION = 1
+COMPILED_SUFFIX = ".npz"
+
+MODEL_KINDS = ("linear", "forest", "boosting")
+
+
+def sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def goes_left(value, node, threshold, missing_go_to_left=None):
+    """
+    Split decisions of packed tree nodes, as sklearn makes them.
+
+    Parameters:
+        value: Input value at each node's split feature
+        node: Node indices
+        threshold: Split threshold per node
+        missing_go_to_left: Per node, whether NaN goes left; None (or input
+            known to have no NaN) skips the check, sending NaN right
+
+    Returns:
+        Boolean array, True where the row goes to the left child
+    """
+    go_left = value <= threshold[node]
+    if missing_go_to_left is not None:
+        # NaN fails every <= test, so only the nodes routing it left need a fix-up
+        go_left |= np.isnan(value) & missing_go_to_left[node]
+    return go_left
+
+
+def tree_leaves(X, roots, children_left, children_right, feature, threshold, max_depth,
+                missing_go_to_left=None):
+    """
+    Leaf reached by every row in every tree of a packed ensemble.
+
+    Parameters:
+        X: Input rows, shape (n_rows, n_features)
+        roots: First node of each tree
+        children_left, children_right: Child node indices, -1 at leaves
+        feature, threshold: Split of each node (go left if X[feature] <= threshold)
+        max_depth: Depth of the deepest tree
+        missing_go_to_left: Per node, whether NaN goes left (sklearn's
+            tree_.missing_go_to_left); None sends NaN right
+
+    Returns:
+        Array of node indices, shape (n_trees, n_rows)
+    """
+    # sklearn compares float32 inputs against float64 thresholds
+    X = np.asarray(X, dtype=np.float32)
+    n_rows = X.shape[0]
+    node = np.repeat(np.asarray(roots)[:, None], n_rows, axis=1)
+    rows = np.broadcast_to(np.arange(n_rows), node.shape)
+    if not np.isnan(X).any():
+        missing_go_to_left = None
+
+    # All trees advance one level per step
+    for _ in range(max_depth):
+        left = children_left[node]
+        internal = left >= 0
+        if not internal.any():
+            break
+        go_left = goes_left(X[rows, feature[node]], node, threshold, missing_go_to_left)
+        node = np.where(internal, np.where(go_left, left, children_right[node]), node)
+    return node
+
+
+class CompiledModel:
+    """
+    Exported preprocessing + model, evaluated with NumPy.
+
+    Exposes predict_proba like an sklearn binary classifier (columns are
+    P(no churn), P(churn)), so ChurnPredictor can use it as its model.
+    """
+
+    def __init__(self, meta, arrays):
+        if meta.get('format') != FORMAT:
+            raise ValueError("Not a churn model artifact")
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported artifact format version: {meta.get('format_version')}")
+        if meta['kind'] not in MODEL_KINDS:
+            raise ValueError(f"Unknown model kind: {meta['kind']}")
+
+        self.meta = meta
+        self.kind = meta['kind']
+        self.model_name = meta['model_name']
+        self.metrics = meta['metrics']
+        self.feature_names = meta['feature_names']
+        self.arrays = arrays
+        self.vectorizer = RowVectorizer.from_state(meta['inputs'], arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an exported .npz artifact.
+
+        Parameters:
+            path: Path to the artifact
+
+        Returns:
+            CompiledModel
+        """
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+        meta = json.loads(arrays.pop('meta').tobytes().decode())
+        return cls(meta, arrays)
+
+    def _leaves(self, X):
+        a = self.arrays
+        # Artifacts exported before NaN routing was recorded send NaN right
+        return tree_leaves(X, a['roots'], a['children_left'], a['children_right'],
+                           a['feature'], a['threshold'], self.meta['max_depth'],
+                           a.get('missing_go_to_left'))
+
+    def churn_probability(self, X):
+        """
+        P(churn) for model-ready rows.
+
+        Parameters:
+            X: float array of shape (n_rows, n_features)
+
+        Returns:
+            Array of probabilities, shape (n_rows,)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if self.kind == 'linear':
+            return sigmoid(X @ self.arrays['coef'] + self.meta['intercept'])
+        if self.kind == 'forest':
+            return self.arrays['leaf_value'][self._leaves(X)].mean(axis=0)
+        # boosting: leaf values are pre-scaled by the learning rate
+        raw = self.meta['init_raw'] + self.arrays['leaf_value'][self._leaves(X)].sum(axis=0)
+        return sigmoid(raw)
+
+    def predict_proba(self, X):
+        probability = self.churn_probability(X)
+        return np.column_stack([1.0 - probability, probability])
+
+    def predict_records(self, records):
+        """P(churn) for a list of employee dictionaries."""
+        return self.churn_probability(self.vectorizer.transform_many(records))
@@ -0,0 +1,305 @@
+"""
+Training Pipeline
+Fit the preprocessor once, evaluate candidate models in parallel, keep the best
+
+1. The raw data is split (stratified), the DataPreprocessor is fitted on the
+   training rows only and both splits are written as .npy files. They are
+   cached under a key made of the data hash and the split/column config, so
+   retraining on unchanged data skips preprocessing entirely.
+2. Every (model, hyperparameters) combination of CANDIDATES is fitted and
+   scored in a process pool. Workers memory-map the cached splits instead of
+   receiving copies, and each one runs single-threaded so the pool, not the
+   estimators, owns the cores.
+3. Finished candidates are recorded in results.jsonl next to the splits. An
+   interrupted run picks up where it stopped.
+4. The winner is written as best_model.pkl + preprocessor.pkl, the format
+   ChurnPredictor.load expects.
+
+Usage (from the ml folder):
+    python -m src.train --data data/HR_Employee_Attrition.csv
+    python -m src.train --data data/HR_Employee_Attrition.csv --workers 8 --metric f1
+    python -m src.train --data data/HR_Employee_Attrition.csv --register v3 --activate
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import ParameterGrid
+
+from .config import (
+    CATEGORICAL_COLUMNS, COLUMNS_TO_DROP, DATA_DIR, MODELS_DIR, NUMERICAL_COLUMNS,
+    RANDOM_STATE, TARGET_COLUMN, TEST_SIZE, TRAINING_CACHE_DIR
+)
+from .preprocessing import DataPreprocessor, encode_target, split_data
+
+# name -> (estimator class, fixed parameters, hyperparameter grid)
+CANDIDATES = {
+    'LogisticRegression': (LogisticRegression, {'max_iter': 1000, 'random_state': RANDOM_STATE},
+                           {'C': [0.1, 1.0, 10.0], 'class_weight': [None, 'balanced']}),
+    'RandomForest': (RandomForestClassifier, {'random_state': RANDOM_STATE, 'n_jobs': 1},
+                     {'n_estimators': [100, 300], 'max_depth': [5, 10, None],
+                      'class_weight': [None, 'balanced']}),
+    'GradientBoosting': (GradientBoostingClassifier, {'random_state': RANDOM_STATE},
+                         {'n_estimators': [100, 200], 'learning_rate': [0.05, 0.1], 'max_depth': [2, 3]}),
+}
+
+METRICS = ('accuracy', 'precision', 'recall', 'f1', 'roc_auc')
+RESULTS_FILE = "results.jsonl"
+
+
+def data_hash(data):
+    """SHA-256 of a CSV file's bytes, or of a DataFrame's contents."""
+    digest = hashlib.sha256()
+    if isinstance(data, pd.DataFrame):
+        digest.update(json.dumps(list(map(str, data.columns))).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    else:
+        with open(data, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def split_key(data, test_size=TEST_SIZE, random_state=RANDOM_STATE):
+    """Cache key of the preprocessed splits: data + everything that shapes them."""
+    config = {
+        'data': data_hash(data),
+        'test_size': test_size,
+        'random_state': random_state,
+        'categorical': CATEGORICAL_COLUMNS,
+        'numerical': NUMERICAL_COLUMNS,
+        'drop': COLUMNS_TO_DROP,
+        'target': TARGET_COLUMN,
+        # Pickled preprocessors are only guaranteed to load on the same version
+        'sklearn': sklearn.__version__,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def prepare_splits(data, cache_dir=None, test_size=TEST_SIZE, random_state=RANDOM_STATE):
+    """
+    Preprocessed train/test matrices for a dataset, built once and cached.
+
+    Parameters:
+        data: CSV path or DataFrame with the target column
+        cache_dir: Root of the split cache (default TRAINING_CACHE_DIR)
+        test_size: Proportion for the test set
+        random_state: Split seed
+
+    Returns:
+        Directory holding X_train/X_test/y_train/y_test .npy and preprocessor.pkl
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else TRAINING_CACHE_DIR
+    directory = cache_dir / split_key(data, test_size, random_state)
+    if (directory / "preprocessor.pkl").exists():
+        print(f"Using cached splits: {directory}")
+        return directory
+
+    df = data if isinstance(data, pd.DataFrame) else pd.read_csv(data)
+    df = df.drop(columns=[c for c in COLUMNS_TO_DROP if c in df.columns])
+    X = df.drop(columns=[TARGET_COLUMN])
+    y = encode_target(df[TARGET_COLUMN])
+
+    # Split the raw rows first so the scaler never sees the test set
+    X_train, X_test, y_train, y_test = split_data(X, y, test_size, random_state)
+    preprocessor = DataPreprocessor()
+    arrays = {
+        'X_train': np.ascontiguousarray(preprocessor.fit_transform(X_train), dtype=np.float64),
+        'X_test': np.ascontiguousarray(preprocessor.transform(X_test), dtype=np.float64),
+        'y_train': y_train,
+        'y_test': y_test,
+    }
+
+    # Stage and rename, so a concurrent or interrupted run never sees half a cache
+    staging = cache_dir / f".{directory.name}.{os.getpid()}"
+    staging.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(staging / f"{name}.npy", array)
+    preprocessor.save(staging / "preprocessor.pkl")
+    try:
+        os.rename(staging, directory)
+    except OSError:
+        # Another run cached the same key first
+        shutil.rmtree(staging, ignore_errors=True)
+    return directory
+
+
+def candidate_tasks(candidates=None):
+    """
+    Expand model grids into tasks.
+
+    The task id hashes everything that defines the fit (estimator class,
+    fixed and grid parameters), so cached results are not reused after
+    any of them changes.
+
+    Returns:
+        List of (task_id, model name, hyperparameters)
+    """
+    tasks = []
+    for name, (estimator, fixed, grid) in (candidates or CANDIDATES).items():
+        qualname = f"{estimator.__module__}.{estimator.__qualname__}"
+        for params in ParameterGrid(grid):
+            canonical = json.dumps([name, qualname, fixed, params], sort_keys=True, default=str)
+            tasks.append((hashlib.sha256(canonical.encode()).hexdigest()[:12], name, params))
+    return tasks
+
+
+def _limit_threads():
+    # One BLAS/OpenMP thread per worker: parallelism comes from the pool
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(1)
+
+
+def evaluate_candidate(split_dir, task_id, name, params, candidates=None):
+    """
+    Fit one candidate on the cached training split and score it on the test split.
+    Runs in a worker process; the fitted model is saved next to the splits.
+
+    Returns:
+        Result dict (task_id, model_name, params, metrics, fit_seconds)
+    """
+    split_dir = Path(split_dir)
+    X_train = np.load(split_dir / "X_train.npy", mmap_mode='r')
+    y_train = np.load(split_dir / "y_train.npy")
+    X_test = np.load(split_dir / "X_test.npy", mmap_mode='r')
+    y_test = np.load(split_dir / "y_test.npy")
+
+    estimator, fixed, _ = (candidates or CANDIDATES)[name]
+    start = time.perf_counter()
+    model = estimator(**fixed, **params).fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    y_pred = model.predict(X_test)
+    y_prob = model.predict_proba(X_test)[:, 1]
+    metrics = {
+        'accuracy': accuracy_score(y_test, y_pred),
+        'precision': precision_score(y_test, y_pred, zero_division=0),
+        'recall': recall_score(y_test, y_pred),
+        'f1': f1_score(y_test, y_pred),
+        'roc_auc': roc_auc_score(y_test, y_prob),
+    }
+
+    models_dir = split_dir / "candidates"
+    models_dir.mkdir(exist_ok=True)
+    staging = models_dir / f".{task_id}.{os.getpid()}"
+    joblib.dump(model, staging)
+    os.replace(staging, models_dir / f"{task_id}.pkl")
+
+    return {'task_id': task_id, 'model_name': name, 'params': params,
+            'metrics': {k: float(v) for k, v in metrics.items()}, 'fit_seconds': fit_seconds}
+
+
+def load_results(split_dir):
+    """Finished candidates of earlier (possibly interrupted) runs, by task id."""
+    path = Path(split_dir) / RESULTS_FILE
+    results = {}
+    if path.exists():
+        with open(path) as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line of a killed run
+                if (Path(split_dir) / "candidates" / f"{result['task_id']}.pkl").exists():
+                    results[result['task_id']] = result
+    return results
+
+
+def train(data=None, output_dir=None, workers=None, metric='roc_auc', cache_dir=None,
+          candidates=None, test_size=TEST_SIZE, random_state=RANDOM_STATE):
+    """
+    Run the whole pipeline and write the best model.
+
+    Parameters:
+        data: CSV path or DataFrame (default DATA_DIR / HR_Employee_Attrition.csv)
+        output_dir: Where best_model.pkl/preprocessor.pkl go (default MODELS_DIR)
+        workers: Worker processes (default: all cores)
+        metric: Test metric that picks the winner (one of METRICS)
+        cache_dir: Root of the split cache (default TRAINING_CACHE_DIR)
+        candidates: Model grids (default CANDIDATES)
+
+    Returns:
+        (model path, preprocessor path, list of all results, best first)
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric} (choose from {', '.join(METRICS)})")
+    if data is None:
+        data = DATA_DIR / "HR_Employee_Attrition.csv"
+    output_dir = Path(output_dir) if output_dir is not None else MODELS_DIR
+    workers = workers or os.cpu_count()
+
+    split_dir = prepare_splits(data, cache_dir, test_size, random_state)
+    results = load_results(split_dir)
+    tasks = candidate_tasks(candidates)
+    pending = [task for task in tasks if task[0] not in results]
+    print(f"\n{len(tasks)} candidates: {len(tasks) - len(pending)} done, "
+          f"{len(pending)} to run on {min(workers, len(pending) or 1)} workers")
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)), initializer=_limit_threads) as pool, \
+                open(split_dir / RESULTS_FILE, 'a') as progress:
+            futures = [pool.submit(evaluate_candidate, split_dir, *task, candidates) for task in pending]
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                # Only this process appends, one line per finished candidate
+                progress.write(json.dumps(result) + "\n")
+                progress.flush()
+                results[result['task_id']] = result
+                print(f"[{done}/{len(pending)}] {result['model_name']} {result['params']} "
+                      f"{metric}={result['metrics'][metric]:.4f} ({result['fit_seconds']:.1f}s)")
+
+    task_ids = {task[0] for task in tasks}
+    ranked = sorted((r for r in results.values() if r['task_id'] in task_ids),
+                    key=lambda r: r['metrics'][metric], reverse=True)
+    best = ranked[0]
+
+    # Same layout as the training notebook, so ChurnPredictor.load reads it as-is
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model_path = output_dir / "best_model.pkl"
+    preprocessor_path = output_dir / "preprocessor.pkl"
+    model_data = {
+        'model': joblib.load(split_dir / "candidates" / f"{best['task_id']}.pkl"),
+        'model_name': best['model_name'],
+        'metrics': best['metrics'],
+        'params': best['params'],
+    }
+    # Write-then-rename: a serving process may have the old files memory-mapped
+    for path, write in ((model_path, lambda p: joblib.dump(model_data, p)),
+                        (preprocessor_path, lambda p: shutil.copyfile(split_dir / "preprocessor.pkl", p))):
+        staging = path.with_name(f".{path.name}.{os.getpid()}")
+        write(staging)
+        os.replace(staging, path)
+
+    print(f"\nBest model: {best['model_name']} {best['params']} ({metric}={best['metrics'][metric]:.4f})")
+    print(f"Model saved to: {model_path}")
+    return model_path, preprocessor_path, ranked
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train and select the churn model")
+    parser.add_argument("--data", default=None, help="Training CSV (with the Attrition column)")
+    parser.add_argument("--output", default=None, help="Output folder (default: models/)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--metric", default='roc_auc', choices=METRICS)
+    parser.add_argument("--cache", default=None, help="Split cache folder")
+    parser.add_argument("--register", metavar="VERSION", default=None,
+                        help="Also add the winner to the model registry")
+    parser.add_argument("--activate", action="store_true", help="Activate the registered version")
+    args = parser.parse_args()
+
+    model_path, preprocessor_path, _ = train(args.data, args.output, args.workers, args.metric, args.cache)
+    if args.register:
+        from .registry import ModelRegistry
+        ModelRegistry().register(model_path, preprocessor_path, args.register, activate=args.activate)
@@ -0,0 +1,235 @@
+"""
+Row Vectorizer
+Turn employee dicts straight into model-ready NumPy rows, without pandas
+
+Only needs NumPy at runtime; sklearn is imported when building a vectorizer
+from a fitted preprocessor.
+"""
+import numpy as np
+
+
+class RowVectorizer:
+    """
+    Precomputed layout of the model input row.
+
+    Built once at model load from the fitted preprocessor:
+    - numeric columns: output positions, plus scaler means/scales if any
+    - categorical columns: a label -> value dict, where the value is the
+      label code (LabelEncoders) or the one-hot column to switch on
+
+    transform() then fills a float64 row with a handful of array ops.
+    """
+
+    def __init__(self, n_features):
+        self.n_features = n_features
+        self.num_cols = []
+        self.num_positions = np.empty(0, dtype=np.intp)
+        self.num_mean = None
+        self.num_scale = None
+        # (column, position, {label: value}) per categorical column: label
+        # codes written at `position`, or one-hot (position None) where the
+        # value is the output column to switch on
+        self.cat_lookups = []
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor, feature_names, encoder_maps=None):
+        """
+        Build a vectorizer for a fitted preprocessor.
+
+        Parameters:
+            preprocessor: Dict of LabelEncoders or a fitted ColumnTransformer
+            feature_names: Column order the model expects
+            encoder_maps: Compiled label -> code dicts for a dict preprocessor
+
+        Returns:
+            RowVectorizer, or None if the preprocessor layout is not supported
+            (callers then use the pandas path)
+        """
+        from sklearn.compose import ColumnTransformer
+
+        if encoder_maps is not None:
+            return cls._from_label_encoders(feature_names, encoder_maps)
+        if isinstance(preprocessor, ColumnTransformer):
+            return cls._from_column_transformer(preprocessor)
+        return None
+
+    @classmethod
+    def _from_label_encoders(cls, feature_names, encoder_maps):
+        if not feature_names:
+            return None
+
+        vectorizer = cls(len(feature_names))
+        num_positions = []
+        for position, col in enumerate(feature_names):
+            if col in encoder_maps:
+                # Label codes land in a single column
+                vectorizer.cat_lookups.append((col, position, encoder_maps[col]))
+            else:
+                vectorizer.num_cols.append(col)
+                num_positions.append(position)
+        vectorizer.num_positions = np.array(num_positions, dtype=np.intp)
+        return vectorizer
+
+    @classmethod
+    def _from_column_transformer(cls, transformer):
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+        if transformer.remainder != 'drop':
+            return None
+
+        steps = []
+        offset = 0
+        for name, step, cols in transformer.transformers_:
+            if name == 'remainder' or step == 'drop':
+                continue
+            if isinstance(step, Pipeline):
+                if len(step.steps) != 1:
+                    return None
+                step = step.steps[0][1]
+            steps.append((step, list(cols), offset))
+            offset += cls._output_width(step, cols)
+
+        vectorizer = cls(offset)
+        means, scales, num_positions = [], [], []
+        for step, cols, offset in steps:
+            if step == 'passthrough' or isinstance(step, StandardScaler):
+                n = len(cols)
+                vectorizer.num_cols.extend(cols)
+                num_positions.extend(range(offset, offset + n))
+                scaler = step if isinstance(step, StandardScaler) else None
+                means.append(scaler.mean_ if scaler is not None and scaler.with_mean else np.zeros(n))
+                scales.append(scaler.scale_ if scaler is not None and scaler.with_std else np.ones(n))
+            elif isinstance(step, OneHotEncoder):
+                if step.drop_idx_ is not None or step.handle_unknown != 'ignore':
+                    return None
+                for col, categories in zip(cols, step.categories_):
+                    # Each label switches on its own column; unknown labels stay all-zero
+                    mapping = {label: offset + i for i, label in enumerate(categories.tolist())}
+                    vectorizer.cat_lookups.append((col, None, mapping))
+                    offset += len(categories)
+            else:
+                return None
+
+        vectorizer.num_positions = np.array(num_positions, dtype=np.intp)
+        if means:
+            vectorizer.num_mean = np.concatenate(means).astype(np.float64)
+            vectorizer.num_scale = np.concatenate(scales).astype(np.float64)
+        return vectorizer
+
+    @staticmethod
+    def _output_width(step, cols):
+        if hasattr(step, 'categories_'):
+            return sum(len(categories) for categories in step.categories_)
+        return len(cols)
+
+    def state(self):
+        """
+        Serializable form of the layout, for portable artifacts.
+
+        Returns:
+            (JSON-able dict, dict of NumPy arrays)
+        """
+        meta = {
+            'n_features': self.n_features,
+            'num_cols': self.num_cols,
+            # Labels keep their JSON type (str/int/float), so lookups match raw input
+            'cat_lookups': [
+                {'column': col, 'position': position,
+                 'labels': list(mapping), 'values': [int(v) for v in mapping.values()]}
+                for col, position, mapping in self.cat_lookups
+            ]
+        }
+        arrays = {'num_positions': self.num_positions}
+        if self.num_mean is not None:
+            arrays['num_mean'] = self.num_mean
+            arrays['num_scale'] = self.num_scale
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        """Rebuild a vectorizer from state()."""
+        vectorizer = cls(meta['n_features'])
+        vectorizer.num_cols = list(meta['num_cols'])
+        vectorizer.num_positions = np.asarray(arrays['num_positions'], dtype=np.intp)
+        if 'num_mean' in arrays:
+            vectorizer.num_mean = np.asarray(arrays['num_mean'], dtype=np.float64)
+            vectorizer.num_scale = np.asarray(arrays['num_scale'], dtype=np.float64)
+        vectorizer.cat_lookups = [
+            (lookup['column'], lookup['position'], dict(zip(lookup['labels'], lookup['values'])))
+            for lookup in meta['cat_lookups']
+        ]
+        return vectorizer
+
+    def transform(self, employee_data):
+        """
+        Vectorize one employee.
+
+        Parameters:
+            employee_data: Dictionary with employee features
+
+        Returns:
+            float64 array of shape (1, n_features)
+
+        Raises:
+            KeyError if a numeric column is missing
+        """
+        row = np.zeros((1, self.n_features), dtype=np.float64)
+
+        values = np.array([employee_data[col] for col in self.num_cols], dtype=np.float64)
+        if self.num_mean is not None:
+            values = (values - self.num_mean) / self.num_scale
+        row[0, self.num_positions] = values
+
+        for col, position, mapping in self.cat_lookups:
+            value = mapping.get(employee_data.get(col))
+            if position is None:
+                # One-hot: mapping gives the column to switch on
+                if value is not None:
+                    row[0, value] = 1.0
+            elif value is not None:
+                # Label code; unknown labels stay 0
+                row[0, position] = value
+
+        return row
+
+    def transform_many(self, records):
+        """
+        Vectorize many employees at once.
+
+        With label codes, missing numeric fields become 0 like the pandas
+        path's reindex. Scaled layouts (ColumnTransformer) reject them, as
+        the preprocessor itself does: a raw 0 would be scaled into a value
+        the model never saw.
+
+        Parameters:
+            records: List of employee dictionaries
+
+        Returns:
+            float64 array of shape (n_records, n_features)
+
+        Raises:
+            KeyError if a numeric column is missing and the layout is scaled
+        """
+        n = len(records)
+        X = np.zeros((n, self.n_features), dtype=np.float64)
+
+        if self.num_mean is None:
+            rows = [[record.get(col, 0) for col in self.num_cols] for record in records]
+        else:
+            rows = [[record[col] for col in self.num_cols] for record in records]
+        values = np.array(rows, dtype=np.float64).reshape(n, len(self.num_cols))
+        if self.num_mean is not None:
+            values = (values - self.num_mean) / self.num_scale
+        X[:, self.num_positions] = values
+
+        rows = np.arange(n)
+        for col, position, mapping in self.cat_lookups:
+            codes = np.array([mapping.get(record.get(col), -1) for record in records], dtype=np.intp)
+            known = codes >= 0
+            if position is None:
+                X[rows[known], codes[known]] = 1.0
+            else:
+                X[known, position] = codes[known]
+
+        return X
@@ -0,0 +1,25 @@
+"""
+Round trip of a saved DataPreprocessor
+
+Usage (from the ml folder):
+    python -m pytest tests
+"""
+import pandas as pd
+import pytest
+from scipy import sparse as sp
+
+from benchmarks.common import make_employees
+from src.preprocessing import DataPreprocessor
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_loaded_preprocessor_keeps_output_format(tmp_path, sparse):
+    employees = pd.DataFrame(make_employees(200, seed=2))
+    preprocessor = DataPreprocessor(sparse=sparse)
+    X = preprocessor.fit_transform(employees)
+
+    loaded = DataPreprocessor.load(preprocessor.save(tmp_path / "preprocessor.pkl"))
+    assert loaded.sparse == sparse
+    X_loaded, _ = loaded.transform_stream(employees)
+    assert sp.issparse(X_loaded) == sparse
+    assert (abs(X_loaded - X)).max() < 1e-12
@@ -0,0 +1,114 @@
+"""
+Parity of the NumPy runtime, PackedForest and attributions with sklearn
+
+Small models are fitted on synthetic employees, exported, and every
+alternative evaluation path must reproduce sklearn's output, including on
+rows with missing (NaN) cells, which sklearn routes per split.
+
+Usage (from the ml folder):
+    python -m pytest tests
+"""
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from benchmarks.common import make_employees
+from benchmarks.compiled_benchmark import synthetic_labels
+from src.export import export_model
+from src.forest import PackedForest
+from src.predict import ChurnPredictor
+from src.preprocessing import DataPreprocessor
+from src.runtime import CompiledModel
+
+MODELS = {
+    'linear': lambda: LogisticRegression(max_iter=1000),
+    'forest': lambda: RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0),
+    'boosting': lambda: GradientBoostingClassifier(n_estimators=20, max_depth=3, random_state=0),
+}
+
+
+@pytest.fixture(scope="module")
+def employees():
+    return make_employees(400, seed=5)
+
+
+@pytest.fixture(scope="module")
+def artifacts(tmp_path_factory, employees):
+    """(model_path, preprocessor_path, artifact_path) per model kind."""
+    directory = tmp_path_factory.mktemp("models")
+    train = make_employees(600, seed=1)
+    preprocessor = DataPreprocessor()
+    X = preprocessor.fit_transform(pd.DataFrame(train))
+    preprocessor_path = preprocessor.save(directory / "preprocessor.pkl")
+    y = synthetic_labels(train)
+
+    paths = {}
+    for kind, make_model in MODELS.items():
+        model_path = directory / f"{kind}.pkl"
+        joblib.dump({'model': make_model().fit(X, y), 'model_name': kind, 'metrics': {}}, model_path)
+        paths[kind] = (model_path, preprocessor_path, export_model(model_path, preprocessor_path,
+                                                                    directory / f"{kind}.npz"))
+    return paths
+
+
+def with_nan(X, fraction=0.1, seed=0):
+    X = np.array(X, dtype=np.float64)
+    X[np.random.default_rng(seed).random(X.shape) < fraction] = np.nan
+    return X
+
+
+@pytest.mark.parametrize("kind", MODELS)
+def test_compiled_matches_sklearn(artifacts, employees, kind):
+    model_path, preprocessor_path, artifact_path = artifacts[kind]
+    sklearn_predictor = ChurnPredictor(model_path, preprocessor_path)
+    compiled_predictor = ChurnPredictor(artifact_path)
+    assert isinstance(compiled_predictor.model, CompiledModel)
+
+    assert np.allclose(compiled_predictor.predict_proba_batch(employees),
+                       sklearn_predictor.predict_proba_batch(employees))
+    for employee in employees[:20]:
+        assert np.isclose(compiled_predictor.predict(employee)['churn_probability'],
+                          sklearn_predictor.predict(employee)['churn_probability'])
+
+
+def test_compiled_forest_routes_nan_like_sklearn(artifacts, employees):
+    model_path, preprocessor_path, artifact_path = artifacts['forest']
+    model = joblib.load(model_path)['model']
+    compiled = CompiledModel.load(artifact_path)
+    X = with_nan(compiled.vectorizer.transform_many(employees))
+
+    assert np.allclose(compiled.churn_probability(X), model.predict_proba(X)[:, 1])
+
+
+@pytest.mark.parametrize("nan", [False, True])
+def test_packed_forest_matches_sklearn(artifacts, employees, nan):
+    model_path, preprocessor_path, _ = artifacts['forest']
+    model = joblib.load(model_path)['model']
+    X = ChurnPredictor(model_path, preprocessor_path).model_input(employees)
+    if nan:
+        X = with_nan(X)
+
+    packed = PackedForest.from_estimator(model)
+    assert np.allclose(packed.predict_proba(X), model.predict_proba(X))
+    assert np.array_equal(packed.predict(X), model.predict(X))
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+@pytest.mark.parametrize("kind", MODELS)
+def test_attributions_add_up_to_model_output(artifacts, employees, kind, compiled):
+    model_path, preprocessor_path, artifact_path = artifacts[kind]
+    predictor = ChurnPredictor(artifact_path) if compiled else ChurnPredictor(model_path, preprocessor_path)
+    attributor = predictor.get_attributor()
+    assert attributor is not None and attributor.kind == kind
+
+    X = np.asarray(predictor.model_input(employees), dtype=np.float64)
+    # sklearn only accepts NaN for the forest
+    cases = [X, with_nan(X)] if kind == 'forest' else [X]
+    for rows in cases:
+        probability = predictor.model_proba(rows)[:, 1]
+        expected = probability if kind == 'forest' else np.log(probability / (1 - probability))
+        total = attributor.base_value + attributor.contributions(rows).sum(axis=1)
+        assert np.allclose(total, expected)